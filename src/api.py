@@ -1,10 +1,36 @@
-import requests
-import functools
+import copy
+from concurrent.futures import ThreadPoolExecutor
+from collections.abc import Iterable
+from dataclasses import replace
+from urllib.parse import quote
 from constants import (
+    EMPTY_ID,
+    EMPTY_NAME,
     EMPTY_TYPE,
-    ARMOR_SLOTS,
-    WEAPON_SLOTS,
-    ACCESSORY_SLOTS
+    SLOT_INDEX,
+    WEAPON_KIND,
+    RELIC_KIND,
+    REQUIRED_PERMISSIONS
+)
+from transport import (
+    Response,
+    Transport
+)
+from deadline import (
+    check_deadline,
+    propagate
+)
+from errors import (
+    ApiError,
+    AuthError,
+    InvalidIdError,
+    classify
+)
+from cache import (
+    SHARED_SCOPE,
+    Cache,
+    CacheStats,
+    cached
 )
 from build import (
     Skill,
@@ -12,42 +38,185 @@ from build import (
     Specialization,
     Build
 )
+from verdict import (
+    KEY_OK,
+    KEY_INVALID,
+    KEY_MISSING_PERMISSIONS,
+    KEY_ERROR,
+    KeyVerdict
+)
+from character import (
+    Character
+)
 from equipment import (
-    Stats,
-    Upgrade,
-    Infusion,
-    Relic,
-    Armor,
-    Weapon,
-    Accessory,
+    SlotRecord,
+    EquipmentRecord,
     Equipment
 )
+from items import (
+    ItemRecord,
+    ItemTable,
+    project_item
+)
+
+# Define the maximum number of IDs the API accepts per request.
+_MAX_IDS = 200
+
+
+def _parse_equipment_records(equipmenttabs_json) -> list[EquipmentRecord]:
+    """Parse equipment templates from JSON data into plain records."""
+
+    # Initialize an empty list to store equipment records.
+    equipment_records = []
+
+    # Loop through the equipmenttabs in the JSON data.
+    for equipmenttab in equipmenttabs_json:
+        # Extract keys from the equipmenttab.
+        equipment_data = equipmenttab["equipment"]
+        equipment_name = equipmenttab["name"]
+
+        # Skip the equipment if the name or the equipment data is empty.
+        if not equipment_name or not equipment_data:
+            continue
+
+        # Loop through the items in the equipment data.
+        items = []
+        for item in equipment_data:
+            # Look up the kind and position of the slot.
+            slot_index = SLOT_INDEX.get(item["slot"])
+            if slot_index is None:
+                continue
+            kind, index = slot_index
+
+            # Skip the relic since it is not yet available from the API.
+            if kind == RELIC_KIND:
+                continue
+
+            # Extract the integer IDs of the item.
+            stats = item.get("stats")
+            upgrades = item.get("upgrades")
+            infusions = item.get("infusions")
+            items.append(
+                SlotRecord(
+                    kind=kind,
+                    index=index,
+                    id=item["id"],
+                    stats=stats["id"] if stats else EMPTY_ID,
+                    upgrades=tuple(upgrades) if upgrades is not None else None,
+                    infusions=(
+                        tuple(infusions) if infusions is not None else None
+                    )
+                )
+            )
+
+        # Add the record to the list of equipment records.
+        equipment_records.append(
+            EquipmentRecord(
+                name=equipment_name,
+                items=items
+            )
+        )
+
+    # Return the list of equipment records.
+    return equipment_records
 
 
 class Api:
     """Interact with the Guild Wars 2 API using an API key."""
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        transport: Transport | None = None,
+        api_key: str | None = None
+    ) -> None:
         """Initialize an instance of the Api class."""
-        self._api_key = None
-        self._clear_cache()
+        self._api_key = api_key
+        self._transport = transport or Transport()
+        self._cache = Cache()
+        self._cache.configure("account", maxsize=16, ttl=300)
+        self._cache.configure("skills", maxsize=4096, scope=SHARED_SCOPE)
+        self._cache.configure(
+            "specializations", maxsize=256, scope=SHARED_SCOPE
+        )
+        self._cache.configure("traits", maxsize=4096, scope=SHARED_SCOPE)
+        self._cache.configure("itemstats", maxsize=1024, scope=SHARED_SCOPE)
+        # Store the item records shared by all instances.
+        self._items = self._cache.configure(
+            "items",
+            maxsize=32768,
+            maxbytes=32 * 2**20,
+            scope=SHARED_SCOPE,
+            factory=ItemTable
+        )
+        self._cache.configure(
+            "missing", maxsize=4096, ttl=600, scope=SHARED_SCOPE
+        )
+        # Keep the verdicts, which are keyed by API key, out of cache files.
+        self._cache.configure(
+            "verdicts",
+            maxsize=65536,
+            ttl=900,
+            scope=SHARED_SCOPE,
+            persist=False
+        )
 
     def _clear_cache(self) -> None:
-        """Clear the cache for all decorated methods."""
-        self.get_permissions.cache_clear()
-        self.get_account_name.cache_clear()
-        self.get_characters.cache_clear()
+        """Clear the namespaces of this instance, keeping shared game data."""
+        self._cache.clear()
 
-    def _get_endpoint_v2(self, endpoint: str):
-        """Perform a GET request to the API and return the JSON response."""
+    def _clear_shared_cache(self) -> None:
+        """Clear the game data and item records shared by all instances."""
+        self._cache.clear_shared()
+
+    def _request_v2(
+        self, endpoint: str, headers: dict[str, str] | None = None
+    ) -> Response:
+        """Perform a GET request to the API and return the raw response."""
         url = f"https://api.guildwars2.com/v2/{endpoint}"
         headers = {
             "Authorization": f"Bearer {self._api_key}",
-            "X-Schema-Version": "latest"
+            "X-Schema-Version": "latest",
+            **(headers or {})
         }
-        return requests.get(url, headers=headers).json()
+        check_deadline()
+        return self._transport.get(url, headers)
 
-    def _parse_build_templates(
+    def _get_endpoint_v2(self, endpoint: str):
+        """Perform a GET request to the API and return the JSON response."""
+        return self._check_response(self._request_v2(endpoint))
+
+    @staticmethod
+    def _check_response(response: Response):
+        """Decode the JSON of a response, raising the error it signals."""
+        try:
+            data = response.json()
+        except ValueError:
+            data = None
+        error = classify(response.status_code, data)
+        if error is not None:
+            raise error
+        return data
+
+    def _get_game_data(self, endpoint: str):
+        """Get game data by ID, skipping IDs recently found not to exist."""
+        missing = self._cache.namespace("missing")
+        if missing.get(endpoint):
+            raise InvalidIdError(f"Known missing: {endpoint}", 404)
+        try:
+            return self._get_endpoint_v2(endpoint)
+        except InvalidIdError:
+            missing.set(endpoint, True)
+            raise
+
+    @staticmethod
+    def _get_or_default(getter, game_id: int, default: str) -> str:
+        """Get a name or type by ID, or a default if the ID does not exist."""
+        try:
+            return getter(game_id)
+        except InvalidIdError:
+            return default
+
+    def parse_build_templates(
         self, buildtabs_json
     ) -> list[Build]:
         """Parse build templates from JSON data."""
@@ -84,7 +253,9 @@ class Api:
                     skills.append(
                         Skill(
                             id=skill_id,
-                            name=self.get_skill_name(skill_id)
+                            name=self._get_or_default(
+                                self.get_skill_name, skill_id, EMPTY_NAME
+                            )
                         )
                     )
                 elif isinstance(skill, list):
@@ -98,7 +269,11 @@ class Api:
                             skills.append(
                                 Skill(
                                     id=skill_id,
-                                    name=self.get_skill_name(skill_id)
+                                    name=self._get_or_default(
+                                        self.get_skill_name,
+                                        skill_id,
+                                        EMPTY_NAME
+                                    )
                                 )
                             )
 
@@ -124,14 +299,20 @@ class Api:
                             traits.append(
                                 Trait(
                                     id=trait_id,
-                                    name=self.get_trait_name(trait_id)
+                                    name=self._get_or_default(
+                                        self.get_trait_name,
+                                        trait_id,
+                                        EMPTY_NAME
+                                    )
                                 )
                             )
                     specializations.append(
                         Specialization(
                             id=specialization["id"],
-                            name=self.get_specialization_name(
-                                specialization["id"]
+                            name=self._get_or_default(
+                                self.get_specialization_name,
+                                specialization["id"],
+                                EMPTY_NAME
                             ),
                             traits=traits
                         )
@@ -150,273 +331,182 @@ class Api:
         # Return the list of build templates.
         return build_templates
 
-    def _parse_equipment_templates(
-        self, equipmenttabs_json
-    ) -> list[Equipment]:
-        """Parse equipment templates from JSON data."""
+    def _resolve_equipment_records(
+        self, records_lists: list[list[EquipmentRecord]]
+    ) -> list[list[Equipment]]:
+        """Resolve names for lists of equipment records in one pass."""
+
+        # Collect the distinct IDs referenced by all records.
+        stats_ids = set()
+        item_ids = set()
+        weapon_ids = set()
+        for records in records_lists:
+            for record in records:
+                for item in record.items:
+                    if item.stats:
+                        stats_ids.add(item.stats)
+                    if item.upgrades:
+                        item_ids.update(item.upgrades)
+                    if item.infusions:
+                        item_ids.update(item.infusions)
+                    if item.kind == WEAPON_KIND:
+                        weapon_ids.add(item.id)
+
+        # Fetch the items in bulk, then resolve every distinct ID once.
+        self.get_items([*item_ids, *weapon_ids])
+        stats_names = {
+            stats_id: self._get_or_default(
+                self.get_stats_name, stats_id, EMPTY_NAME
+            )
+            for stats_id in stats_ids
+        }
+        item_names = {
+            item_id: self._get_or_default(
+                self.get_item_name, item_id, EMPTY_NAME
+            )
+            for item_id in item_ids
+        }
+        weapon_types = {
+            item_id: self._get_or_default(
+                self.get_weapon_type, item_id, EMPTY_TYPE
+            )
+            for item_id in weapon_ids
+        }
 
-        # Initialize an empty list to store equipment templates.
+        # Create each distinct equipment once and copy it for duplicates,
+        # so that changing one template never changes another.
+        equipments = {}
         equipment_templates = []
-
-        # Loop through the equipmenttabs in the JSON data.
-        for equipmenttab in equipmenttabs_json:
-            # Extract keys from the equipmenttab.
-            equipment_data = equipmenttab["equipment"]
-            equipment_name = equipmenttab["name"]
-
-            # Skip the equipment if the name is empty.
-            if not equipment_name:
-                continue
-
-            # Skip the equipment if the equipment data is empty.
-            if not equipment_data:
-                continue
-
-            # Initialize empty lists to store armors, weapons and accessories.
-            armors = []
-            weapons = []
-            accessories = []
-
-            # Create armors, weapons and accessories for each slot.
-            for slot in ARMOR_SLOTS:
-                armor = Armor(
-                    slot=slot,
-                    stats=Stats.empty(),
-                    upgrade=Upgrade.empty(),
-                    infusion=Infusion.empty()
-                )
-                armors.append(armor)
-            for slot in WEAPON_SLOTS:
-                weapon = Weapon(
-                    slot=slot,
-                    type=EMPTY_TYPE,
-                    stats=Stats.empty(),
-                    upgrades=[Upgrade.empty()] * 2,
-                    infusions=[Infusion.empty()] * 2
-                )
-                weapons.append(weapon)
-            for slot in ACCESSORY_SLOTS:
-                accessory = Accessory(
-                    slot=slot,
-                    stats=Stats.empty(),
-                    infusions=[Infusion.empty()] * 3
-                )
-                accessories.append(accessory)
-
-            # Create a relic.
-            relic = Relic.empty()
-
-            # Loop through the items in the equipment data.
-            for item in equipment_data:
-                # Extract keys from the item.
-                item_id = item["id"]
-                item_slot = item["slot"]
-
-                if item_slot in ARMOR_SLOTS:
-                    # Parse armors based on the slot.
-                    slot = item_slot
-                    if "stats" not in item:
-                        # Handle the case when stats are missing.
-                        stats = Stats.empty()
-                    else:
-                        # Handle the case when stats are available.
-                        stats_data = item["stats"]
-                        stats_id = stats_data["id"]
-                        stats_name = self.get_stats_name(
-                            stats_id
-                        )
-                        stats = Stats(
-                            id=stats_id,
-                            name=stats_name
-                        )
-                    if "upgrades" not in item:
-                        # Handle the case when upgrades are missing.
-                        upgrade = Upgrade.empty()
-                    else:
-                        # Handle the case when upgrades are available.
-                        upgrades_data = item["upgrades"]
-                        upgrade_id = upgrades_data[0]
-                        upgrade_name = self.get_item_name(
-                            upgrade_id
-                        )
-                        upgrade = Upgrade(
-                            id=upgrade_id,
-                            name=upgrade_name
-                        )
-                    if "infusions" not in item:
-                        # Handle the case when infusions are missing.
-                        infusion = Infusion.empty()
-                    else:
-                        # Handle the case when infusions are available.
-                        infusions_data = item["infusions"]
-                        infusion_id = infusions_data[0]
-                        infusion_name = self.get_item_name(
-                            infusion_id
-                        )
-                        infusion = Infusion(
-                            id=infusion_id,
-                            name=infusion_name
-                        )
-                    armors[ARMOR_SLOTS.index(item_slot)] = Armor(
-                        slot=slot,
-                        stats=stats,
-                        upgrade=upgrade,
-                        infusion=infusion
+        for records in records_lists:
+            check_deadline()
+            templates = []
+            for record in records:
+                content = tuple(record.items)
+                equipment = equipments.get(content)
+                if equipment is None:
+                    equipment = Equipment.from_record(
+                        record, stats_names, item_names, weapon_types
                     )
+                    equipments[content] = equipment
+                else:
+                    equipment = copy.deepcopy(equipment)
+                templates.append(replace(equipment, name=record.name))
+            equipment_templates.append(templates)
+        return equipment_templates
 
-                elif item_slot in WEAPON_SLOTS:
-                    # Parse weapons based on the slot.
-                    slot = item_slot
-                    type = self.get_weapon_type(item_id)
-                    if "stats" not in item:
-                        # Handle the case when stats are missing.
-                        stats = Stats.empty()
-                    else:
-                        # Handle the case when stats are available.
-                        stats_data = item["stats"]
-                        stats_id = stats_data["id"]
-                        stats_name = self.get_stats_name(
-                            stats_id
-                        )
-                        stats = Stats(
-                            id=stats_id,
-                            name=stats_name
-                        )
-                    if "upgrades" not in item:
-                        # Handle the case when upgrades are missing.
-                        upgrades = [Upgrade.empty()] * 2
-                    else:
-                        # Handle the case when upgrades are available.
-                        upgrades_data = item["upgrades"]
-                        upgrades = []
-                        for upgrade in upgrades_data:
-                            upgrade_id = upgrade
-                            upgrade_name = self.get_item_name(
-                                upgrade_id
-                            )
-                            upgrades.append(
-                                Upgrade(
-                                    id=upgrade_id,
-                                    name=upgrade_name
-                                )
-                            )
-                    if "infusions" not in item:
-                        # Handle the case when infusions are missing.
-                        infusions = [Infusion.empty()] * 2
-                    else:
-                        # Handle the case when infusions are available.
-                        infusions_data = item["infusions"]
-                        infusions = []
-                        for infusion in infusions_data:
-                            infusion_id = infusion
-                            infusion_name = self.get_item_name(
-                                infusion_id
-                            )
-                            infusions.append(
-                                Infusion(
-                                    id=infusion_id,
-                                    name=infusion_name
-                                )
-                            )
-                    weapons[WEAPON_SLOTS.index(item_slot)] = Weapon(
-                        slot=slot,
-                        type=type,
-                        stats=stats,
-                        upgrades=upgrades,
-                        infusions=infusions
-                    )
+    def parse_equipment_templates(
+        self, equipmenttabs_json
+    ) -> list[Equipment]:
+        """Parse equipment templates from JSON data."""
+        records = _parse_equipment_records(equipmenttabs_json)
+        return self._resolve_equipment_records([records])[0]
 
-                elif item_slot in ACCESSORY_SLOTS:
-                    # Parse accessories based on the slot.
-                    slot = item_slot
-                    if "stats" not in item:
-                        # Handle the case when stats are missing.
-                        stats = Stats.empty()
-                    else:
-                        # Handle the case when stats are available.
-                        stats_data = item["stats"]
-                        stats_id = stats_data["id"]
-                        stats_name = self.get_stats_name(
-                            stats_id
-                        )
-                        stats = Stats(
-                            id=stats_id,
-                            name=stats_name
-                        )
-                    if "infusions" not in item:
-                        # Handle the case when infusions are missing.
-                        infusions = [Infusion.empty()] * 3
-                    else:
-                        # Handle the case when infusions are available.
-                        infusions_data = item["infusions"]
-                        infusions = []
-                        for infusion in infusions_data:
-                            infusion_id = infusion
-                            infusion_name = self.get_item_name(
-                                infusion_id
-                            )
-                            infusions.append(
-                                Infusion(
-                                    id=infusion_id,
-                                    name=infusion_name
-                                )
-                            )
-                    accessories[ACCESSORY_SLOTS.index(item_slot)] = Accessory(
-                        slot=slot,
-                        stats=stats,
-                        infusions=infusions
-                    )
+    def for_key(self, api_key: str) -> "Api":
+        """Get a view of the API for a key, safe to share across threads."""
+        return Api(transport=self._transport, api_key=api_key)
 
-                elif item_slot == "Relic":
-                    # Parse the relic based on the slot.
-                    relic = Relic.empty()  # Not yet available from the API.
+    def set_api_key(self, api_key: str) -> None:
+        """Set the API key and clear the account cache if the key changes."""
+        if self._api_key != api_key:
+            self._api_key = api_key
+            self._cache.invalidate("account")
 
-            # Create an equipment with a name and components.
-            equipment = Equipment(
-                name=equipment_name,
-                armors=armors,
-                weapons=weapons,
-                accessories=accessories,
-                relic=relic
-            )
+    def cache_stats(self) -> dict[str, CacheStats]:
+        """Get the statistics of all cache namespaces."""
+        return self._cache.stats()
 
-            # Add the equipment to the list of equipment templates.
-            equipment_templates.append(equipment)
+    def save_cache(self, path: str) -> None:
+        """Save the cache, including the item records, to a file."""
+        self._cache.save(path)
 
-        # Return the list of equipment templates.
-        return equipment_templates
+    def load_cache(self, path: str) -> None:
+        """Load the cache, including the item records, from a file."""
+        self._cache.load(path)
 
-    def set_api_key(self, api_key: str) -> None:
-        """Set the API key and clear the cache if the key changes."""
-        if self._api_key != api_key:
-            self._api_key = api_key
-            self._clear_cache()
+    @cached("account")
+    def get_tokeninfo(self) -> dict:
+        """Get the token information of the API key."""
+        tokeninfo = self._get_endpoint_v2("tokeninfo")
+        return tokeninfo
 
     def check_key(self) -> bool:
         """Check if the API key is valid."""
-        tokeninfo = self._get_endpoint_v2("tokeninfo")
-        if "text" in tokeninfo:
+        try:
+            self.get_tokeninfo()
+        except AuthError:
             return False
         return True
 
-    @functools.lru_cache(maxsize=None)
     def get_permissions(self) -> list[str]:
         """Get the permissions associated with the API key."""
-        permissions_data = self._get_endpoint_v2("tokeninfo")
-        permissions = permissions_data["permissions"]
+        permissions = self.get_tokeninfo()["permissions"]
         return permissions
 
-    @functools.lru_cache(maxsize=None)
+    def validate_key(self) -> KeyVerdict:
+        """Validate the API key with a single tokeninfo request."""
+        verdicts = self._cache.namespace("verdicts")
+        verdict = verdicts.get(self._api_key)
+        if verdict is not None:
+            return verdict
+        try:
+            permissions = self.get_permissions()
+        except AuthError:
+            verdict = KeyVerdict(
+                status=KEY_INVALID,
+                permissions=[],
+                missing=[]
+            )
+        except ApiError:
+            # Do not cache verdicts for errors that may go away.
+            return KeyVerdict(
+                status=KEY_ERROR,
+                permissions=[],
+                missing=[]
+            )
+        else:
+            missing = [
+                permission
+                for permission in REQUIRED_PERMISSIONS
+                if permission not in permissions
+            ]
+            verdict = KeyVerdict(
+                status=KEY_MISSING_PERMISSIONS if missing else KEY_OK,
+                permissions=permissions,
+                missing=missing
+            )
+        verdicts.set(self._api_key, verdict)
+        return verdict
+
+    def validate_keys(
+        self, api_keys: list[str], max_workers: int = 16
+    ) -> dict[str, KeyVerdict]:
+        """Validate many API keys concurrently."""
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            verdicts = executor.map(
+                propagate(
+                    lambda api_key: self.for_key(api_key).validate_key()
+                ),
+                api_keys
+            )
+            return dict(zip(api_keys, verdicts))
+
+    @cached("account")
     def get_account_name(self) -> str:
         """Get the account name associated with the API key."""
         account_data = self._get_endpoint_v2("account")
         account_name = account_data["name"]
         return account_name
 
-    @functools.lru_cache(maxsize=None)
+    @cached("account")
+    def get_character_names(self) -> list[str]:
+        """Get the names of the characters associated with the API key."""
+        character_names = self._get_endpoint_v2("characters")
+        return character_names
+
+    @cached("account")
     def get_characters(self) -> dict[str, str]:
         """Get characters and their profession associated with the API key."""
-        character_names = self._get_endpoint_v2("characters")
+        character_names = self.get_character_names()
         profession_names = []
         for character_name in character_names:
             character_data = self._get_endpoint_v2(
@@ -427,74 +517,121 @@ class Api:
         characters = dict(zip(character_names, profession_names))
         return characters
 
-    @functools.lru_cache(maxsize=None)
+    @cached("skills")
     def get_skill_name(self, skill_id: int) -> str:
         """Get the name of a skill by its ID."""
-        skill_data = self._get_endpoint_v2(
+        skill_data = self._get_game_data(
             f"skills/{skill_id}"
         )
         skill_name = skill_data["name"]
         return skill_name
 
-    @functools.lru_cache(maxsize=None)
+    @cached("specializations")
     def get_specialization_name(self, specialization_id: int) -> str:
         """Get the name of a specialization by its ID."""
-        specialization_data = self._get_endpoint_v2(
+        specialization_data = self._get_game_data(
             f"specializations/{specialization_id}"
         )
         specialization_name = specialization_data["name"]
         return specialization_name
 
-    @functools.lru_cache(maxsize=None)
+    @cached("traits")
     def get_trait_name(self, trait_id: int) -> str:
         """Get the name of a trait by its ID."""
-        trait_data = self._get_endpoint_v2(
+        trait_data = self._get_game_data(
             f"traits/{trait_id}"
         )
         trait_name = trait_data["name"]
         return trait_name
 
-    @functools.lru_cache(maxsize=None)
     def get_item_data(self, item_id: int):
-        """Get the data of an item by its ID."""
-        item_data = self._get_endpoint_v2(
+        """Get the full data of an item by its ID, without caching it."""
+        item_data = self._get_game_data(
             f"items/{item_id}"
         )
         return item_data
 
-    @functools.lru_cache(maxsize=None)
+    def get_item_record(self, item_id: int) -> ItemRecord:
+        """Get the projected record of an item by its ID."""
+        item_record = self._items.get(item_id)
+        if item_record is None:
+            item_record = project_item(self.get_item_data(item_id))
+            self._items.add(item_record)
+        return item_record
+
+    def get_items(self, item_ids: Iterable[int]) -> None:
+        """Fetch the records of many items in bulk, skipping stored ones."""
+        missing = self._cache.namespace("missing")
+        item_ids = [
+            item_id for item_id in self._items.missing(item_ids)
+            if not missing.get(f"items/{item_id}")
+        ]
+        for i in range(0, len(item_ids), _MAX_IDS):
+            chunk = item_ids[i:i + _MAX_IDS]
+            try:
+                items_data = self._get_endpoint_v2(
+                    f"items?ids={','.join(map(str, chunk))}"
+                )
+            except InvalidIdError:
+                # The API answers with an error if none of the IDs exist.
+                items_data = []
+            self._items.extend(items_data)
+
+            # Remember the IDs the API left out as missing, judging by the
+            # response, since the bounded table may evict fetched items.
+            found = {item_data["id"] for item_data in items_data}
+            for item_id in chunk:
+                if item_id not in found:
+                    missing.set(f"items/{item_id}", True)
+
     def get_item_name(self, item_id: int) -> str:
         """Get the name of an item by its ID."""
-        item_data = self.get_item_data(item_id)
-        item_name = item_data["name"]
+        item_record = self.get_item_record(item_id)
+        item_name = item_record.name
         return item_name
 
-    @functools.lru_cache(maxsize=None)
     def get_weapon_type(self, item_id: int) -> str:
         """Get the type of a weapon by its item ID."""
-        item_data = self.get_item_data(item_id)
-        if item_data["type"] == "Weapon":
-            weapon_type_data = item_data["details"]["type"]
-            weapon_type = weapon_type_data.lower().capitalize()
-        else:
-            weapon_type = EMPTY_TYPE
+        item_record = self.get_item_record(item_id)
+        weapon_type = item_record.weapon_type
         return weapon_type
 
-    @functools.lru_cache(maxsize=None)
-    def get_stats_name(self, stats_id: int) -> str:
-        """Get the name of stats by its ID."""
-        stats_data = self._get_endpoint_v2(
+    @cached("itemstats")
+    def get_stats_data(self, stats_id: int):
+        """Get the data of stats, including attributes, by its ID."""
+        stats_data = self._get_game_data(
             f"itemstats/{stats_id}"
         )
+        return stats_data
+
+    @cached("itemstats")
+    def get_stats_name(self, stats_id: int) -> str:
+        """Get the name of stats by its ID."""
+        stats_data = self.get_stats_data(stats_id)
         stats_name = stats_data["name"]
         return stats_name
 
+    def get_if_modified(
+        self, endpoint: str, validators: dict[str, str]
+    ) -> Response | None:
+        """Get a response unless it is unchanged since the validators."""
+        headers = {}
+        if "etag" in validators:
+            headers["If-None-Match"] = validators["etag"]
+        if "last-modified" in validators:
+            headers["If-Modified-Since"] = validators["last-modified"]
+        response = self._request_v2(endpoint, headers)
+        if response.status_code == 304:
+            return None
+        self._check_response(response)
+        return response
+
     def get_build_templates(self, character: str) -> list[Build]:
         """Get build templates for a character."""
         buildtabs_json = self._get_endpoint_v2(
             f"characters/{character}/buildtabs?tabs=all"
         )
-        build_templates = self._parse_build_templates(
+        build_templates = self.parse_build_templates(
             buildtabs_json
         )
         return build_templates
@@ -504,30 +641,97 @@ class Api:
         equipmenttabs_json = self._get_endpoint_v2(
             f"characters/{character}/equipmenttabs?tabs=all"
         )
-        equipment_templates = self._parse_equipment_templates(
+        equipment_templates = self.parse_equipment_templates(
             equipmenttabs_json
         )
         return equipment_templates
 
+    def get_equipment_templates_bulk(
+        self, characters: list[str]
+    ) -> dict[str, list[Equipment]]:
+        """Get equipment templates for many characters at once."""
+
+        # Request the equipmenttabs of every character.
+        equipmenttabs_jsons = [
+            self._get_endpoint_v2(
+                f"characters/{character}/equipmenttabs?tabs=all"
+            )
+            for character in characters
+        ]
+
+        # Parse the JSON data into records, which is cheaper inline than
+        # pickling it to worker processes.
+        records_lists = [
+            _parse_equipment_records(equipmenttabs_json)
+            for equipmenttabs_json in equipmenttabs_jsons
+        ]
+
+        # Resolve names for all characters in one batched pass.
+        equipment_templates = self._resolve_equipment_records(records_lists)
+        return dict(zip(characters, equipment_templates))
+
+    def get_character_bundle(
+        self, characters: list[str] | None = None
+    ) -> dict[str, Character]:
+        """Get the profession and templates of many characters at once."""
+
+        # Request the full character data, all at once or in chunks of IDs.
+        if characters is None:
+            characters_json = self._get_endpoint_v2("characters?ids=all")
+        else:
+            characters_json = []
+            for i in range(0, len(characters), _MAX_IDS):
+                ids = ",".join(
+                    quote(character, safe="")
+                    for character in characters[i:i + _MAX_IDS]
+                )
+                characters_json.extend(
+                    self._get_endpoint_v2(f"characters?ids={ids}")
+                )
+
+        # Parse the equipment of all characters and resolve it in one pass.
+        records_lists = [
+            _parse_equipment_records(character_json["equipment_tabs"])
+            for character_json in characters_json
+        ]
+        equipment_templates = self._resolve_equipment_records(records_lists)
+
+        # Create a character with its builds and equipments.
+        bundle = {}
+        for character_json, equipments in zip(
+            characters_json, equipment_templates
+        ):
+            character_name = character_json["name"]
+            bundle[character_name] = Character(
+                name=character_name,
+                profession=character_json["profession"],
+                builds=self.parse_build_templates(
+                    character_json["build_tabs"]
+                ),
+                equipments=equipments
+            )
+
+        # Return the dict of characters.
+        return bundle
+
 
 if __name__ == "__main__":
     api = Api()
     api.set_api_key("<API_KEY>")
-    key_valid = api.check_key()
-    if key_valid:
-        permissions = api.get_permissions()
-        if ("account" in permissions and "characters" in permissions and
-                "builds" in permissions and "inventories" in permissions):
-            account_name = api.get_account_name()
-            characters = api.get_characters()
-            print(f"Account name: \n- {account_name}")
-            print("API key permissions:")
-            for permission in permissions:
-                print(f"- {permission.capitalize()}")
-            print("Characters:")
-            for character_name, profession_name in characters.items():
-                print(f"- {character_name} ({profession_name})")
-        else:
-            print("Insufficient API key permissions.")
-    else:
+    verdict = api.validate_key()
+    if verdict.status == KEY_OK:
+        account_name = api.get_account_name()
+        characters = api.get_characters()
+        print(f"Account name: \n- {account_name}")
+        print("API key permissions:")
+        for permission in verdict.permissions:
+            print(f"- {permission.capitalize()}")
+        print("Characters:")
+        for character_name, profession_name in characters.items():
+            print(f"- {character_name} ({profession_name})")
+    elif verdict.status == KEY_MISSING_PERMISSIONS:
+        print("Insufficient API key permissions.")
+    elif verdict.status == KEY_INVALID:
         print("Invalid API key.")
+    else:
+        print("Could not validate the API key.")
@@ -0,0 +1,242 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from constants import (
+    EMPTY_ID,
+    ARMOR_SLOTS,
+    ACCESSORY_SLOTS
+)
+from errors import (
+    InvalidIdError
+)
+from equipment import (
+    Stats,
+    Equipment
+)
+from compare import (
+    _normalize_stats_name
+)
+
+if TYPE_CHECKING:
+    import numpy
+
+# Define the attributes in the order of the attribute columns.
+ATTRIBUTES = (
+    "Power",
+    "Precision",
+    "Toughness",
+    "Vitality",
+    "CritDamage",
+    "ConditionDamage",
+    "ConditionDuration",
+    "BoonDuration",
+    "Healing"
+)
+
+# Define the in-game names of attributes the API names differently.
+ATTRIBUTE_NAMES = {
+    "CritDamage": "Ferocity",
+    "ConditionDamage": "Condition Damage",
+    "ConditionDuration": "Expertise",
+    "BoonDuration": "Concentration",
+    "Healing": "Healing Power"
+}
+
+# Define the attribute points of ascended items by slot class. A stat
+# multiplier times these gives the attribute, e.g. 0.35 * 180 = 63 Power
+# on a Berserker's helm. Trinkets are fitted to their major attribute.
+SLOT_BASES = {
+    "Helm": 180,
+    "Shoulders": 135,
+    "Coat": 404,
+    "Gloves": 135,
+    "Leggings": 269,
+    "Boots": 135,
+    "TwoHanded": 717,
+    "OneHanded": 359,
+    "Backpack": 180,
+    "Accessory": 314,
+    "Amulet": 449,
+    "Ring": 360
+}
+
+# Define the scale of the attribute points of each rarity.
+RARITY_SCALES = {
+    "Legendary": 1.0,
+    "Ascended": 1.0,
+    "Exotic": 0.955,
+    "Rare": 0.86
+}
+
+# Define the weapon types that take both hands.
+TWO_HANDED_TYPES = frozenset((
+    "Greatsword",
+    "Hammer",
+    "Longbow",
+    "Rifle",
+    "Shortbow",
+    "Spear",
+    "Staff"
+))
+
+# Define the weapon slots of each weapon set.
+WEAPON_SETS = {
+    "A": ("WeaponA1", "WeaponA2"),
+    "B": ("WeaponB1", "WeaponB2")
+}
+
+
+def _accessory_class(slot: str) -> str:
+    """Get the slot class of an accessory slot, e.g. "Ring1" to "Ring"."""
+    return slot.rstrip("0123456789")
+
+
+class StatsTable:
+    """Hold the attribute multipliers and values of stats as matrices."""
+
+    def __init__(self, stats_data: Iterable[Mapping]) -> None:
+        """Initialize an instance of the StatsTable class."""
+        import numpy as np
+        stats_data = list(stats_data)
+
+        # Reserve row zero for empty and unknown stats.
+        self.multipliers = np.zeros((len(stats_data) + 1, len(ATTRIBUTES)))
+        self.values = np.zeros_like(self.multipliers)
+        self._rows_by_id = {EMPTY_ID: 0}
+        self._rows_by_name = {}
+        self.unresolved = []
+        columns = {attribute: i for i, attribute in enumerate(ATTRIBUTES)}
+        for row, data in enumerate(stats_data, start=1):
+            self._rows_by_id[data["id"]] = row
+            self._rows_by_name.setdefault(
+                _normalize_stats_name(data["name"]), row
+            )
+            for attribute in data.get("attributes", []):
+                column = columns.get(attribute["attribute"])
+                if column is None:
+                    continue
+                self.multipliers[row, column] = attribute["multiplier"]
+                self.values[row, column] = attribute.get("value", 0)
+
+    @classmethod
+    def from_api(
+        cls, get_stats_data: Callable[[int], Mapping], stats_ids: Iterable[int]
+    ) -> StatsTable:
+        """Create a table from the itemstats data of the given IDs."""
+        stats_data = []
+        unresolved = []
+        for stats_id in sorted(set(stats_ids) - {EMPTY_ID}):
+            try:
+                stats_data.append(get_stats_data(stats_id))
+            except InvalidIdError:
+                # Count unknown stats as empty instead of failing the table.
+                unresolved.append(stats_id)
+        table = cls(stats_data)
+        table.unresolved = unresolved
+        return table
+
+    def row(self, stats: Stats) -> int:
+        """Get the row of stats by ID, or by name if the ID is unknown."""
+        if stats.id != EMPTY_ID:
+            return self._rows_by_id.get(stats.id, 0)
+        return self._rows_by_name.get(_normalize_stats_name(stats.name), 0)
+
+
+class AttributeCalculator:
+    """Compute the attribute totals of many equipments at once."""
+
+    def __init__(
+        self,
+        table: StatsTable,
+        weapon_set: str = "A",
+        rarity: str = "Ascended"
+    ) -> None:
+        """Initialize an instance of the AttributeCalculator class."""
+        import numpy as np
+        self._table = table
+        self._weapon_slots = WEAPON_SETS[weapon_set]
+        self._classes = {name: i for i, name in enumerate(SLOT_BASES)}
+
+        # Precompute the attributes of every stats in every slot class.
+        bases = np.array(list(SLOT_BASES.values()), dtype=float)
+        bases *= RARITY_SCALES[rarity]
+        self.coefficients = np.rint(
+            bases[:, None, None] * table.multipliers[None, :, :]
+            + table.values[None, :, :]
+        )
+
+    def _slots(self, equipment: Equipment):
+        """Yield the slot class and stats of each slot that counts."""
+        for armor in equipment.armors:
+            if armor.slot in ARMOR_SLOTS:
+                yield self._classes[armor.slot], armor.stats
+        for weapon in equipment.weapons:
+            if weapon.slot in self._weapon_slots:
+                slot_class = (
+                    "TwoHanded" if weapon.type in TWO_HANDED_TYPES
+                    else "OneHanded"
+                )
+                yield self._classes[slot_class], weapon.stats
+        for accessory in equipment.accessories:
+            if accessory.slot in ACCESSORY_SLOTS:
+                yield (
+                    self._classes[_accessory_class(accessory.slot)],
+                    accessory.stats
+                )
+
+    def indices(
+        self, equipments: Sequence[Equipment]
+    ) -> tuple[numpy.ndarray, numpy.ndarray]:
+        """Get the slot class and stats row of each slot of equipments."""
+        import numpy as np
+        width = len(ARMOR_SLOTS) + 2 + len(ACCESSORY_SLOTS)
+        classes = np.zeros((len(equipments), width), dtype=np.intp)
+        rows = np.zeros_like(classes)
+        for i, equipment in enumerate(equipments):
+            for j, (slot_class, stats) in enumerate(self._slots(equipment)):
+                classes[i, j] = slot_class
+                rows[i, j] = self._table.row(stats)
+        return classes, rows
+
+    def totals(self, equipments: Sequence[Equipment]) -> numpy.ndarray:
+        """Get the attribute totals of equipments, one row per equipment."""
+        classes, rows = self.indices(equipments)
+        return self.coefficients[classes, rows].sum(axis=1)
+
+    def deltas(
+        self, equipments: Sequence[Equipment], meta: Equipment
+    ) -> numpy.ndarray:
+        """Get the attribute totals of equipments minus those of a meta."""
+        return self.totals(equipments) - self.totals([meta])
+
+
+def describe_deltas(deltas: Sequence[float]) -> dict[str, int]:
+    """Describe the non-zero deltas of a row by attribute name."""
+    return {
+        ATTRIBUTE_NAMES.get(attribute, attribute): int(delta)
+        for attribute, delta in zip(ATTRIBUTES, deltas)
+        if delta
+    }
+
+
+if __name__ == "__main__":
+    from api import Api
+    from snowcrows import Snowcrows
+    api = Api()
+    api.set_api_key("<API_KEY>")
+    snowcrows = Snowcrows()
+    character = next(iter(api.get_character_bundle().values()))
+    builds = snowcrows.get_builds(character.profession)
+    _, meta_equipment = snowcrows.get_build(next(iter(builds)), builds)
+    stats_ids = [
+        item.stats.id
+        for equipment in [meta_equipment, *character.equipments]
+        for item in [
+            *equipment.armors, *equipment.weapons, *equipment.accessories
+        ]
+    ]
+    table = StatsTable.from_api(api.get_stats_data, stats_ids)
+    calculator = AttributeCalculator(table)
+    deltas = calculator.deltas(character.equipments, meta_equipment)
+    for equipment, row in zip(character.equipments, deltas):
+        print(f"{equipment.name}: {describe_deltas(row)}")
@@ -0,0 +1,521 @@
+import os
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+import tempfile
+import tracemalloc
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, is_dataclass
+from api import (
+    Api
+)
+from snowcrows import (
+    Snowcrows,
+    _make_soup
+)
+from extraction import (
+    extract_page
+)
+from equipment import (
+    Equipment
+)
+from compare import (
+    compare_build,
+    compare_equipment
+)
+from fixtures import (
+    SyntheticAccount,
+    SyntheticAccounts,
+    SyntheticSnowcrows,
+    SyntheticTransport
+)
+
+# Define the number of bytes in a mebibyte.
+_MIB = 2**20
+
+# Define the heavy dependencies that the warm path should not import.
+_HEAVY_MODULES = ("requests", "bs4")
+
+# Define the cache states a throughput run can start from.
+COLD_CACHE = "cold"
+WARM_CACHE = "warm"
+
+# Define the script that loads cached data in a fresh interpreter.
+_WARM_SCRIPT = """
+import sys
+from api import Api
+api = Api(api_key={api_key!r})
+api.load_cache({path!r})
+api.get_characters()
+print(",".join(name for name in {heavy!r} if name in sys.modules))
+"""
+
+
+@dataclass
+class MemoryReport:
+    """Represent the memory used to load synthetic accounts."""
+    current: int
+    peak: int
+    by_type: dict[str, tuple[int, int]]
+    by_line: list[tuple[str, int]]
+    caches: dict[str, int]
+
+    def within_budget(self, budget: int) -> bool:
+        """Check whether the peak memory stays within a budget in bytes."""
+        return self.peak <= budget
+
+
+def _count_by_type(value, counts: Counter, sizes: Counter, seen: set[int]):
+    """Count the instances and bytes of each type reachable from a value."""
+    stack = [value]
+    while stack:
+        value = stack.pop()
+        if id(value) in seen:
+            continue
+        seen.add(id(value))
+        name = type(value).__name__
+        counts[name] += 1
+        sizes[name] += sys.getsizeof(value)
+        if isinstance(value, dict):
+            stack.extend(value.keys())
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple, set, frozenset)):
+            stack.extend(value)
+        elif is_dataclass(value):
+            stack.append(vars(value))
+
+
+def measure_memory(
+    accounts: int = 1,
+    characters: int = 60,
+    equipment_tabs: int = 8,
+    top: int = 10
+) -> MemoryReport:
+    """Measure the memory used to load synthetic accounts through the Api."""
+
+    # Generate the accounts before tracing so only loading is measured.
+    synthetic_accounts = {
+        f"key-{seed}": SyntheticAccount(
+            characters=characters,
+            equipment_tabs=equipment_tabs,
+            seed=seed
+        )
+        for seed in range(accounts)
+    }
+    transport = SyntheticTransport(synthetic_accounts)
+
+    # Load every account while tracing allocations.
+    tracemalloc.start()
+    api = Api(transport=transport)
+    bundles = []
+    for api_key in synthetic_accounts:
+        api.set_api_key(api_key)
+        bundles.append(api.get_character_bundle())
+    snapshot = tracemalloc.take_snapshot()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # Group the allocations by source line and the loaded objects by type.
+    by_line = [
+        (str(statistic.traceback), statistic.size)
+        for statistic in snapshot.statistics("lineno")[:top]
+    ]
+    counts, sizes = Counter(), Counter()
+    _count_by_type(bundles, counts, sizes, set())
+    by_type = {
+        name: (counts[name], sizes[name])
+        for name, _ in sizes.most_common(top)
+    }
+
+    # Report the memory of each cache namespace.
+    caches = {
+        name: stats.memory
+        for name, stats in api.cache_stats().items()
+    }
+
+    return MemoryReport(
+        current=current,
+        peak=peak,
+        by_type=by_type,
+        by_line=by_line,
+        caches=caches
+    )
+
+
+@dataclass
+class ThroughputReport:
+    """Represent the throughput of checking accounts end to end."""
+    cache: str
+    workers: int
+    accounts: int
+    characters: int
+    seconds: float
+    cpu: float
+    requests: int
+    p50: float
+    p99: float
+
+    @property
+    def throughput(self) -> float:
+        """Get the number of characters checked per second."""
+        return self.characters / self.seconds if self.seconds else 0.0
+
+
+def _percentile(values: list[float], percent: float) -> float:
+    """Get a percentile of values by the nearest rank."""
+    if not values:
+        return 0.0
+    values = sorted(values)
+    rank = max(0, min(len(values) - 1, round(percent / 100 * len(values)) - 1))
+    return values[rank]
+
+
+def _check_account(
+    account_api: Api, snowcrows: Snowcrows
+) -> tuple[float, int]:
+    """Check all characters of an account and return its time and size."""
+    start = time.perf_counter()
+
+    # Load the roster like the UI, with one bundle request for all of it.
+    character_names = account_api.get_character_names()
+    bundle = account_api.get_character_bundle(character_names)
+    for character in bundle.values():
+        meta_builds = snowcrows.get_builds(character.profession)
+        meta_build, meta_equipment = snowcrows.get_build(
+            next(iter(meta_builds)), meta_builds
+        )
+        for build in character.builds:
+            compare_build(build, meta_build)
+        for equipment in character.equipments:
+            compare_equipment(equipment, meta_equipment)
+    return time.perf_counter() - start, len(bundle)
+
+
+def measure_throughput(
+    accounts: int = 100,
+    characters: int = 10,
+    build_tabs: int = 2,
+    equipment_tabs: int = 2,
+    latency: float = 0.005,
+    workers: tuple[int, ...] = (1, 4, 16, 64),
+    caches: tuple[str, ...] = (COLD_CACHE, WARM_CACHE)
+) -> list[ThroughputReport]:
+    """Measure the end-to-end throughput for each concurrency and cache."""
+    synthetic_accounts = SyntheticAccounts(
+        accounts,
+        characters=characters,
+        build_tabs=build_tabs,
+        equipment_tabs=equipment_tabs
+    )
+    transport = SyntheticTransport(synthetic_accounts, latency=latency)
+    snowcrows_transport = SyntheticSnowcrows(latency=latency)
+    api = Api(transport=transport)
+    snowcrows = Snowcrows(transport=snowcrows_transport)
+
+    # Keep a view per key across runs, so that its account data stays warm.
+    account_apis = [api.for_key(api_key) for api_key in synthetic_accounts]
+
+    def check_accounts(worker_count: int) -> list[tuple[float, int]]:
+        """Check all accounts with a number of concurrent workers."""
+        with ThreadPoolExecutor(max_workers=worker_count) as executor:
+            return list(executor.map(
+                lambda account_api: _check_account(account_api, snowcrows),
+                account_apis
+            ))
+
+    reports = []
+    for worker_count in workers:
+        for cache in caches:
+            if cache == COLD_CACHE:
+                # Drop the account data, game data and meta builds of
+                # earlier runs.
+                for account_api in account_apis:
+                    account_api._clear_cache()
+                api._clear_shared_cache()
+                snowcrows._clear_shared_cache()
+            else:
+                # Fill the account data, game data and meta builds first.
+                check_accounts(worker_count)
+            requests = (
+                transport.request_count + snowcrows_transport.request_count
+            )
+            cpu = time.process_time()
+            start = time.perf_counter()
+            results = check_accounts(worker_count)
+            seconds = time.perf_counter() - start
+            latencies = [elapsed for elapsed, _ in results]
+            reports.append(ThroughputReport(
+                cache=cache,
+                workers=worker_count,
+                accounts=accounts,
+                characters=sum(count for _, count in results),
+                seconds=seconds,
+                cpu=time.process_time() - cpu,
+                requests=(
+                    transport.request_count
+                    + snowcrows_transport.request_count
+                    - requests
+                ),
+                p50=_percentile(latencies, 50),
+                p99=_percentile(latencies, 99)
+            ))
+    return reports
+
+
+@dataclass
+class ParseReport:
+    """Represent the time to parse build pages with both parsers."""
+    pages: int
+    extraction: float
+    reference: float
+
+    @property
+    def speedup(self) -> float:
+        """Get how many times faster extraction is than the reference."""
+        return self.reference / self.extraction
+
+
+def measure_parse(paths: list[str], runs: int = 20) -> ParseReport:
+    """Measure the time to parse recorded build pages with both parsers."""
+    pages = []
+    for path in paths:
+        with open(path, "rb") as file:
+            pages.append(file.read())
+    snowcrows = Snowcrows()
+
+    def extract(content: bytes) -> None:
+        """Parse a page with the single-pass extraction."""
+        _, equipment_record = extract_page(path, content)
+        Equipment.from_record(equipment_record)
+
+    def reference(content: bytes) -> None:
+        """Parse a page with the BeautifulSoup reference parsers."""
+        html_content = _make_soup(content)
+        snowcrows._parse_build(path, html_content)
+        snowcrows._parse_equipment(path, html_content)
+
+    # Keep the best time of each parser to reduce noise.
+    timings = {}
+    for parse in (extract, reference):
+        best = float("inf")
+        for _ in range(runs):
+            start = time.perf_counter()
+            for content in pages:
+                parse(content)
+            best = min(best, time.perf_counter() - start)
+        timings[parse] = best
+    return ParseReport(
+        pages=len(pages),
+        extraction=timings[extract],
+        reference=timings[reference]
+    )
+
+
+@dataclass
+class StartupReport:
+    """Represent the time a fresh process needs for its first result."""
+    first_result: float
+    import_time: float
+    heavy_imports: list[str]
+    top_imports: list[tuple[str, float]]
+
+
+def _parse_importtime(stderr: str) -> list[tuple[str, float, bool]]:
+    """Parse the output of -X importtime into modules and seconds."""
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        imports.append((
+            name.strip(),
+            int(cumulative) / 1e6,
+            not name.startswith("  ")
+        ))
+    return imports
+
+
+def measure_startup(runs: int = 5, top: int = 10) -> StartupReport:
+    """Measure the time to the first result of a warm, cached run."""
+    directory = os.path.dirname(os.path.abspath(__file__))
+    api_key = "key-0"
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        # Fill a cache file from a synthetic account.
+        path = os.path.join(temporary_directory, "cache.pickle")
+        transport = SyntheticTransport({api_key: SyntheticAccount()})
+        api = Api(transport=transport, api_key=api_key)
+        api.get_characters()
+        api.save_cache(path)
+
+        # Time fresh interpreters that only load the cached data.
+        script = _WARM_SCRIPT.format(
+            api_key=api_key, path=path, heavy=_HEAVY_MODULES
+        )
+        timings = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            result = subprocess.run(
+                [sys.executable, "-X", "importtime", "-c", script],
+                cwd=directory,
+                capture_output=True,
+                text=True,
+                check=True
+            )
+            timings.append(time.perf_counter() - start)
+
+    # Summarise the imports of the last run.
+    imports = _parse_importtime(result.stderr)
+    top_imports = sorted(
+        ((name, seconds) for name, seconds, _ in imports),
+        key=lambda item: item[1],
+        reverse=True
+    )[:top]
+    heavy_imports = result.stdout.strip()
+
+    return StartupReport(
+        first_result=statistics.median(timings),
+        import_time=sum(
+            seconds for _, seconds, top_level in imports if top_level
+        ),
+        heavy_imports=heavy_imports.split(",") if heavy_imports else [],
+        top_imports=top_imports
+    )
+
+
+def _run_startup(args: argparse.Namespace) -> int:
+    """Run the startup benchmark."""
+    report = measure_startup(runs=args.runs)
+    print(f"Time to first result: {report.first_result * 1000:.1f} ms")
+    print(f"Import time: {report.import_time * 1000:.1f} ms")
+    print("Slowest imports:")
+    for name, seconds in report.top_imports:
+        print(f"- {name}: {seconds * 1000:.1f} ms")
+    if report.heavy_imports:
+        print(f"Heavy imports on the warm path: {report.heavy_imports}")
+        return 1
+    return 0
+
+
+def _run_throughput(args: argparse.Namespace) -> int:
+    """Run the throughput benchmark and print a row per measurement."""
+    reports = measure_throughput(
+        accounts=args.accounts,
+        characters=args.characters,
+        build_tabs=args.build_tabs,
+        equipment_tabs=args.equipment_tabs,
+        latency=args.latency / 1000,
+        workers=tuple(args.workers),
+        caches=tuple(args.caches)
+    )
+    print(
+        f"{'cache':<6}{'workers':>8}{'chars/s':>10}{'p50 ms':>10}"
+        f"{'p99 ms':>10}{'requests':>10}{'cpu s':>8}{'cpu %':>7}"
+    )
+    for report in reports:
+        print(
+            f"{report.cache:<6}{report.workers:>8}"
+            f"{report.throughput:>10.1f}"
+            f"{report.p50 * 1000:>10.1f}{report.p99 * 1000:>10.1f}"
+            f"{report.requests:>10}{report.cpu:>8.2f}"
+            f"{100 * report.cpu / report.seconds:>7.0f}"
+        )
+    return 0
+
+
+def _run_parse(args: argparse.Namespace) -> int:
+    """Run the parse benchmark over recorded build pages."""
+    report = measure_parse(args.pages, runs=args.runs)
+    print(f"Pages: {report.pages}")
+    print(f"Extraction: {report.extraction * 1000:.2f} ms")
+    print(f"BeautifulSoup: {report.reference * 1000:.2f} ms")
+    print(f"Speedup: {report.speedup:.1f}x")
+    return 0
+
+
+def _run_memory(args: argparse.Namespace) -> int:
+    """Run the memory benchmark and check it against the budget."""
+    report = measure_memory(
+        accounts=args.accounts,
+        characters=args.characters,
+        equipment_tabs=args.equipment_tabs
+    )
+    print(f"Current: {report.current / _MIB:.1f} MiB")
+    print(f"Peak: {report.peak / _MIB:.1f} MiB")
+    print("By type:")
+    for name, (count, size) in report.by_type.items():
+        print(f"- {name}: {count} objects, {size / _MIB:.1f} MiB")
+    print("By line:")
+    for line, size in report.by_line:
+        print(f"- {line}: {size / _MIB:.1f} MiB")
+    print("Caches:")
+    for name, size in report.caches.items():
+        print(f"- {name}: {size / _MIB:.1f} MiB")
+    if args.budget is not None and not report.within_budget(
+        int(args.budget * _MIB)
+    ):
+        print(f"Peak exceeds the budget of {args.budget} MiB.")
+        return 1
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run a benchmark selected on the command line."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark the meta build checker."
+    )
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    memory_parser = subparsers.add_parser(
+        "memory", help="Measure the memory of loading synthetic accounts."
+    )
+    memory_parser.add_argument("--accounts", type=int, default=1)
+    memory_parser.add_argument("--characters", type=int, default=60)
+    memory_parser.add_argument("--equipment-tabs", type=int, default=8)
+    memory_parser.add_argument(
+        "--budget", type=float, default=None,
+        help="Fail if the peak exceeds this many MiB."
+    )
+    memory_parser.set_defaults(run=_run_memory)
+
+    startup_parser = subparsers.add_parser(
+        "startup", help="Measure the time to the first result of a warm run."
+    )
+    startup_parser.add_argument("--runs", type=int, default=5)
+    startup_parser.set_defaults(run=_run_startup)
+
+    throughput_parser = subparsers.add_parser(
+        "throughput", help="Measure end-to-end checks against simulated APIs."
+    )
+    throughput_parser.add_argument("--accounts", type=int, default=100)
+    throughput_parser.add_argument("--characters", type=int, default=10)
+    throughput_parser.add_argument("--build-tabs", type=int, default=2)
+    throughput_parser.add_argument("--equipment-tabs", type=int, default=2)
+    throughput_parser.add_argument(
+        "--latency", type=float, default=5.0,
+        help="Simulated latency of each request in milliseconds."
+    )
+    throughput_parser.add_argument(
+        "--workers", type=int, nargs="+", default=[1, 4, 16, 64]
+    )
+    throughput_parser.add_argument(
+        "--caches", nargs="+", choices=(COLD_CACHE, WARM_CACHE),
+        default=[COLD_CACHE, WARM_CACHE]
+    )
+    throughput_parser.set_defaults(run=_run_throughput)
+
+    parse_parser = subparsers.add_parser(
+        "parse", help="Compare the parse time of recorded build pages."
+    )
+    parse_parser.add_argument("pages", nargs="+")
+    parse_parser.add_argument("--runs", type=int, default=20)
+    parse_parser.set_defaults(run=_run_parse)
+
+    args = parser.parse_args(argv)
+    return args.run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,363 @@
+import sys
+import json
+import time
+import inspect
+import functools
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass, fields, is_dataclass
+
+# Define the scopes a cache namespace can have.
+INSTANCE_SCOPE = "instance"
+SHARED_SCOPE = "shared"
+
+# Define a sentinel for missing cache entries.
+_MISSING = object()
+
+# Store the namespaces that are shared by all caches.
+_SHARED_NAMESPACES = {}
+_SHARED_LOCK = threading.Lock()
+
+# Store the dataclasses that cache files may hold, by name.
+_PERSISTED_TYPES = {}
+
+
+def persist_types(*types: type) -> None:
+    """Allow cache files to hold instances of the given dataclasses."""
+    for cls in types:
+        _PERSISTED_TYPES[cls.__name__] = cls
+
+
+def _encode(value):
+    """Convert a value into JSON data, tagging tuples and dataclasses."""
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    if isinstance(value, list):
+        return [_encode(item) for item in value]
+    if isinstance(value, tuple):
+        return {"__tuple__": [_encode(item) for item in value]}
+    if isinstance(value, dict):
+        return {"__dict__": [
+            [_encode(key), _encode(item)] for key, item in value.items()
+        ]}
+    cls = type(value)
+    if is_dataclass(value) and _PERSISTED_TYPES.get(cls.__name__) is cls:
+        return {
+            "__type__": cls.__name__,
+            "fields": {
+                field.name: _encode(getattr(value, field.name))
+                for field in fields(value)
+            }
+        }
+    raise TypeError(f"Cannot persist a value of type {cls.__name__}")
+
+
+def _decode(data):
+    """Convert JSON data written by _encode back into a value."""
+    if isinstance(data, list):
+        return [_decode(item) for item in data]
+    if not isinstance(data, dict):
+        return data
+    if "__tuple__" in data:
+        return tuple(_decode(item) for item in data["__tuple__"])
+    if "__dict__" in data:
+        return {
+            _freeze(_decode(key)): _decode(item)
+            for key, item in data["__dict__"]
+        }
+
+    # Only build the dataclasses that were allowed, never arbitrary types.
+    cls = _PERSISTED_TYPES.get(data.get("__type__"))
+    if cls is None:
+        raise ValueError(f"Unknown persisted type: {data.get('__type__')}")
+    return cls(**{
+        name: _decode(item) for name, item in data["fields"].items()
+    })
+
+
+def _sizeof(value, seen: set[int] | None = None) -> int:
+    """Estimate the memory used by a value and everything it references."""
+    if seen is None:
+        seen = set()
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(
+            _sizeof(key, seen) + _sizeof(item, seen)
+            for key, item in value.items()
+        )
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(_sizeof(item, seen) for item in value)
+    elif is_dataclass(value):
+        size += sum(
+            _sizeof(getattr(value, field.name), seen)
+            for field in fields(value)
+        )
+    return size
+
+
+def _freeze(value):
+    """Convert a value into a hashable form for use in a cache key."""
+    if isinstance(value, dict):
+        return frozenset((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, set):
+        return frozenset(value)
+    return value
+
+
+@dataclass
+class CacheStats:
+    """Represent the statistics of a cache namespace."""
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    memory: int
+
+
+class CacheNamespace:
+    """Store values by key, bounded by count, age and memory."""
+
+    def __init__(
+        self,
+        maxsize: int | None = None,
+        ttl: float | None = None,
+        maxbytes: int | None = None
+    ) -> None:
+        """Initialize an instance of the CacheNamespace class."""
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.maxbytes = maxbytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._memory = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def _remove(self, key) -> None:
+        """Remove an entry and release its memory, holding the lock."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._memory -= entry[2]
+
+    def _evict(self) -> None:
+        """Evict the least recently used entries, holding the lock."""
+        while self._entries and (
+            (self.maxsize is not None and len(self._entries) > self.maxsize)
+            or (self.maxbytes is not None and self._memory > self.maxbytes)
+        ):
+            key = next(iter(self._entries))
+            self._remove(key)
+            self._evictions += 1
+
+    def get(self, key, default=None):
+        """Get the value for a key, or the default if it is not cached."""
+
+        # Look up the entry without the lock so readers never block. The
+        # counters are updated without the lock and may undercount slightly.
+        entry = self._entries.get(key)
+        if entry is None:
+            self._misses += 1
+            return default
+        value, expires, _ = entry
+        if expires is not None and expires <= time.monotonic():
+            # Handle the case when the entry has expired.
+            with self._lock:
+                if self._entries.get(key) is entry:
+                    self._remove(key)
+                    self._evictions += 1
+            self._misses += 1
+            return default
+        if self._lock.acquire(blocking=False):
+            # Mark the entry as recently used unless a writer is busy.
+            try:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+            finally:
+                self._lock.release()
+        self._hits += 1
+        return value
+
+    def _insert(self, key, value, expires: float | None) -> None:
+        """Insert an entry and evict entries beyond the bounds."""
+        nbytes = _sizeof(value)
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (value, expires, nbytes)
+            self._memory += nbytes
+            self._evict()
+
+    def set(self, key, value) -> None:
+        """Set the value for a key and evict entries beyond the bounds."""
+        expires = None
+        if self.ttl is not None:
+            expires = time.monotonic() + self.ttl
+        self._insert(key, value, expires)
+
+    def invalidate(self, key=_MISSING) -> None:
+        """Drop a single key, or every key if none is given."""
+        with self._lock:
+            if key is _MISSING:
+                self._entries.clear()
+                self._memory = 0
+            else:
+                self._remove(key)
+
+    def dump(self) -> list[tuple]:
+        """Get the unexpired entries with their expiry in wall-clock time."""
+        now, wall = time.monotonic(), time.time()
+        with self._lock:
+            return [
+                (key, value, None if expires is None else wall + expires - now)
+                for key, (value, expires, _) in self._entries.items()
+                if expires is None or expires > now
+            ]
+
+    def restore(self, entries: list[tuple]) -> None:
+        """Add entries from a dump, skipping those that have expired."""
+        now, wall = time.monotonic(), time.time()
+        for key, value, expires in entries:
+            if expires is None:
+                self._insert(key, value, None)
+            elif expires > wall:
+                self._insert(key, value, now + expires - wall)
+
+    def stats(self) -> CacheStats:
+        """Get the statistics of the namespace."""
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                size=len(self._entries),
+                memory=self._memory
+            )
+
+
+class Cache:
+    """Manage named cache namespaces, each with its own policy and scope."""
+
+    def __init__(self) -> None:
+        """Initialize an instance of the Cache class."""
+        self._namespaces = {}
+        self._scopes = {}
+        self._transient = set()
+        self._lock = threading.Lock()
+
+    def configure(
+        self,
+        name: str,
+        maxsize: int | None = None,
+        ttl: float | None = None,
+        maxbytes: int | None = None,
+        scope: str = INSTANCE_SCOPE,
+        factory: Callable[..., CacheNamespace] = CacheNamespace,
+        persist: bool = True
+    ) -> CacheNamespace:
+        """Create a namespace with a policy, or join a shared one."""
+        if scope == SHARED_SCOPE:
+            with _SHARED_LOCK:
+                if name not in _SHARED_NAMESPACES:
+                    _SHARED_NAMESPACES[name] = factory(
+                        maxsize=maxsize,
+                        ttl=ttl,
+                        maxbytes=maxbytes
+                    )
+                namespace = _SHARED_NAMESPACES[name]
+        elif scope == INSTANCE_SCOPE:
+            namespace = factory(
+                maxsize=maxsize,
+                ttl=ttl,
+                maxbytes=maxbytes
+            )
+        else:
+            raise ValueError(f"Unknown cache scope: {scope}")
+        with self._lock:
+            self._scopes.setdefault(name, scope)
+            if not persist:
+                self._transient.add(name)
+            return self._namespaces.setdefault(name, namespace)
+
+    def namespace(self, name: str) -> CacheNamespace:
+        """Get a namespace, creating an unbounded one if it is missing."""
+        namespace = self._namespaces.get(name)
+        if namespace is None:
+            return self.configure(name)
+        return namespace
+
+    def invalidate(self, *names: str) -> None:
+        """Drop every entry from the given namespaces."""
+        for name in names:
+            namespace = self._namespaces.get(name)
+            if namespace is not None:
+                namespace.invalidate()
+
+    def clear(self) -> None:
+        """Drop every entry from the namespaces of this cache only."""
+        self.invalidate(*[
+            name for name, scope in list(self._scopes.items())
+            if scope == INSTANCE_SCOPE
+        ])
+
+    def clear_shared(self) -> None:
+        """Drop every entry from the shared namespaces of all caches."""
+        self.invalidate(*[
+            name for name, scope in list(self._scopes.items())
+            if scope == SHARED_SCOPE
+        ])
+
+    def save(self, path: str) -> None:
+        """Save the unexpired entries of the persisted namespaces to a file."""
+        dump = {
+            name: _encode(namespace.dump())
+            for name, namespace in list(self._namespaces.items())
+            if name not in self._transient
+        }
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(dump, file)
+
+    def load(self, path: str) -> None:
+        """Load entries saved to a file into the persisted namespaces."""
+        with open(path, encoding="utf-8") as file:
+            dump = json.load(file)
+        for name, entries in dump.items():
+            if name in self._namespaces and name not in self._transient:
+                self.namespace(name).restore(_decode(entries))
+
+    def stats(self) -> dict[str, CacheStats]:
+        """Get the statistics of all namespaces."""
+        return {
+            name: namespace.stats()
+            for name, namespace in list(self._namespaces.items())
+        }
+
+
+def cached(namespace: str):
+    """Memoize a method in a namespace of the instance's cache."""
+    def decorator(method):
+        signature = inspect.signature(method)
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            # Key calls by their bound arguments, so that a default given
+            # by position, by keyword or not at all shares one entry.
+            arguments = signature.bind(self, *args, **kwargs)
+            arguments.apply_defaults()
+            store = self._cache.namespace(namespace)
+            key = (
+                method.__name__,
+                *map(_freeze, list(arguments.arguments.values())[1:])
+            )
+            value = store.get(key, _MISSING)
+            if value is _MISSING:
+                value = method(*arguments.args, **arguments.kwargs)
+                store.set(key, value)
+            return value
+        return wrapper
+    return decorator
@@ -0,0 +1,144 @@
+import gzip
+import json
+import time
+import hashlib
+import threading
+from transport import (
+    Response,
+    Transport
+)
+
+# Define the modes a cassette can operate in.
+RECORD_MODE = "record"
+REPLAY_MODE = "replay"
+
+# Define the version of the archive format.
+_ARCHIVE_VERSION = 1
+
+# Define the request headers that select a conditional response.
+_CONDITIONAL_HEADERS = ("if-none-match", "if-modified-since")
+
+
+class CassetteError(Exception):
+    """Raise when a request has no recorded response to replay."""
+
+
+class Cassette(Transport):
+    """Record HTTP responses into an archive and replay them offline."""
+
+    def __init__(
+        self,
+        path: str,
+        mode: str = REPLAY_MODE,
+        transport: Transport | None = None,
+        realtime: bool = False
+    ) -> None:
+        """Initialize an instance of the Cassette class."""
+        super().__init__()
+        if mode not in (RECORD_MODE, REPLAY_MODE):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self._path = path
+        self._mode = mode
+        self._transport = transport or Transport()
+        self._realtime = realtime
+        self._interactions = {}
+        self._positions = {}
+        self._lock = threading.Lock()
+        if mode == REPLAY_MODE:
+            self.load()
+
+    def __enter__(self):
+        """Enter the context of the cassette."""
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Save the recorded responses when leaving the context."""
+        if self._mode == RECORD_MODE:
+            self.save()
+
+    @staticmethod
+    def _key(url: str, headers: dict[str, str]) -> str:
+        """Build a key for a request without storing its credentials."""
+        headers = {key.lower(): value for key, value in headers.items()}
+        authorization = headers.get("authorization", "")
+        digest = hashlib.sha256(authorization.encode()).hexdigest()[:16]
+        key = f"{digest} {url}"
+
+        # Keep conditional requests apart, since they may be answered by 304.
+        for name in _CONDITIONAL_HEADERS:
+            if name in headers:
+                key += f" {name}={headers[name]}"
+        return key
+
+    def load(self) -> None:
+        """Load the recorded responses from the archive."""
+        with gzip.open(self._path, "rt", encoding="utf-8") as file:
+            archive = json.load(file)
+        if archive["version"] != _ARCHIVE_VERSION:
+            raise CassetteError(
+                f"Unsupported cassette version: {archive['version']}"
+            )
+        self._interactions = {}
+        self._positions = {}
+        for interaction in archive["interactions"]:
+            response = Response(
+                url=interaction["url"],
+                status_code=interaction["status"],
+                headers=interaction["headers"],
+                content=interaction["body"].encode(
+                    "utf-8", "surrogateescape"
+                ),
+                elapsed=interaction["elapsed"]
+            )
+            self._interactions.setdefault(
+                interaction["key"], []
+            ).append(response)
+
+    def save(self) -> None:
+        """Save the recorded responses into the archive."""
+        with self._lock:
+            recorded = [
+                (key, response)
+                for key, responses in self._interactions.items()
+                for response in responses
+            ]
+        interactions = [
+            {
+                "key": key,
+                "url": response.url,
+                "status": response.status_code,
+                "headers": response.headers,
+                "body": response.content.decode("utf-8", "surrogateescape"),
+                "elapsed": response.elapsed
+            }
+            for key, response in recorded
+        ]
+        archive = {
+            "version": _ARCHIVE_VERSION,
+            "interactions": interactions
+        }
+        with gzip.open(self._path, "wt", encoding="utf-8") as file:
+            json.dump(archive, file, separators=(",", ":"))
+
+    def get(self, url: str, headers: dict[str, str]) -> Response:
+        """Record or replay the response to a GET request."""
+        key = self._key(url, headers)
+
+        if self._mode == RECORD_MODE:
+            # Forward the request and keep its response.
+            response = self._transport.get(url, headers)
+            with self._lock:
+                self._interactions.setdefault(key, []).append(response)
+            return response
+
+        # Replay recorded responses in order, repeating the last one.
+        responses = self._interactions.get(key)
+        if not responses:
+            raise CassetteError(f"No recorded response for {url}")
+        with self._lock:
+            position = self._positions.get(key, 0)
+            self._positions[key] = position + 1
+        response = responses[min(position, len(responses) - 1)]
+        if self._realtime:
+            time.sleep(response.elapsed)
+        return response
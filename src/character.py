@@ -0,0 +1,29 @@
+from dataclasses import dataclass
+from constants import (
+    EMPTY_NAME
+)
+from build import (
+    Build
+)
+from equipment import (
+    Equipment
+)
+
+
+@dataclass
+class Character:
+    """Represent a character with a name, profession and templates."""
+    name: str
+    profession: str
+    builds: list[Build]
+    equipments: list[Equipment]
+
+    @classmethod
+    def empty(cls):
+        """Create an instance with empty values."""
+        return cls(
+            name=EMPTY_NAME,
+            profession=EMPTY_NAME,
+            builds=[],
+            equipments=[]
+        )
@@ -0,0 +1,176 @@
+from dataclasses import dataclass, field
+from constants import (
+    EMPTY_NAME
+)
+from errors import (
+    DeadlineError,
+    UnknownBuildError
+)
+from deadline import (
+    check_deadline,
+    deadline
+)
+from api import (
+    Api
+)
+from snowcrows import (
+    Snowcrows
+)
+from compare import (
+    SlotDiff,
+    compare_build,
+    compare_equipment
+)
+
+# Define the markers of parts of a check that ran out of time or that could
+# not be resolved.
+UNRESOLVED_CHARACTER = "character"
+UNRESOLVED_META_BUILDS = "meta builds"
+UNRESOLVED_META = "meta"
+UNRESOLVED_BUILD = "build"
+UNRESOLVED_EQUIPMENT = "equipment"
+
+
+@dataclass
+class CheckResult:
+    """Represent the differences of a character's templates to a meta build."""
+    character: str
+    profession: str
+    meta: str
+    builds: dict[str, list[SlotDiff]]
+    equipments: dict[str, list[SlotDiff]]
+    unresolved: list[str] = field(default_factory=list)
+
+    @property
+    def diff_count(self) -> int:
+        """Count the differences across all templates."""
+        return sum(map(len, self.builds.values())) + sum(
+            map(len, self.equipments.values())
+        )
+
+    @property
+    def complete(self) -> bool:
+        """Whether every part of the check was resolved in time."""
+        return not self.unresolved
+
+
+def _compare_templates(
+    result: CheckResult, character, meta_build, meta_equipment
+) -> None:
+    """Compare templates until done or out of time, marking the rest."""
+    pending = [
+        (UNRESOLVED_BUILD, build, meta_build, compare_build, result.builds)
+        for build in character.builds
+    ] + [
+        (
+            UNRESOLVED_EQUIPMENT,
+            equipment,
+            meta_equipment,
+            compare_equipment,
+            result.equipments
+        )
+        for equipment in character.equipments
+    ]
+    for i, (kind, template, meta, compare, diffs) in enumerate(pending):
+        try:
+            check_deadline()
+        except DeadlineError:
+            result.unresolved.extend(
+                f"{kind} {template.name}" for kind, template, *_ in pending[i:]
+            )
+            return
+        diffs[template.name] = compare(template, meta)
+
+
+def check_character(
+    api: Api,
+    snowcrows: Snowcrows,
+    character_name: str,
+    build_name: str | None = None,
+    timeout: float | None = None
+) -> CheckResult:
+    """Check a character against a meta build, or the closest one."""
+    result = CheckResult(
+        character=character_name,
+        profession=EMPTY_NAME,
+        meta=EMPTY_NAME,
+        builds={},
+        equipments={}
+    )
+    with deadline(timeout):
+
+        # Get the character with its profession and templates.
+        try:
+            character = api.get_character_bundle(
+                [character_name]
+            )[character_name]
+        except DeadlineError:
+            result.unresolved.append(UNRESOLVED_CHARACTER)
+            return result
+        result.profession = character.profession
+
+        # Get the meta builds to compare against.
+        try:
+            meta_builds = snowcrows.get_builds(character.profession)
+        except DeadlineError:
+            result.unresolved.append(UNRESOLVED_META_BUILDS)
+            return result
+        if build_name is not None:
+            if build_name not in meta_builds:
+                raise UnknownBuildError(
+                    f"No meta build {build_name!r} for "
+                    f"{character.profession}, only: "
+                    f"{', '.join(meta_builds) or 'none'}"
+                )
+            meta_names = [build_name]
+        else:
+            meta_names = list(meta_builds)
+        if not meta_names:
+            # Report a profession without meta builds as not checked.
+            result.unresolved.append(UNRESOLVED_META_BUILDS)
+            return result
+
+        # Compare the templates to each meta build and keep the closest one.
+        best = None
+        skipped = []
+        for i, meta_name in enumerate(meta_names):
+            try:
+                meta_build, meta_equipment = snowcrows.get_build(
+                    meta_name, meta_builds
+                )
+            except DeadlineError:
+                skipped = [
+                    f"{UNRESOLVED_META} {name}" for name in meta_names[i:]
+                ]
+                break
+            candidate = CheckResult(
+                character=character.name,
+                profession=character.profession,
+                meta=meta_name,
+                builds={},
+                equipments={}
+            )
+            _compare_templates(
+                candidate, character, meta_build, meta_equipment
+            )
+            if best is None or (
+                candidate.complete and (
+                    not best.complete
+                    or candidate.diff_count < best.diff_count
+                )
+            ):
+                best = candidate
+            if not candidate.complete:
+                # Keep the partial comparison only if nothing better exists.
+                start = i + 1 if best is candidate else i
+                skipped = [
+                    f"{UNRESOLVED_META} {name}"
+                    for name in meta_names[start:]
+                ]
+                break
+
+    # Return the closest result, marking the meta builds left unchecked.
+    if best is None:
+        best = result
+    best.unresolved.extend(skipped)
+    return best
@@ -0,0 +1,253 @@
+from dataclasses import astuple, dataclass
+from collections.abc import Iterable
+from constants import (
+    EMPTY_ID,
+    EMPTY_NAME,
+    EMPTY_TYPE
+)
+from build import (
+    Build
+)
+from equipment import (
+    Equipment
+)
+from character import (
+    Character
+)
+from fingerprint import (
+    Deduplicator,
+    fingerprint_build,
+    fingerprint_equipment,
+    fingerprint_meta
+)
+from comparison_cache import (
+    ComparisonCache
+)
+
+
+@dataclass
+class SlotDiff:
+    """Represent a difference between a template and a meta slot."""
+    slot: str
+    field: str
+    actual: str
+    expected: str
+
+
+def _describe(id: int, name: str) -> str:
+    """Describe a component by its name, or by its ID if unnamed."""
+    if name:
+        return name
+    if id:
+        return str(id)
+    return "-"
+
+
+def _normalize_stats_name(name: str) -> str:
+    """Normalize a stats name, e.g. "Berserker's" to "berserker"."""
+    return name.lower().removesuffix("'s")
+
+
+def compare_build(template: Build, meta: Build) -> list[SlotDiff]:
+    """Compare a build template to a meta build by ID."""
+
+    # Initialize an empty list to store differences.
+    diffs = []
+
+    # Compare the skills the meta build specifies.
+    for i, (skill, meta_skill) in enumerate(
+        zip(template.skills, meta.skills)
+    ):
+        if meta_skill.id != EMPTY_ID and skill.id != meta_skill.id:
+            diffs.append(SlotDiff(
+                slot=f"Skill {i + 1}",
+                field="skill",
+                actual=_describe(skill.id, skill.name),
+                expected=_describe(meta_skill.id, meta_skill.name)
+            ))
+
+    # Compare the specializations and traits the meta build specifies.
+    for i, (specialization, meta_specialization) in enumerate(
+        zip(template.specializations, meta.specializations)
+    ):
+        if meta_specialization.id == EMPTY_ID:
+            continue
+        if specialization.id != meta_specialization.id:
+            diffs.append(SlotDiff(
+                slot=f"Specialization {i + 1}",
+                field="specialization",
+                actual=_describe(specialization.id, specialization.name),
+                expected=_describe(
+                    meta_specialization.id, meta_specialization.name
+                )
+            ))
+            continue
+        for j, (trait, meta_trait) in enumerate(
+            zip(specialization.traits, meta_specialization.traits)
+        ):
+            if meta_trait.id != EMPTY_ID and trait.id != meta_trait.id:
+                diffs.append(SlotDiff(
+                    slot=f"Specialization {i + 1}",
+                    field=f"trait {j + 1}",
+                    actual=_describe(trait.id, trait.name),
+                    expected=_describe(meta_trait.id, meta_trait.name)
+                ))
+
+    # Return the list of differences.
+    return diffs
+
+
+def compare_equipment(template: Equipment, meta: Equipment) -> list[SlotDiff]:
+    """Compare an equipment template to a meta equipment by slot."""
+
+    # Initialize an empty list to store differences.
+    diffs = []
+
+    def compare_ids(slot, field, component, meta_component):
+        """Compare a component by ID if the meta specifies it."""
+        if meta_component.id != EMPTY_ID and component.id != meta_component.id:
+            diffs.append(SlotDiff(
+                slot=slot,
+                field=field,
+                actual=_describe(component.id, component.name),
+                expected=_describe(meta_component.id, meta_component.name)
+            ))
+
+    # Compare the armors.
+    for armor, meta_armor in zip(template.armors, meta.armors):
+        compare_ids(armor.slot, "stats", armor.stats, meta_armor.stats)
+        compare_ids(armor.slot, "upgrade", armor.upgrade, meta_armor.upgrade)
+        compare_ids(
+            armor.slot, "infusion", armor.infusion, meta_armor.infusion
+        )
+
+    # Compare the weapons, whose meta stats are only known by name.
+    for weapon, meta_weapon in zip(template.weapons, meta.weapons):
+        if meta_weapon.type != EMPTY_TYPE and (
+            weapon.type.lower() != meta_weapon.type.lower()
+        ):
+            diffs.append(SlotDiff(
+                slot=weapon.slot,
+                field="type",
+                actual=weapon.type or "-",
+                expected=meta_weapon.type
+            ))
+        if meta_weapon.stats.id != EMPTY_ID:
+            compare_ids(weapon.slot, "stats", weapon.stats, meta_weapon.stats)
+        elif meta_weapon.stats.name != EMPTY_NAME and (
+            _normalize_stats_name(weapon.stats.name)
+            != _normalize_stats_name(meta_weapon.stats.name)
+        ):
+            diffs.append(SlotDiff(
+                slot=weapon.slot,
+                field="stats",
+                actual=_describe(weapon.stats.id, weapon.stats.name),
+                expected=meta_weapon.stats.name
+            ))
+        for i, (upgrade, meta_upgrade) in enumerate(
+            zip(weapon.upgrades, meta_weapon.upgrades)
+        ):
+            compare_ids(weapon.slot, f"upgrade {i + 1}", upgrade, meta_upgrade)
+        for i, (infusion, meta_infusion) in enumerate(
+            zip(weapon.infusions, meta_weapon.infusions)
+        ):
+            compare_ids(
+                weapon.slot, f"infusion {i + 1}", infusion, meta_infusion
+            )
+
+    # Compare the accessories.
+    for accessory, meta_accessory in zip(
+        template.accessories, meta.accessories
+    ):
+        compare_ids(
+            accessory.slot, "stats", accessory.stats, meta_accessory.stats
+        )
+        for i, (infusion, meta_infusion) in enumerate(
+            zip(accessory.infusions, meta_accessory.infusions)
+        ):
+            compare_ids(
+                accessory.slot, f"infusion {i + 1}", infusion, meta_infusion
+            )
+
+    # Compare the relic.
+    compare_ids("Relic", "relic", template.relic, meta.relic)
+
+    # Return the list of differences.
+    return diffs
+
+
+def _compare_unique(
+    kind: str,
+    templates: Deduplicator,
+    compare,
+    meta_template,
+    cache: ComparisonCache | None,
+    meta_id: str,
+    version: str
+) -> dict:
+    """Compare distinct templates, reusing and storing cached results."""
+    unique = templates.unique()
+    results = {}
+    if cache is not None:
+        results = {
+            fingerprint: [SlotDiff(*diff) for diff in diffs]
+            for fingerprint, diffs in cache.get_many(
+                kind, unique, meta_id, version
+            ).items()
+        }
+    missing = {
+        fingerprint: compare(template, meta_template)
+        for fingerprint, template in unique.items()
+        if fingerprint not in results
+    }
+    if cache is not None and missing:
+        cache.put_many(
+            kind,
+            {
+                fingerprint: [astuple(diff) for diff in diffs]
+                for fingerprint, diffs in missing.items()
+            },
+            meta_id,
+            version
+        )
+    return templates.fan_out({**results, **missing})
+
+
+def compare_characters(
+    characters: Iterable[Character],
+    meta: tuple[Build, Equipment],
+    cache: ComparisonCache | None = None,
+    meta_id: str | None = None
+) -> dict[tuple[str, str, int], list[SlotDiff]]:
+    """Compare the templates of many characters, once per distinct one."""
+    meta_build, meta_equipment = meta
+
+    # Group identical templates across all characters.
+    builds = Deduplicator(fingerprint_build)
+    equipments = Deduplicator(fingerprint_equipment)
+    for character in characters:
+        for i, build in enumerate(character.builds):
+            builds.add((character.name, "build", i), build)
+        for i, equipment in enumerate(character.equipments):
+            equipments.add((character.name, "equipment", i), equipment)
+
+    # Record the version of the meta build, dropping outdated results.
+    version = f"{fingerprint_meta(meta_build, meta_equipment):032x}"
+    if meta_id is None:
+        # Key the results by content, since there is no stable ID to prune
+        # the results of older versions by.
+        meta_id = version
+    if cache is not None:
+        cache.set_snapshot(meta_id, version)
+
+    # Compare each distinct template and fan the result out to its owners.
+    return {
+        **_compare_unique(
+            "build", builds, compare_build, meta_build,
+            cache, meta_id, version
+        ),
+        **_compare_unique(
+            "equipment", equipments, compare_equipment, meta_equipment,
+            cache, meta_id, version
+        )
+    }
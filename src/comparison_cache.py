@@ -0,0 +1,103 @@
+import json
+import sqlite3
+import threading
+from collections.abc import Iterable
+
+# Define the maximum number of parameters per SQLite query.
+_MAX_PARAMETERS = 500
+
+# Define the schema of the comparison cache.
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    meta TEXT PRIMARY KEY,
+    version TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    kind TEXT NOT NULL,
+    template TEXT NOT NULL,
+    meta TEXT NOT NULL,
+    version TEXT NOT NULL,
+    diffs TEXT NOT NULL,
+    PRIMARY KEY (kind, template, meta, version)
+);
+"""
+
+
+class ComparisonCache:
+    """Persist comparison results by template and meta snapshot version."""
+
+    def __init__(self, path: str) -> None:
+        """Initialize an instance of the ComparisonCache class."""
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        """Close the underlying database."""
+        with self._lock:
+            self._connection.close()
+
+    def set_snapshot(self, meta: str, version: str) -> None:
+        """Record the version of a meta build, dropping outdated results."""
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                "SELECT version FROM snapshots WHERE meta = ?", (meta,)
+            ).fetchone()
+            if row is not None and row[0] == version:
+                return
+            self._connection.execute(
+                "DELETE FROM results WHERE meta = ? AND version != ?",
+                (meta, version)
+            )
+            self._connection.execute(
+                "INSERT OR REPLACE INTO snapshots (meta, version) "
+                "VALUES (?, ?)",
+                (meta, version)
+            )
+
+    def get_many(
+        self, kind: str, templates: Iterable[int], meta: str, version: str
+    ) -> dict[int, list]:
+        """Get the cached results of many templates against a meta build."""
+        keys = {f"{template:032x}": template for template in templates}
+        results = {}
+        hex_keys = list(keys)
+        with self._lock:
+            for i in range(0, len(hex_keys), _MAX_PARAMETERS):
+                chunk = hex_keys[i:i + _MAX_PARAMETERS]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._connection.execute(
+                    "SELECT template, diffs FROM results "
+                    "WHERE kind = ? AND meta = ? AND version = ? "
+                    f"AND template IN ({placeholders})",
+                    (kind, meta, version, *chunk)
+                ).fetchall()
+                for template, diffs in rows:
+                    try:
+                        results[keys[template]] = json.loads(diffs)
+                    except ValueError:
+                        # Treat a result that is not valid JSON as missing.
+                        continue
+        return results
+
+    def put_many(
+        self, kind: str, results: dict[int, list], meta: str, version: str
+    ) -> None:
+        """Store the JSON-serializable results of many templates."""
+        rows = [
+            (
+                kind,
+                f"{template:032x}",
+                meta,
+                version,
+                json.dumps(diffs, separators=(",", ":"))
+            )
+            for template, diffs in results.items()
+        ]
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO results "
+                "(kind, template, meta, version, diffs) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
@@ -27,3 +27,25 @@ ACCESSORY_SLOTS = (
     "Ring1",
     "Ring2"
 )
+
+# Define the kinds of slots an item can occupy.
+ARMOR_KIND = 0
+WEAPON_KIND = 1
+ACCESSORY_KIND = 2
+RELIC_KIND = 3
+
+# Map each slot to its kind and position for constant-time lookups.
+SLOT_INDEX = {
+    **{slot: (ARMOR_KIND, i) for i, slot in enumerate(ARMOR_SLOTS)},
+    **{slot: (WEAPON_KIND, i) for i, slot in enumerate(WEAPON_SLOTS)},
+    **{slot: (ACCESSORY_KIND, i) for i, slot in enumerate(ACCESSORY_SLOTS)},
+    "Relic": (RELIC_KIND, 0)
+}
+
+# Define the API key permissions required to check an account.
+REQUIRED_PERMISSIONS = (
+    "account",
+    "builds",
+    "characters",
+    "inventories"
+)
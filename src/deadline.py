@@ -0,0 +1,103 @@
+import time
+import threading
+import contextvars
+from contextlib import contextmanager
+from errors import (
+    DeadlineError
+)
+
+# Define the timeout in seconds of a request without a deadline.
+DEFAULT_TIMEOUT = 30.0
+
+
+class Deadline:
+    """Represent a point in time after which work should stop."""
+
+    def __init__(
+        self, seconds: float | None = None, parent: "Deadline | None" = None
+    ) -> None:
+        """Initialize an instance of the Deadline class."""
+        self._expires = None
+        if seconds is not None:
+            self._expires = time.monotonic() + seconds
+        if parent is not None and parent._expires is not None:
+            if self._expires is None or parent._expires < self._expires:
+                self._expires = parent._expires
+        self._parent = parent
+        self._cancelled = threading.Event()
+
+    def cancel(self) -> None:
+        """Cancel the work bound to the deadline at its next check."""
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether the deadline or one of its parents was cancelled."""
+        return self._cancelled.is_set() or (
+            self._parent is not None and self._parent.cancelled
+        )
+
+    def remaining(self) -> float | None:
+        """Get the remaining seconds, or None if there is no time limit."""
+        if self.cancelled:
+            return 0.0
+        if self._expires is None:
+            return None
+        return max(0.0, self._expires - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        """Whether the deadline has passed or was cancelled."""
+        return self.remaining() == 0.0
+
+    def check(self) -> None:
+        """Raise an error if the deadline has passed or was cancelled."""
+        if self.cancelled:
+            raise DeadlineError("Cancelled")
+        if self.expired:
+            raise DeadlineError("Deadline exceeded")
+
+
+# Hold the deadline of the current check, inherited by nested work.
+_CURRENT = contextvars.ContextVar("deadline", default=None)
+
+
+def current() -> Deadline:
+    """Get the deadline of the current context, or a new unbounded one."""
+    # Never share a default, so cancelling it cannot affect other work.
+    return _CURRENT.get() or Deadline()
+
+
+@contextmanager
+def deadline(seconds: float | None = None, bound: Deadline | None = None):
+    """Run the enclosed work under a deadline no later than the current."""
+    bound = bound or Deadline(seconds, parent=_CURRENT.get())
+    token = _CURRENT.set(bound)
+    try:
+        yield bound
+    finally:
+        _CURRENT.reset(token)
+
+
+def check_deadline() -> None:
+    """Raise an error if the current deadline has passed or was cancelled."""
+    bound = _CURRENT.get()
+    if bound is not None:
+        bound.check()
+
+
+def request_timeout(default: float = DEFAULT_TIMEOUT) -> float:
+    """Get the timeout of a request, bounded by the current deadline."""
+    bound = _CURRENT.get()
+    remaining = None if bound is None else bound.remaining()
+    if remaining is None:
+        return default
+    return min(default, remaining)
+
+
+def propagate(function):
+    """Bind a function to the current context, e.g. for a worker thread."""
+    context = contextvars.copy_context()
+    return lambda *args, **kwargs: context.copy().run(
+        function, *args, **kwargs
+    )
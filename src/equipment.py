@@ -1,12 +1,39 @@
 from dataclasses import dataclass
+from typing import NamedTuple
+from collections.abc import Mapping
 from constants import (
     EMPTY_ID,
     EMPTY_NAME,
     EMPTY_SLOT,
-    EMPTY_TYPE
+    EMPTY_TYPE,
+    ARMOR_SLOTS,
+    WEAPON_SLOTS,
+    ACCESSORY_SLOTS,
+    ARMOR_KIND,
+    WEAPON_KIND,
+    ACCESSORY_KIND,
+    RELIC_KIND
 )
 
 
+class SlotRecord(NamedTuple):
+    """Represent an item in a slot using plain integers."""
+    kind: int
+    index: int
+    id: int
+    stats: int
+    upgrades: tuple[int, ...] | None
+    infusions: tuple[int, ...] | None
+    type: str = EMPTY_TYPE
+    stats_name: str = EMPTY_NAME
+
+
+class EquipmentRecord(NamedTuple):
+    """Represent an unresolved equipment with a name and slot records."""
+    name: str
+    items: list[SlotRecord]
+
+
 @dataclass
 class Stats:
     """Represent stats with an ID and name."""
@@ -143,3 +170,155 @@ class Equipment:
             accessories=[Accessory.empty()] * 6,
             relic=Relic.empty()
         )
+
+    @classmethod
+    def from_record(
+        cls,
+        record: EquipmentRecord,
+        stats_names: Mapping[int, str] | None = None,
+        item_names: Mapping[int, str] | None = None,
+        weapon_types: Mapping[int, str] | None = None
+    ):
+        """Create an instance from a record and resolved names."""
+
+        # Fall back to empty names for anything left unresolved.
+        stats_names = stats_names or {}
+        item_names = item_names or {}
+        weapon_types = weapon_types or {}
+
+        # Create armors, weapons and accessories for each slot.
+        armors = [
+            Armor(
+                slot=slot,
+                stats=Stats.empty(),
+                upgrade=Upgrade.empty(),
+                infusion=Infusion.empty()
+            )
+            for slot in ARMOR_SLOTS
+        ]
+        weapons = [
+            Weapon(
+                slot=slot,
+                type=EMPTY_TYPE,
+                stats=Stats.empty(),
+                upgrades=[Upgrade.empty()] * 2,
+                infusions=[Infusion.empty()] * 2
+            )
+            for slot in WEAPON_SLOTS
+        ]
+        accessories = [
+            Accessory(
+                slot=slot,
+                stats=Stats.empty(),
+                infusions=[Infusion.empty()] * 3
+            )
+            for slot in ACCESSORY_SLOTS
+        ]
+
+        # Create a relic.
+        relic = Relic.empty()
+
+        # Loop through the items in the record.
+        for item in record.items:
+            if item.stats:
+                # Handle the case when stats are available by ID.
+                stats = Stats(
+                    id=item.stats,
+                    name=stats_names.get(item.stats, EMPTY_NAME)
+                )
+            elif item.stats_name:
+                # Handle the case when stats are only available by name.
+                stats = Stats(
+                    id=EMPTY_ID,
+                    name=item.stats_name
+                )
+            else:
+                # Handle the case when stats are missing.
+                stats = Stats.empty()
+
+            if item.kind == ARMOR_KIND:
+                # Keep the first upgrade and infusion of an armor.
+                if not item.upgrades:
+                    upgrade = Upgrade.empty()
+                else:
+                    upgrade = Upgrade(
+                        id=item.upgrades[0],
+                        name=item_names.get(item.upgrades[0], EMPTY_NAME)
+                    )
+                if not item.infusions:
+                    infusion = Infusion.empty()
+                else:
+                    infusion = Infusion(
+                        id=item.infusions[0],
+                        name=item_names.get(item.infusions[0], EMPTY_NAME)
+                    )
+                armors[item.index] = Armor(
+                    slot=ARMOR_SLOTS[item.index],
+                    stats=stats,
+                    upgrade=upgrade,
+                    infusion=infusion
+                )
+
+            elif item.kind == WEAPON_KIND:
+                # Keep all upgrades and infusions of a weapon.
+                if item.upgrades is None:
+                    upgrades = [Upgrade.empty()] * 2
+                else:
+                    upgrades = [
+                        Upgrade(
+                            id=upgrade_id,
+                            name=item_names.get(upgrade_id, EMPTY_NAME)
+                        )
+                        for upgrade_id in item.upgrades
+                    ]
+                if item.infusions is None:
+                    infusions = [Infusion.empty()] * 2
+                else:
+                    infusions = [
+                        Infusion(
+                            id=infusion_id,
+                            name=item_names.get(infusion_id, EMPTY_NAME)
+                        )
+                        for infusion_id in item.infusions
+                    ]
+                weapons[item.index] = Weapon(
+                    slot=WEAPON_SLOTS[item.index],
+                    type=item.type or weapon_types.get(item.id, EMPTY_TYPE),
+                    stats=stats,
+                    upgrades=upgrades,
+                    infusions=infusions
+                )
+
+            elif item.kind == ACCESSORY_KIND:
+                # Keep all infusions of an accessory.
+                if item.infusions is None:
+                    infusions = [Infusion.empty()] * 3
+                else:
+                    infusions = [
+                        Infusion(
+                            id=infusion_id,
+                            name=item_names.get(infusion_id, EMPTY_NAME)
+                        )
+                        for infusion_id in item.infusions
+                    ]
+                accessories[item.index] = Accessory(
+                    slot=ACCESSORY_SLOTS[item.index],
+                    stats=stats,
+                    infusions=infusions
+                )
+
+            elif item.kind == RELIC_KIND:
+                # Keep the relic by its item ID.
+                relic = Relic(
+                    id=item.id,
+                    name=item_names.get(item.id, EMPTY_NAME)
+                )
+
+        # Create an equipment with a name and components.
+        return cls(
+            name=record.name,
+            armors=armors,
+            weapons=weapons,
+            accessories=accessories,
+            relic=relic
+        )
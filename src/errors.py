@@ -0,0 +1,54 @@
+import re
+
+
+class ApiError(Exception):
+    """Raise when a request to an API fails."""
+
+    def __init__(self, message: str, status_code: int | None = None) -> None:
+        """Initialize an instance of the ApiError class."""
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class InvalidIdError(ApiError):
+    """Raise when a requested ID does not exist."""
+
+
+class AuthError(ApiError):
+    """Raise when the API key is invalid or lacks a permission."""
+
+
+class RateLimitError(ApiError):
+    """Raise when too many requests were made."""
+
+
+class TransientError(ApiError):
+    """Raise when a request failed for a reason that may go away."""
+
+
+class UnknownBuildError(LookupError):
+    """Raise when a meta build is not listed for a profession."""
+
+
+class DeadlineError(Exception):
+    """Raise when the deadline of a check passed or it was cancelled."""
+
+
+def classify(status_code: int, data) -> ApiError | None:
+    """Classify an error response, or return None if it succeeded."""
+    text = data.get("text", "") if isinstance(data, dict) else ""
+    if 200 <= status_code < 300:
+        return None
+    if status_code in (401, 403):
+        return AuthError(text or "Unauthorized", status_code)
+    if status_code == 404 or (
+        status_code == 400
+        and "invalid" in text.lower()
+        and re.search(r"\bids?\b", text.lower())
+    ):
+        return InvalidIdError(text or "No such ID", status_code)
+    if status_code == 429:
+        return RateLimitError(text or "Too many requests", status_code)
+    if status_code >= 500:
+        return TransientError(text or "Server error", status_code)
+    return ApiError(text or f"HTTP {status_code}", status_code)
@@ -0,0 +1,245 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+from collections.abc import Iterable, Mapping
+from constants import (
+    EMPTY_ID,
+    EMPTY_NAME,
+    EMPTY_TYPE
+)
+from character import (
+    Character
+)
+from compare import (
+    SlotDiff
+)
+
+if TYPE_CHECKING:
+    import pyarrow
+
+# Define the number of rows buffered before a batch is written.
+BATCH_SIZE = 8192
+
+# Define the integer ID columns of a row.
+_ID_COLUMNS = (
+    "skill",
+    "specialization",
+    "trait_1",
+    "trait_2",
+    "trait_3",
+    "stats",
+    "upgrade_1",
+    "upgrade_2",
+    "infusion_1",
+    "infusion_2",
+    "infusion_3",
+    "relic"
+)
+
+# Define the text columns of a row.
+_TEXT_COLUMNS = (
+    "account",
+    "character",
+    "profession",
+    "kind",
+    "template",
+    "slot",
+    "weapon_type",
+    "meta"
+)
+
+
+def _schema() -> pyarrow.Schema:
+    """Get the schema of the export, importing pyarrow only when needed."""
+    import pyarrow as pa
+    return pa.schema([
+        *(pa.field(name, pa.string()) for name in _TEXT_COLUMNS),
+        pa.field("template_index", pa.int16()),
+        *(pa.field(name, pa.int32()) for name in _ID_COLUMNS),
+        pa.field("diff_count", pa.int16()),
+        pa.field("diff_fields", pa.list_(pa.string()))
+    ])
+
+
+def _ids(components, count: int) -> list[int]:
+    """Get the IDs of components, padded with empty IDs to a count."""
+    ids = [component.id for component in components[:count]]
+    return ids + [EMPTY_ID] * (count - len(ids))
+
+
+class RosterExporter:
+    """Write templates and their differences as one row per slot."""
+
+    def __init__(
+        self,
+        path: str,
+        batch_size: int = BATCH_SIZE,
+        compression: str = "zstd"
+    ) -> None:
+        """Initialize an instance of the RosterExporter class."""
+        import pyarrow as pa
+        self._schema = _schema()
+        self._batch_size = batch_size
+        if path.endswith((".arrow", ".feather")):
+            # Write an Arrow IPC file for memory-mapped reads.
+            self._writer = pa.ipc.new_file(
+                path,
+                self._schema,
+                options=pa.ipc.IpcWriteOptions(compression=compression)
+            )
+        else:
+            import pyarrow.parquet as pq
+            self._writer = pq.ParquetWriter(
+                path, self._schema, compression=compression
+            )
+        self._columns = {name: [] for name in self._schema.names}
+        self._rows = 0
+        self.row_count = 0
+
+    def __enter__(self) -> RosterExporter:
+        """Enter a context that closes the exporter on exit."""
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Close the exporter, writing the remaining rows."""
+        self.close()
+
+    def _append(self, row: dict) -> None:
+        """Buffer a row, writing a batch once the buffer is full."""
+        for name, values in self._columns.items():
+            values.append(row.get(name, EMPTY_ID))
+        self._rows += 1
+        if self._rows >= self._batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the buffered rows as a batch."""
+        if not self._rows:
+            return
+        import pyarrow as pa
+        batch = pa.RecordBatch.from_pydict(self._columns, schema=self._schema)
+        self._writer.write_batch(batch)
+        self.row_count += self._rows
+        for values in self._columns.values():
+            values.clear()
+        self._rows = 0
+
+    def close(self) -> None:
+        """Write the remaining rows and close the file."""
+        self.flush()
+        self._writer.close()
+
+    def add_character(
+        self,
+        character: Character,
+        diffs: Mapping[tuple[str, str, int], list[SlotDiff]] | None = None,
+        account: str = EMPTY_NAME,
+        meta: str = EMPTY_NAME
+    ) -> None:
+        """Add the template slots of a character and their differences."""
+        diffs = diffs or {}
+
+        def base_row(kind, index, template, slot, slot_diffs):
+            """Create the columns that every row of a template shares."""
+            fields = [diff.field for diff in slot_diffs if diff.slot == slot]
+            return {
+                "account": account,
+                "character": character.name,
+                "profession": character.profession,
+                "kind": kind,
+                "template": template,
+                "template_index": index,
+                "slot": slot,
+                "weapon_type": EMPTY_TYPE,
+                "meta": meta,
+                "diff_count": len(fields),
+                "diff_fields": fields
+            }
+
+        # Add a row per skill and specialization of each build template.
+        for i, build in enumerate(character.builds):
+            build_diffs = diffs.get((character.name, "build", i), [])
+            for j, skill in enumerate(build.skills):
+                self._append({
+                    **base_row(
+                        "build", i, build.name, f"Skill {j + 1}", build_diffs
+                    ),
+                    "skill": skill.id
+                })
+            for j, specialization in enumerate(build.specializations):
+                traits = _ids(specialization.traits, 3)
+                self._append({
+                    **base_row(
+                        "build",
+                        i,
+                        build.name,
+                        f"Specialization {j + 1}",
+                        build_diffs
+                    ),
+                    "specialization": specialization.id,
+                    "trait_1": traits[0],
+                    "trait_2": traits[1],
+                    "trait_3": traits[2]
+                })
+
+        # Add a row per slot of each equipment template.
+        for i, equipment in enumerate(character.equipments):
+            equipment_diffs = diffs.get((character.name, "equipment", i), [])
+
+            def row(slot):
+                """Create the shared columns of an equipment slot."""
+                return base_row(
+                    "equipment", i, equipment.name, slot, equipment_diffs
+                )
+
+            for armor in equipment.armors:
+                self._append({
+                    **row(armor.slot),
+                    "stats": armor.stats.id,
+                    "upgrade_1": armor.upgrade.id,
+                    "infusion_1": armor.infusion.id
+                })
+            for weapon in equipment.weapons:
+                upgrades = _ids(weapon.upgrades, 2)
+                infusions = _ids(weapon.infusions, 2)
+                self._append({
+                    **row(weapon.slot),
+                    "weapon_type": weapon.type,
+                    "stats": weapon.stats.id,
+                    "upgrade_1": upgrades[0],
+                    "upgrade_2": upgrades[1],
+                    "infusion_1": infusions[0],
+                    "infusion_2": infusions[1]
+                })
+            for accessory in equipment.accessories:
+                infusions = _ids(accessory.infusions, 3)
+                self._append({
+                    **row(accessory.slot),
+                    "stats": accessory.stats.id,
+                    "infusion_1": infusions[0],
+                    "infusion_2": infusions[1],
+                    "infusion_3": infusions[2]
+                })
+            self._append({**row("Relic"), "relic": equipment.relic.id})
+
+    def add_characters(
+        self,
+        characters: Iterable[Character],
+        diffs: Mapping[tuple[str, str, int], list[SlotDiff]] | None = None,
+        account: str = EMPTY_NAME,
+        meta: str = EMPTY_NAME
+    ) -> None:
+        """Add the template slots of many characters."""
+        for character in characters:
+            self.add_character(character, diffs, account, meta)
+
+
+if __name__ == "__main__":
+    from api import Api
+    api = Api()
+    api.set_api_key("<API_KEY>")
+    with RosterExporter("roster.parquet") as exporter:
+        exporter.add_characters(
+            api.get_character_bundle().values(),
+            account=api.get_account_name()
+        )
+    print(f"Exported {exporter.row_count} rows to roster.parquet")
@@ -0,0 +1,255 @@
+import re
+import html
+from constants import (
+    EMPTY_ID,
+    EMPTY_NAME,
+    EMPTY_TYPE,
+    SLOT_INDEX,
+    ARMOR_KIND,
+    WEAPON_KIND,
+    ACCESSORY_KIND,
+    RELIC_KIND
+)
+from build import (
+    Skill,
+    Trait,
+    Specialization,
+    Build
+)
+from equipment import (
+    SlotRecord,
+    EquipmentRecord
+)
+
+# Match the opening and closing tags relevant to a build page.
+_TAG_RE = re.compile(rb"<(/?)(div|td|p|span)\b([^>]*)>", re.IGNORECASE)
+
+# Match the attributes of a tag.
+_ATTR_RE = re.compile(
+    rb"""([^\s=/>]+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+)))?"""
+)
+
+# Define the index of the first item pair that may end the equipment.
+_LAST_EQUIPMENT_INDEX = 24
+
+# Define the states of the weapon slot mapping.
+_EXPECT_A_MAIN = 0  # No main hand yet, next off hand goes to set B.
+_EXPECT_A_MAIN_ONLY = 1  # No main hand yet, an off hand went to set B.
+_EXPECT_A_OFF = 2  # Main hand of set A placed, next off hand goes to set A.
+_EXPECT_B = 3  # All further weapons go to set B.
+
+# Map a state and weapon label to the API slot and the next state.
+_WEAPON_TRANSITIONS = {
+    (_EXPECT_A_MAIN, "Main Hand"): ("WeaponA1", _EXPECT_A_OFF),
+    (_EXPECT_A_MAIN, "Off Hand"): ("WeaponB2", _EXPECT_A_MAIN_ONLY),
+    (_EXPECT_A_MAIN_ONLY, "Main Hand"): ("WeaponA1", _EXPECT_B),
+    (_EXPECT_A_MAIN_ONLY, "Off Hand"): ("WeaponB2", _EXPECT_A_MAIN_ONLY),
+    (_EXPECT_A_OFF, "Main Hand"): ("WeaponB1", _EXPECT_B),
+    (_EXPECT_A_OFF, "Off Hand"): ("WeaponA2", _EXPECT_B),
+    (_EXPECT_B, "Main Hand"): ("WeaponB1", _EXPECT_B),
+    (_EXPECT_B, "Off Hand"): ("WeaponB2", _EXPECT_B)
+}
+
+# Map labels that are numbered in order of appearance to their API prefix.
+_NUMBERED_LABELS = {
+    "Ring": "Ring",
+    "Accessory": "Accessory"
+}
+
+# Map labels that are renamed to their API slot.
+_RENAMED_LABELS = {
+    "Backpiece": "Backpack"
+}
+
+
+class _SlotMapper:
+    """Map snowcrows slot labels to the slot naming scheme of the API."""
+
+    def __init__(self) -> None:
+        """Initialize an instance of the _SlotMapper class."""
+        self._state = _EXPECT_A_MAIN
+        self._counts = dict.fromkeys(_NUMBERED_LABELS, 0)
+
+    def feed(self, label: str) -> str:
+        """Map the next label to its slot and advance the state."""
+        transition = _WEAPON_TRANSITIONS.get((self._state, label))
+        if transition:
+            slot, self._state = transition
+            return slot
+        if label in _NUMBERED_LABELS:
+            self._counts[label] += 1
+            return f"{_NUMBERED_LABELS[label]}{self._counts[label]}"
+        return _RENAMED_LABELS.get(label, label)
+
+
+def _parse_attrs(raw: bytes) -> list[tuple[str, str]]:
+    """Parse the raw attributes of a tag into name and value pairs."""
+    attrs = []
+    for match in _ATTR_RE.finditer(raw):
+        name, double, single, bare = match.groups()
+        value = double if double is not None else (
+            single if single is not None else (bare or b"")
+        )
+        attrs.append((
+            name.decode("utf-8", "replace").lower(),
+            html.unescape(value.decode("utf-8", "replace"))
+        ))
+    return attrs
+
+
+def _text_after(content: bytes, position: int) -> str:
+    """Get the text from a position up to the next tag."""
+    end = content.find(b"<", position)
+    if end == -1:
+        end = len(content)
+    return html.unescape(content[position:end].decode("utf-8", "replace"))
+
+
+def _parse_ids(value: str) -> tuple[int, ...]:
+    """Parse a comma-separated list of IDs."""
+    return tuple(int(item) for item in value.split(","))
+
+
+def extract_page(
+    name: str, content: bytes
+) -> tuple[Build, EquipmentRecord]:
+    """Extract a build and an equipment record from a build page."""
+
+    # Create skills and specializations for each slot.
+    skills = [Skill.empty()] * 5
+    specializations = [Specialization.empty()] * 3
+    skills_found = False
+    specialization_index = 0
+
+    # Initialize the cells of the equipment table.
+    cells = []
+    cell = None
+    in_p = False
+
+    # Tokenise the page in a single pass over the relevant tags.
+    for match in _TAG_RE.finditer(content):
+        closing, tag, raw_attrs = match.groups()
+        tag = tag.lower()
+
+        if closing:
+            if tag == b"td":
+                cell = None
+            elif tag == b"p":
+                in_p = False
+            continue
+
+        if tag == b"td":
+            # Start a new cell of the equipment table.
+            cell = {"div": None, "bare": False, "text": None, "label": None}
+            cells.append(cell)
+
+        elif tag == b"div":
+            attrs = _parse_attrs(raw_attrs)
+            values = dict(attrs)
+            ids = values.get("data-armory-ids")
+
+            if ids is not None and not skills_found:
+                # Extract the skills from the first tag with IDs.
+                skills_found = True
+                if ids:
+                    for i, skill in enumerate(ids.split(",")):
+                        skills[i] = Skill(
+                            id=int(skill),
+                            name=EMPTY_NAME
+                        )
+
+            if ids is not None and "overflow-clip" in (
+                values.get("class", "").split()
+            ):
+                # Extract a specialization and its traits.
+                i = specialization_index
+                specialization_index += 1
+                traits_data = values.get(f"data-armory-{ids}-traits", "")
+                if ids and traits_data:
+                    traits = [Trait.empty()] * 3
+                    for j, trait in enumerate(traits_data.split(",")):
+                        traits[j] = Trait(
+                            id=int(trait),
+                            name=EMPTY_NAME
+                        )
+                    specializations[i] = Specialization(
+                        id=int(ids),
+                        name=EMPTY_NAME,
+                        traits=traits
+                    )
+
+            if cell is not None and cell["div"] is None:
+                # Keep the first item tag of the cell.
+                cell["div"] = values
+                cell["bare"] = (
+                    [name for name, _ in attrs]
+                    == ["data-armory-embed", "data-armory-ids"]
+                    and values["data-armory-embed"] == "items"
+                    and content.startswith(b"</div>", match.end())
+                )
+
+        elif tag == b"p":
+            if cell is not None and cell["text"] is None:
+                # Keep the leading text of the first paragraph of the cell.
+                cell["text"] = _text_after(content, match.end())
+                in_p = True
+
+        elif tag == b"span":
+            if in_p and cell is not None and cell["label"] is None:
+                # Keep the slot label of the cell.
+                cell["label"] = _text_after(content, match.end())
+
+    # Create a build with a name and components.
+    build = Build(
+        name=name,
+        skills=skills,
+        specializations=specializations
+    )
+
+    # Map the item cells and their label cells to slot records.
+    items = []
+    mapper = _SlotMapper()
+    for i in range(0, len(cells) - 1, 2):
+        item_data = cells[i]["div"]
+        if not item_data or "data-armory-ids" not in item_data:
+            continue
+        item_id = int(item_data["data-armory-ids"])
+
+        # Stop at the first irrelevant item after the equipment.
+        if i > _LAST_EQUIPMENT_INDEX and cells[i]["bare"]:
+            break
+
+        # Map the label to the slot naming scheme of the API.
+        slot_index = SLOT_INDEX.get(mapper.feed(cells[i + 1]["label"] or ""))
+        if slot_index is None:
+            continue
+        kind, index = slot_index
+
+        stats_data = item_data.get(f"data-armory-{item_id}-stat")
+        upgrades_data = item_data.get(f"data-armory-{item_id}-upgrades")
+        stats = int(stats_data) if stats_data else EMPTY_ID
+        upgrades = _parse_ids(upgrades_data) if upgrades_data else None
+
+        if kind == ARMOR_KIND:
+            items.append(SlotRecord(
+                kind, index, item_id, stats, upgrades, None
+            ))
+        elif kind == WEAPON_KIND:
+            # Read the stats name and weapon type from the label cell.
+            words = (cells[i + 1]["text"] or "").split(" ")
+            items.append(SlotRecord(
+                kind, index, item_id, EMPTY_ID, upgrades, None,
+                type=words[1] if len(words) > 1 else EMPTY_TYPE,
+                stats_name=words[0]
+            ))
+        elif kind == ACCESSORY_KIND:
+            items.append(SlotRecord(
+                kind, index, item_id, stats, None, None
+            ))
+        elif kind == RELIC_KIND:
+            items.append(SlotRecord(
+                kind, index, item_id, EMPTY_ID, None, None
+            ))
+
+    # Return the build and the equipment record.
+    return build, EquipmentRecord(name=name, items=items)
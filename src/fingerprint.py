@@ -0,0 +1,146 @@
+import hashlib
+from collections.abc import Callable, Hashable, Iterable
+from typing import Generic, TypeVar
+from constants import (
+    SLOT_INDEX
+)
+from build import (
+    Build
+)
+from equipment import (
+    Stats,
+    Equipment
+)
+
+# Define the size of a fingerprint in bytes.
+FINGERPRINT_BYTES = 16
+
+# Define the type of the templates that are deduplicated.
+T = TypeVar("T")
+
+
+def _digest(canonical: tuple) -> int:
+    """Hash a canonical form into an integer fingerprint."""
+    digest = hashlib.blake2b(
+        repr(canonical).encode(), digest_size=FINGERPRINT_BYTES
+    ).digest()
+    return int.from_bytes(digest, "big")
+
+
+def _canonical_stats(stats: Stats) -> tuple:
+    """Get the canonical form of stats, by name only if the ID is unknown."""
+    return (stats.id, "" if stats.id else stats.name)
+
+
+def _slot_order(slotted) -> tuple[int, int]:
+    """Get the position of a slotted component in the API slot order."""
+    return SLOT_INDEX.get(slotted.slot, (len(SLOT_INDEX), 0))
+
+
+def canonical_build(build: Build) -> tuple:
+    """Get the canonical form of a build, ignoring its name."""
+    return (
+        tuple(skill.id for skill in build.skills),
+        tuple(
+            (
+                specialization.id,
+                tuple(trait.id for trait in specialization.traits)
+            )
+            for specialization in build.specializations
+        )
+    )
+
+
+def canonical_equipment(equipment: Equipment) -> tuple:
+    """Get the canonical form of an equipment in slot order, ignoring names."""
+    return (
+        tuple(
+            (
+                armor.slot,
+                _canonical_stats(armor.stats),
+                armor.upgrade.id,
+                armor.infusion.id
+            )
+            for armor in sorted(equipment.armors, key=_slot_order)
+        ),
+        tuple(
+            (
+                weapon.slot,
+                weapon.type,
+                _canonical_stats(weapon.stats),
+                tuple(upgrade.id for upgrade in weapon.upgrades),
+                tuple(infusion.id for infusion in weapon.infusions)
+            )
+            for weapon in sorted(equipment.weapons, key=_slot_order)
+        ),
+        tuple(
+            (
+                accessory.slot,
+                _canonical_stats(accessory.stats),
+                tuple(infusion.id for infusion in accessory.infusions)
+            )
+            for accessory in sorted(equipment.accessories, key=_slot_order)
+        ),
+        equipment.relic.id
+    )
+
+
+def fingerprint_build(build: Build) -> int:
+    """Get a 128-bit fingerprint of a build's content."""
+    return _digest(canonical_build(build))
+
+
+def fingerprint_equipment(equipment: Equipment) -> int:
+    """Get a 128-bit fingerprint of an equipment's content."""
+    return _digest(canonical_equipment(equipment))
+
+
+def fingerprint_meta(build: Build, equipment: Equipment) -> int:
+    """Get a 128-bit fingerprint of a meta build's content, as its version."""
+    return _digest((canonical_build(build), canonical_equipment(equipment)))
+
+
+class Deduplicator(Generic[T]):
+    """Group identical templates so each distinct one is processed once."""
+
+    def __init__(self, fingerprint: Callable[[T], int]) -> None:
+        """Initialize an instance of the Deduplicator class."""
+        self._fingerprint = fingerprint
+        self._templates = {}
+        self._owners = {}
+
+    def add(self, owner: Hashable, template: T) -> int:
+        """Add the template of an owner and return its fingerprint."""
+        fingerprint = self._fingerprint(template)
+        self._templates.setdefault(fingerprint, template)
+        self._owners.setdefault(fingerprint, []).append(owner)
+        return fingerprint
+
+    def extend(self, templates: Iterable[tuple[Hashable, T]]) -> None:
+        """Add many owners and their templates."""
+        for owner, template in templates:
+            self.add(owner, template)
+
+    def unique(self) -> dict[int, T]:
+        """Get one template for each distinct fingerprint."""
+        return dict(self._templates)
+
+    def owners(self, fingerprint: int) -> list[Hashable]:
+        """Get the owners of the templates with a fingerprint."""
+        return list(self._owners.get(fingerprint, []))
+
+    def fan_out(self, results: dict[int, object]) -> dict[Hashable, object]:
+        """Fan results by fingerprint out to the owners of each template."""
+        return {
+            owner: results[fingerprint]
+            for fingerprint, owners in self._owners.items()
+            if fingerprint in results
+            for owner in owners
+        }
+
+    def map(self, function: Callable[[T], object]) -> dict[Hashable, object]:
+        """Apply a function once per distinct template and fan it out."""
+        return self.fan_out({
+            fingerprint: function(template)
+            for fingerprint, template in self._templates.items()
+        })
@@ -0,0 +1,432 @@
+import json
+import random
+import hashlib
+import time
+import threading
+from functools import lru_cache
+from collections.abc import Iterator, Mapping
+from urllib.parse import unquote, urlsplit
+from transport import (
+    Response,
+    Transport
+)
+from constants import (
+    ARMOR_SLOTS,
+    WEAPON_SLOTS,
+    ACCESSORY_SLOTS
+)
+
+# Define the permissions of synthetic API keys.
+PERMISSIONS = (
+    "account",
+    "builds",
+    "characters",
+    "inventories"
+)
+
+# Define the professions synthetic characters are drawn from.
+PROFESSIONS = (
+    "Guardian",
+    "Warrior",
+    "Engineer",
+    "Ranger",
+    "Thief",
+    "Elementalist",
+    "Mesmer",
+    "Necromancer",
+    "Revenant"
+)
+
+# Define the number of distinct IDs synthetic templates draw from.
+_SKILL_POOL = 2000
+_TRAIT_POOL = 2000
+_SPECIALIZATION_POOL = 72
+_ITEM_POOL = 5000
+_STATS_POOL = 300
+
+# Define the number of synthetic accounts kept generated at once.
+_ACCOUNT_CACHE_SIZE = 1024
+
+# Define the slot labels of a synthetic build page in page order.
+_PAGE_LABELS = (
+    "Helm",
+    "Shoulders",
+    "Coat",
+    "Gloves",
+    "Leggings",
+    "Boots",
+    "Main Hand",
+    "Off Hand",
+    "Main Hand",
+    "Off Hand",
+    "Backpiece",
+    "Accessory",
+    "Accessory",
+    "Amulet",
+    "Ring",
+    "Ring",
+    "Relic"
+)
+
+# Define the stats and weapon types shown on synthetic build pages.
+_PAGE_STATS = ("Berserker", "Viper", "Assassin", "Harrier")
+_PAGE_WEAPON_TYPES = ("Greatsword", "Sword", "Focus", "Scepter")
+
+
+class SyntheticAccount:
+    """Generate a reproducible account with characters and templates."""
+
+    def __init__(
+        self,
+        characters: int = 60,
+        build_tabs: int = 6,
+        equipment_tabs: int = 8,
+        seed: int = 0,
+        permissions: tuple[str, ...] = PERMISSIONS
+    ) -> None:
+        """Initialize an instance of the SyntheticAccount class."""
+        rng = random.Random(seed)
+        self.name = f"Synthetic.{seed:04d}"
+        self.permissions = list(permissions)
+        self.characters = {}
+        for i in range(characters):
+            name = f"Character {seed}-{i}"
+            self.characters[name] = {
+                "name": name,
+                "profession": rng.choice(PROFESSIONS),
+                "build_tabs": [
+                    self._make_buildtab(rng, tab)
+                    for tab in range(1, build_tabs + 1)
+                ],
+                "equipment_tabs": [
+                    self._make_equipmenttab(rng, tab)
+                    for tab in range(1, equipment_tabs + 1)
+                ]
+            }
+
+    @staticmethod
+    def _make_buildtab(rng: random.Random, tab: int) -> dict:
+        """Generate a buildtab with skills and specializations."""
+        return {
+            "tab": tab,
+            "build": {
+                "name": f"Build {tab}",
+                "skills": {
+                    "heal": rng.randint(1, _SKILL_POOL),
+                    "utilities": [
+                        rng.randint(1, _SKILL_POOL) for _ in range(3)
+                    ],
+                    "elite": rng.randint(1, _SKILL_POOL)
+                },
+                "specializations": [
+                    {
+                        "id": rng.randint(1, _SPECIALIZATION_POOL),
+                        "traits": [
+                            rng.randint(1, _TRAIT_POOL) for _ in range(3)
+                        ]
+                    }
+                    for _ in range(3)
+                ]
+            }
+        }
+
+    @staticmethod
+    def _make_equipmenttab(rng: random.Random, tab: int) -> dict:
+        """Generate an equipmenttab with an item in every slot."""
+        equipment = []
+        for slot in ARMOR_SLOTS:
+            equipment.append({
+                "id": rng.randint(1, _ITEM_POOL),
+                "slot": slot,
+                "stats": {"id": rng.randint(1, _STATS_POOL)},
+                "upgrades": [rng.randint(1, _ITEM_POOL)],
+                "infusions": [rng.randint(1, _ITEM_POOL)]
+            })
+        for slot in WEAPON_SLOTS:
+            equipment.append({
+                "id": rng.randint(1, _ITEM_POOL),
+                "slot": slot,
+                "stats": {"id": rng.randint(1, _STATS_POOL)},
+                "upgrades": [rng.randint(1, _ITEM_POOL) for _ in range(2)],
+                "infusions": [rng.randint(1, _ITEM_POOL) for _ in range(2)]
+            })
+        for slot in ACCESSORY_SLOTS:
+            equipment.append({
+                "id": rng.randint(1, _ITEM_POOL),
+                "slot": slot,
+                "stats": {"id": rng.randint(1, _STATS_POOL)},
+                "infusions": [rng.randint(1, _ITEM_POOL)]
+            })
+        return {
+            "tab": tab,
+            "name": f"Equipment {tab}",
+            "equipment": equipment
+        }
+
+
+class SyntheticAccounts(Mapping):
+    """Map API keys to synthetic accounts generated on first access."""
+
+    def __init__(self, count: int, **account_options) -> None:
+        """Initialize an instance of the SyntheticAccounts class."""
+        self._count = count
+        self._get = lru_cache(maxsize=_ACCOUNT_CACHE_SIZE)(
+            lambda seed: SyntheticAccount(seed=seed, **account_options)
+        )
+
+    def __getitem__(self, api_key: str) -> SyntheticAccount:
+        """Get the account of an API key, generating it if needed."""
+        prefix, _, seed = api_key.partition("-")
+        if prefix != "key" or not seed.isdigit() or int(seed) >= self._count:
+            raise KeyError(api_key)
+        return self._get(int(seed))
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the API keys."""
+        return (f"key-{seed}" for seed in range(self._count))
+
+    def __len__(self) -> int:
+        """Count the accounts."""
+        return self._count
+
+
+class SyntheticSnowcrows(Transport):
+    """Serve synthetic Snow Crows index and build pages."""
+
+    def __init__(self, builds: int = 6, latency: float = 0.0) -> None:
+        """Initialize an instance of the SyntheticSnowcrows class."""
+        super().__init__()
+        self._builds = builds
+        self._latency = latency
+        self._lock = threading.Lock()
+        self.request_count = 0
+
+    def _index_page(self, category: str, profession: str) -> str:
+        """Generate the index page of a category and profession."""
+        return "".join(
+            f'<a href="/builds/{category}/{profession}/build-{i}">'
+            f'<h2 class="block font-medium w-96">'
+            f"{profession.capitalize()} Build {i}</h2></a>"
+            for i in range(self._builds)
+        )
+
+    @staticmethod
+    def _build_page(rng: random.Random) -> str:
+        """Generate a build page with skills, traits and equipment."""
+        skills = ",".join(
+            str(rng.randint(1, _SKILL_POOL)) for _ in range(5)
+        )
+        parts = [
+            f'<div data-armory-embed="skills" data-armory-ids="{skills}">'
+            "</div>"
+        ]
+        for _ in range(3):
+            specialization = rng.randint(1, _SPECIALIZATION_POOL)
+            traits = ",".join(
+                str(rng.randint(1, _TRAIT_POOL)) for _ in range(3)
+            )
+            parts.append(
+                '<div class="overflow-clip" '
+                'data-armory-embed="specializations" '
+                f'data-armory-ids="{specialization}" '
+                f'data-armory-{specialization}-traits="{traits}"></div>'
+            )
+        parts.append("<table><tbody>")
+        for label in _PAGE_LABELS:
+            item_id = rng.randint(1, _ITEM_POOL)
+            attributes = ""
+            text = rng.choice(_PAGE_STATS)
+            if label != "Relic":
+                attributes += (
+                    f' data-armory-{item_id}-stat='
+                    f'"{rng.randint(1, _STATS_POOL)}"'
+                )
+            if label in ("Main Hand", "Off Hand"):
+                text += f" {rng.choice(_PAGE_WEAPON_TYPES)}"
+                attributes += (
+                    f' data-armory-{item_id}-upgrades='
+                    f'"{rng.randint(1, _ITEM_POOL)}"'
+                )
+            elif label in ARMOR_SLOTS:
+                attributes += (
+                    f' data-armory-{item_id}-upgrades='
+                    f'"{rng.randint(1, _ITEM_POOL)}"'
+                )
+            parts.append(
+                f'<tr><td><div data-armory-embed="items" '
+                f'data-armory-ids="{item_id}"{attributes}></div></td>'
+                f"<td><p>{text} <span>{label}</span></p></td></tr>"
+            )
+        parts.append("</tbody></table>")
+        return "".join(parts)
+
+    def get(self, url: str, headers: dict[str, str]) -> Response:
+        """Serve the response to a GET request."""
+        with self._lock:
+            self.request_count += 1
+        if self._latency:
+            time.sleep(self._latency)
+        parts = urlsplit(url).path.strip("/").split("/")
+        if len(parts) == 3:
+            content = self._index_page(parts[1], parts[2])
+        else:
+            content = self._build_page(random.Random(url))
+        return Response(
+            url=url,
+            status_code=200,
+            headers={"Content-Type": "text/html"},
+            content=content.encode(),
+            elapsed=self._latency
+        )
+
+
+class SyntheticTransport(Transport):
+    """Serve a synthetic Guild Wars 2 API from generated accounts."""
+
+    def __init__(
+        self,
+        accounts: Mapping[str, SyntheticAccount],
+        latency: float = 0.0,
+        etags: bool = True
+    ) -> None:
+        """Initialize an instance of the SyntheticTransport class."""
+        super().__init__()
+        self._accounts = accounts
+        self._latency = latency
+        self._etags = etags
+        self._lock = threading.Lock()
+        self.request_count = 0
+
+    def _route(self, path: str, query: str, account: SyntheticAccount):
+        """Get the JSON data of an endpoint, or None if it does not exist."""
+        parts = [unquote(part) for part in path.split("/")]
+        resource = parts[0]
+
+        if resource == "tokeninfo":
+            return {
+                "id": account.name,
+                "name": account.name,
+                "permissions": account.permissions
+            }
+        if resource == "account":
+            return {"name": account.name}
+        if resource == "characters":
+            characters = account.characters
+            if len(parts) == 1 and not query:
+                return list(characters)
+            if len(parts) == 1:
+                ids = query.removeprefix("ids=")
+                if ids == "all":
+                    return list(characters.values())
+                return [
+                    characters[unquote(name)]
+                    for name in ids.split(",")
+                    if unquote(name) in characters
+                ]
+            character = characters.get(parts[1])
+            if character is None:
+                return None
+            if parts[2] == "core":
+                return {
+                    "name": character["name"],
+                    "profession": character["profession"],
+                    "last_modified": character.get(
+                        "last_modified", "2024-01-01T00:00:00Z"
+                    )
+                }
+            if parts[2] == "buildtabs":
+                return character["build_tabs"]
+            if parts[2] == "equipmenttabs":
+                return character["equipment_tabs"]
+            return None
+
+        # Serve game data for any ID in the synthetic pools.
+        if len(parts) == 1 and query.startswith("ids="):
+            game_ids = query.removeprefix("ids=").split(",")
+            data = [
+                self._game_data(resource, int(game_id))
+                for game_id in game_ids
+                if game_id.isdigit()
+            ]
+            return [item for item in data if item is not None] or None
+        if len(parts) != 2 or not parts[1].isdigit():
+            return None
+        return self._game_data(resource, int(parts[1]))
+
+    def _game_data(self, resource: str, game_id: int):
+        """Build the game data of an ID, or None if it does not exist."""
+        if resource == "items":
+            return {
+                "id": game_id,
+                "name": f"Item {game_id}",
+                "type": "Weapon" if game_id % 3 == 0 else "UpgradeComponent",
+                "details": {"type": "Greatsword" if game_id % 2 else "Focus"}
+            }
+        if resource == "itemstats":
+            # Give each stats a major and two minor attributes.
+            attributes = [
+                "Power",
+                "Precision",
+                "Toughness",
+                "Vitality",
+                "CritDamage",
+                "ConditionDamage",
+                "Healing"
+            ]
+            major = attributes.pop(game_id % len(attributes))
+            minors = attributes[game_id % 5], attributes[game_id % 5 + 1]
+            return {
+                "id": game_id,
+                "name": f"Itemstats {game_id}",
+                "attributes": [
+                    {"attribute": major, "multiplier": 0.35, "value": 0},
+                    *(
+                        {"attribute": minor, "multiplier": 0.25, "value": 0}
+                        for minor in minors
+                    )
+                ]
+            }
+        if resource in ("skills", "traits", "specializations"):
+            return {
+                "id": game_id,
+                "name": f"{resource.capitalize()} {game_id}"
+            }
+        return None
+
+    def get(self, url: str, headers: dict[str, str]) -> Response:
+        """Serve the response to a GET request."""
+        with self._lock:
+            self.request_count += 1
+        if self._latency:
+            time.sleep(self._latency)
+
+        # Look up the account by its API key.
+        authorization = headers.get("Authorization", "")
+        account = self._accounts.get(authorization.removeprefix("Bearer "))
+        split_url = urlsplit(url)
+        path = split_url.path.removeprefix("/v2/")
+
+        # Build the response from the routed data.
+        if account is None:
+            status_code, data = 401, {"text": "Invalid access token"}
+        else:
+            data = self._route(path, split_url.query, account)
+            status_code = 200
+            if data is None:
+                status_code, data = 404, {"text": "no such id"}
+        content = json.dumps(data).encode()
+        response_headers = {"Content-Type": "application/json"}
+
+        # Answer a conditional request for unchanged data without a body.
+        if self._etags and status_code == 200:
+            etag = f'"{hashlib.blake2b(content, digest_size=8).hexdigest()}"'
+            response_headers["ETag"] = etag
+            if headers.get("If-None-Match") == etag:
+                status_code, content = 304, b""
+        return Response(
+            url=url,
+            status_code=status_code,
+            headers=response_headers,
+            content=content,
+            elapsed=self._latency
+        )
@@ -0,0 +1,383 @@
+import os
+import json
+import time
+import zlib
+import struct
+import bisect
+import threading
+from collections.abc import Iterator
+from constants import (
+    EMPTY_NAME,
+    ARMOR_SLOTS,
+    WEAPON_SLOTS,
+    ACCESSORY_SLOTS
+)
+from build import (
+    Skill,
+    Trait,
+    Specialization,
+    Build
+)
+from equipment import (
+    Stats,
+    Upgrade,
+    Infusion,
+    Relic,
+    Armor,
+    Weapon,
+    Accessory,
+    Equipment
+)
+from character import (
+    Character
+)
+from export import (
+    _ids
+)
+
+# Define the kinds of history records.
+KEYFRAME = 1
+DELTA = 2
+
+# Define the number of deltas between two keyframes of a character.
+KEYFRAME_INTERVAL = 32
+
+# Define the header of a record: kind, timestamp and payload length.
+_HEADER = struct.Struct("<BdI")
+
+
+def template_state(character: Character) -> dict[str, tuple]:
+    """Flatten the templates of a character into slot values by key."""
+    state = {"profession": (character.profession,)}
+    for i, build in enumerate(character.builds):
+        state[f"build/{i}/name"] = (build.name,)
+        for j, skill in enumerate(build.skills):
+            state[f"build/{i}/skill/{j}"] = (skill.id,)
+        for j, specialization in enumerate(build.specializations):
+            state[f"build/{i}/specialization/{j}"] = (
+                specialization.id, *_ids(specialization.traits, 3)
+            )
+    for i, equipment in enumerate(character.equipments):
+        prefix = f"equipment/{i}"
+        state[f"{prefix}/name"] = (equipment.name,)
+        for armor in equipment.armors:
+            state[f"{prefix}/{armor.slot}"] = (
+                armor.stats.id, armor.upgrade.id, armor.infusion.id
+            )
+        for weapon in equipment.weapons:
+            state[f"{prefix}/{weapon.slot}"] = (
+                weapon.type,
+                weapon.stats.id,
+                *_ids(weapon.upgrades, 2),
+                *_ids(weapon.infusions, 2)
+            )
+        for accessory in equipment.accessories:
+            state[f"{prefix}/{accessory.slot}"] = (
+                accessory.stats.id, *_ids(accessory.infusions, 3)
+            )
+        state[f"{prefix}/Relic"] = (equipment.relic.id,)
+    return state
+
+
+def character_from_state(name: str, state: dict[str, tuple]) -> Character:
+    """Rebuild a character with unnamed components from a state."""
+    build_count = sum(
+        key.startswith("build/") and key.endswith("/name") for key in state
+    )
+    equipment_count = sum(
+        key.startswith("equipment/") and key.endswith("/name")
+        for key in state
+    )
+
+    # Rebuild the build templates.
+    builds = []
+    for i in range(build_count):
+        skills = []
+        j = 0
+        while (skill := state.get(f"build/{i}/skill/{j}")) is not None:
+            skills.append(Skill(id=skill[0], name=EMPTY_NAME))
+            j += 1
+        specializations = []
+        j = 0
+        while (
+            specialization := state.get(f"build/{i}/specialization/{j}")
+        ) is not None:
+            specializations.append(Specialization(
+                id=specialization[0],
+                name=EMPTY_NAME,
+                traits=[
+                    Trait(id=trait_id, name=EMPTY_NAME)
+                    for trait_id in specialization[1:]
+                ]
+            ))
+            j += 1
+        builds.append(Build(
+            name=state[f"build/{i}/name"][0],
+            skills=skills,
+            specializations=specializations
+        ))
+
+    # Rebuild the equipment templates.
+    equipments = []
+    for i in range(equipment_count):
+        prefix = f"equipment/{i}"
+        equipment = Equipment.empty()
+        equipment.name = state[f"{prefix}/name"][0]
+        equipment.armors = [
+            Armor(
+                slot=slot,
+                stats=Stats(id=values[0], name=EMPTY_NAME),
+                upgrade=Upgrade(id=values[1], name=EMPTY_NAME),
+                infusion=Infusion(id=values[2], name=EMPTY_NAME)
+            )
+            for slot in ARMOR_SLOTS
+            if (values := state.get(f"{prefix}/{slot}")) is not None
+        ]
+        equipment.weapons = [
+            Weapon(
+                slot=slot,
+                type=values[0],
+                stats=Stats(id=values[1], name=EMPTY_NAME),
+                upgrades=[
+                    Upgrade(id=upgrade_id, name=EMPTY_NAME)
+                    for upgrade_id in values[2:4]
+                ],
+                infusions=[
+                    Infusion(id=infusion_id, name=EMPTY_NAME)
+                    for infusion_id in values[4:6]
+                ]
+            )
+            for slot in WEAPON_SLOTS
+            if (values := state.get(f"{prefix}/{slot}")) is not None
+        ]
+        equipment.accessories = [
+            Accessory(
+                slot=slot,
+                stats=Stats(id=values[0], name=EMPTY_NAME),
+                infusions=[
+                    Infusion(id=infusion_id, name=EMPTY_NAME)
+                    for infusion_id in values[1:]
+                ]
+            )
+            for slot in ACCESSORY_SLOTS
+            if (values := state.get(f"{prefix}/{slot}")) is not None
+        ]
+        relic = state.get(f"{prefix}/Relic")
+        if relic is not None:
+            equipment.relic = Relic(id=relic[0], name=EMPTY_NAME)
+        equipments.append(equipment)
+
+    return Character(
+        name=name,
+        profession=state.get("profession", (EMPTY_NAME,))[0],
+        builds=builds,
+        equipments=equipments
+    )
+
+
+def _diff(old: dict[str, tuple], new: dict[str, tuple]) -> tuple[dict, list]:
+    """Get the slots that changed and the slots that were removed."""
+    changed = {
+        key: value for key, value in new.items() if old.get(key) != value
+    }
+    removed = [key for key in old if key not in new]
+    return changed, removed
+
+
+class HistoryStore:
+    """Append the template states of characters as keyframes and deltas."""
+
+    def __init__(
+        self, path: str, keyframe_interval: int = KEYFRAME_INTERVAL
+    ) -> None:
+        """Initialize an instance of the HistoryStore class."""
+        self._path = path
+        self._keyframe_interval = keyframe_interval
+        self._lock = threading.Lock()
+        self._index = {}
+        self._latest = {}
+        self._deltas_since_keyframe = {}
+        self._file = open(path, "a+b")
+        self._scan()
+
+    def close(self) -> None:
+        """Close the underlying file."""
+        with self._lock:
+            self._file.close()
+
+    def __enter__(self) -> "HistoryStore":
+        """Enter a context that closes the store on exit."""
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Close the store."""
+        self.close()
+
+    def _read(self, offset: int) -> tuple[int, float, str, dict, list]:
+        """Read the record at an offset of the file."""
+        self._file.seek(offset)
+        kind, timestamp, length = _HEADER.unpack(
+            self._file.read(_HEADER.size)
+        )
+        payload = self._file.read(length)
+        if kind == KEYFRAME:
+            payload = zlib.decompress(payload)
+        name, changed, removed = json.loads(payload)
+        changed = {key: tuple(value) for key, value in changed.items()}
+        return kind, timestamp, name, changed, removed
+
+    def _scan(self) -> None:
+        """Index the records of the file, dropping a torn last record."""
+        size = os.fstat(self._file.fileno()).st_size
+        offset = 0
+        while offset + _HEADER.size <= size:
+            self._file.seek(offset)
+            _, _, length = _HEADER.unpack(self._file.read(_HEADER.size))
+            if offset + _HEADER.size + length > size:
+                break
+            kind, timestamp, name, changed, removed = self._read(offset)
+            self._index_record(name, kind, timestamp, offset, changed, removed)
+            offset += _HEADER.size + length
+        if offset < size:
+            self._file.truncate(offset)
+
+    def _index_record(
+        self,
+        name: str,
+        kind: int,
+        timestamp: float,
+        offset: int,
+        changed: dict[str, tuple],
+        removed: list[str]
+    ) -> None:
+        """Add a record to the index and the latest state of a character."""
+        timestamps, offsets, kinds = self._index.setdefault(name, ([], [], []))
+        timestamps.append(timestamp)
+        offsets.append(offset)
+        kinds.append(kind)
+        if kind == KEYFRAME:
+            self._latest[name] = dict(changed)
+            self._deltas_since_keyframe[name] = 0
+        else:
+            state = self._latest[name]
+            state.update(changed)
+            for key in removed:
+                state.pop(key, None)
+            self._deltas_since_keyframe[name] += 1
+
+    def _replay(self, name: str, end: int) -> dict[str, tuple]:
+        """Rebuild the state of a character from its first records."""
+        _, offsets, kinds = self._index[name]
+        if end == 0:
+            return {}
+
+        # Start from the last keyframe and apply the deltas after it.
+        start = end - 1
+        while kinds[start] != KEYFRAME:
+            start -= 1
+        state = {}
+        for offset in offsets[start:end]:
+            _, _, _, changed, removed = self._read(offset)
+            state.update(changed)
+            for key in removed:
+                state.pop(key, None)
+        return state
+
+    def record(
+        self, character: Character, timestamp: float | None = None
+    ) -> bool:
+        """Append the state of a character, returning whether it changed."""
+        timestamp = time.time() if timestamp is None else timestamp
+        state = template_state(character)
+        with self._lock:
+            latest = self._latest.get(character.name)
+            if latest is not None:
+                timestamps = self._index[character.name][0]
+                if timestamp < timestamps[-1]:
+                    raise ValueError("History records must be in time order")
+                changed, removed = _diff(latest, state)
+                if not changed and not removed:
+                    return False
+            if latest is None or (
+                self._deltas_since_keyframe[character.name]
+                >= self._keyframe_interval
+            ):
+                kind = KEYFRAME
+                changed, removed = state, []
+                payload = zlib.compress(
+                    json.dumps([character.name, changed, removed]).encode()
+                )
+            else:
+                kind = DELTA
+                payload = json.dumps(
+                    [character.name, changed, removed]
+                ).encode()
+            self._file.seek(0, os.SEEK_END)
+            offset = self._file.tell()
+            self._file.write(
+                _HEADER.pack(kind, timestamp, len(payload)) + payload
+            )
+            self._file.flush()
+            self._index_record(
+                character.name, kind, timestamp, offset, changed, removed
+            )
+        return True
+
+    def characters(self) -> list[str]:
+        """Get the names of all recorded characters."""
+        return list(self._index)
+
+    def state_at(
+        self, name: str, timestamp: float | None = None
+    ) -> dict[str, tuple] | None:
+        """Reconstruct the state of a character at a point in time."""
+        with self._lock:
+            if name not in self._index:
+                return None
+            if timestamp is None:
+                return dict(self._latest[name])
+            end = bisect.bisect_right(self._index[name][0], timestamp)
+            if end == 0:
+                return None
+            return self._replay(name, end)
+
+    def character_at(
+        self, name: str, timestamp: float | None = None
+    ) -> Character | None:
+        """Reconstruct the templates of a character at a point in time."""
+        state = self.state_at(name, timestamp)
+        if state is None:
+            return None
+        return character_from_state(name, state)
+
+    def changes(
+        self, name: str, start: float = 0.0, end: float = float("inf")
+    ) -> Iterator[tuple[float, dict[str, tuple], list[str]]]:
+        """Yield the slot changes of a character within a time range."""
+        with self._lock:
+            if name not in self._index:
+                return
+            timestamps, offsets, _ = self._index[name]
+            first = bisect.bisect_left(timestamps, start)
+            last = bisect.bisect_right(timestamps, end)
+            state = self._replay(name, first)
+            records = [self._read(offset) for offset in offsets[first:last]]
+        for kind, timestamp, _, changed, removed in records:
+            if kind == KEYFRAME:
+                # Report a keyframe as the changes against the prior state.
+                changed, removed = _diff(state, changed)
+            state.update(changed)
+            for key in removed:
+                state.pop(key, None)
+            if changed or removed:
+                yield timestamp, changed, removed
+
+
+if __name__ == "__main__":
+    from api import Api
+    api = Api()
+    api.set_api_key("<API_KEY>")
+    with HistoryStore("history.bin") as history:
+        for character in api.get_character_bundle().values():
+            changed = history.record(character)
+            print(f"- {character.name}: {'changed' if changed else 'same'}")
@@ -0,0 +1,314 @@
+import sys
+import json
+import zlib
+import base64
+import threading
+from array import array
+from typing import NamedTuple
+from collections.abc import Iterable, Mapping
+from constants import (
+    EMPTY_ID,
+    EMPTY_TYPE
+)
+from cache import (
+    CacheStats
+)
+
+# Define the compression level of persisted item tables.
+_COMPRESSION_LEVEL = 6
+
+# Define the bytes of a record besides its name: ID, name end, three type
+# codes and the tick of its last use.
+_ROW_BYTES = 8 + 8 + 3 * 2 + 8
+
+# Define the share of the bounds that eviction shrinks a full table to.
+_EVICTION_SHARE = 0.75
+
+
+def _pack(values: array) -> str:
+    """Encode an array as base64 text of its little-endian bytes."""
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return base64.b64encode(values.tobytes()).decode()
+
+
+def _unpack(typecode: str, text: str) -> array:
+    """Decode an array from base64 text of its little-endian bytes."""
+    values = array(typecode, base64.b64decode(text))
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+class ItemRecord(NamedTuple):
+    """Represent the fields of an item that templates are resolved with."""
+    id: int
+    name: str
+    type: str
+    weapon_type: str
+    upgrade_type: str
+
+
+def project_item(item_data: Mapping) -> ItemRecord:
+    """Project the JSON data of an item onto the fields that are used."""
+    details = item_data.get("details") or {}
+    item_type = item_data.get("type", EMPTY_TYPE)
+    weapon_type = EMPTY_TYPE
+    upgrade_type = EMPTY_TYPE
+    if item_type == "Weapon":
+        weapon_type = details.get("type", EMPTY_TYPE).lower().capitalize()
+    elif item_type == "UpgradeComponent":
+        upgrade_type = details.get("type", EMPTY_TYPE)
+        if "Infusion" in details.get("infusion_upgrade_flags", []):
+            upgrade_type = "Infusion"
+    return ItemRecord(
+        id=item_data["id"],
+        name=item_data["name"],
+        type=item_type,
+        weapon_type=weapon_type,
+        upgrade_type=upgrade_type
+    )
+
+
+class ItemTable:
+    """Store item records in flat arrays instead of one object per item."""
+
+    def __init__(
+        self,
+        maxsize: int | None = None,
+        ttl: float | None = None,
+        maxbytes: int | None = None
+    ) -> None:
+        """Initialize an instance of the ItemTable class."""
+        if ttl is not None:
+            raise ValueError("Item records do not expire")
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        """Drop every item record."""
+        with self._lock:
+            self._reset()
+
+    def clear(self) -> None:
+        """Drop every item record."""
+        self.invalidate()
+
+    def _reset(self) -> None:
+        """Replace the arrays with empty ones, holding the lock."""
+        self._rows = {}
+        self._ids = array("q")
+        self._name_ends = array("Q")
+        self._names = bytearray()
+        self._codes = array("H")
+        self._used = array("Q")
+        self._tick = 0
+        self._vocabulary = [EMPTY_TYPE]
+        self._vocabulary_codes = {EMPTY_TYPE: 0}
+
+    def __len__(self) -> int:
+        """Count the item records."""
+        return len(self._ids)
+
+    def __contains__(self, item_id: int) -> bool:
+        """Whether the table holds a record for an item ID."""
+        with self._lock:
+            return item_id in self._rows
+
+    def _code(self, text: str) -> int:
+        """Get the code of a type string, adding it to the vocabulary."""
+        code = self._vocabulary_codes.get(text)
+        if code is None:
+            code = len(self._vocabulary)
+            self._vocabulary.append(text)
+            self._vocabulary_codes[text] = code
+        return code
+
+    def _append(self, record: ItemRecord) -> None:
+        """Append a record to the arrays, holding the lock."""
+        self._ids.append(record.id)
+        self._names += record.name.encode()
+        self._name_ends.append(len(self._names))
+        self._codes.extend((
+            self._code(record.type),
+            self._code(record.weapon_type),
+            self._code(record.upgrade_type)
+        ))
+        self._tick += 1
+        self._used.append(self._tick)
+        self._rows[record.id] = len(self._ids) - 1
+
+    def _record(self, row: int) -> ItemRecord:
+        """Read the record of a row, holding the lock."""
+        start = self._name_ends[row - 1] if row else 0
+        type_code, weapon_code, upgrade_code = self._codes[3 * row:3 * row + 3]
+        return ItemRecord(
+            id=self._ids[row],
+            name=self._names[start:self._name_ends[row]].decode(),
+            type=self._vocabulary[type_code],
+            weapon_type=self._vocabulary[weapon_code],
+            upgrade_type=self._vocabulary[upgrade_code]
+        )
+
+    def _over(self, rows: int, nbytes: int, share: float = 1.0) -> bool:
+        """Whether a size exceeds a share of the bounds of the table."""
+        return (
+            self.maxsize is not None and rows > self.maxsize * share
+        ) or (
+            self.maxbytes is not None and nbytes > self.maxbytes * share
+        )
+
+    def _evict(self) -> None:
+        """Evict the least recently used records, holding the lock."""
+        if not self._over(len(self._ids), self._nbytes()):
+            return
+
+        # Keep the most recently used records within a share of the bounds,
+        # so that the arrays are rebuilt only once in a while.
+        kept = []
+        nbytes = 0
+        for row in sorted(
+            range(len(self._ids)), key=self._used.__getitem__, reverse=True
+        ):
+            start = self._name_ends[row - 1] if row else 0
+            size = _ROW_BYTES + self._name_ends[row] - start
+            if self._over(len(kept) + 1, nbytes + size, _EVICTION_SHARE):
+                break
+            kept.append(row)
+            nbytes += size
+        records = [
+            (self._record(row), self._used[row]) for row in sorted(kept)
+        ]
+        self._evictions += len(self._ids) - len(kept)
+        self._reset()
+        for record, used in records:
+            self._append(record)
+            self._used[-1] = used
+        self._tick = max(self._used, default=0)
+
+    def add(self, record: ItemRecord) -> None:
+        """Add an item record, ignoring IDs that are already stored."""
+        with self._lock:
+            if record.id in self._rows:
+                return
+            self._append(record)
+            self._evict()
+
+    def extend(self, items_data: Iterable[Mapping]) -> None:
+        """Project and add the JSON data of many items."""
+        for item_data in items_data:
+            self.add(project_item(item_data))
+
+    def get(self, item_id: int) -> ItemRecord | None:
+        """Get the record of an item, or None if it is not stored."""
+        with self._lock:
+            row = self._rows.get(item_id)
+            if row is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+            self._tick += 1
+            self._used[row] = self._tick
+            return self._record(row)
+
+    def missing(self, item_ids: Iterable[int]) -> list[int]:
+        """Get the distinct IDs that have no record, in order."""
+        with self._lock:
+            return list(dict.fromkeys(
+                item_id for item_id in item_ids
+                if item_id != EMPTY_ID and item_id not in self._rows
+            ))
+
+    def _nbytes(self) -> int:
+        """Get the memory used by the arrays, holding the lock."""
+        return (
+            self._ids.itemsize * len(self._ids)
+            + self._name_ends.itemsize * len(self._name_ends)
+            + len(self._names)
+            + self._codes.itemsize * len(self._codes)
+            + self._used.itemsize * len(self._used)
+        )
+
+    def nbytes(self) -> int:
+        """Get the memory used by the arrays of the table."""
+        with self._lock:
+            return self._nbytes()
+
+    def stats(self) -> CacheStats:
+        """Get the statistics of the table in the form of a cache's."""
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                size=len(self._ids),
+                memory=self._nbytes()
+            )
+
+    def dump(self) -> dict:
+        """Get the arrays of the table as JSON data."""
+        with self._lock:
+            return {
+                "ids": _pack(self._ids),
+                "name_ends": _pack(self._name_ends),
+                "names": base64.b64encode(self._names).decode(),
+                "codes": _pack(self._codes),
+                "vocabulary": list(self._vocabulary)
+            }
+
+    def restore(self, dump: dict) -> None:
+        """Add the records of a dump to the table."""
+        ids = _unpack("q", dump["ids"])
+        name_ends = _unpack("Q", dump["name_ends"])
+        names = base64.b64decode(dump["names"])
+        codes = _unpack("H", dump["codes"])
+        vocabulary = dump["vocabulary"]
+        start = 0
+        for row, item_id in enumerate(ids):
+            end = name_ends[row]
+            self.add(ItemRecord(
+                id=item_id,
+                name=names[start:end].decode(),
+                type=vocabulary[codes[3 * row]],
+                weapon_type=vocabulary[codes[3 * row + 1]],
+                upgrade_type=vocabulary[codes[3 * row + 2]]
+            ))
+            start = end
+
+    def save(self, path: str) -> None:
+        """Save the records to a compressed file."""
+        data = json.dumps(self.dump()).encode()
+        with open(path, "wb") as file:
+            file.write(zlib.compress(data, _COMPRESSION_LEVEL))
+
+    def load(self, path: str) -> None:
+        """Load records saved to a file into the table."""
+        with open(path, "rb") as file:
+            self.restore(json.loads(zlib.decompress(file.read())))
+
+
+if __name__ == "__main__":
+    table = ItemTable()
+    table.extend([
+        {
+            "id": 24615,
+            "name": "Superior Sigil of Force",
+            "type": "UpgradeComponent",
+            "details": {"type": "Sigil"}
+        },
+        {
+            "id": 46762,
+            "name": "Zojja's Greatsword",
+            "type": "Weapon",
+            "details": {"type": "Greatsword"}
+        }
+    ])
+    for item_id in (24615, 46762):
+        print(table.get(item_id))
+    print(f"Memory: {table.nbytes()} bytes")
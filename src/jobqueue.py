@@ -0,0 +1,503 @@
+import sys
+import json
+import time
+import uuid
+import socket
+import sqlite3
+import hashlib
+import argparse
+import threading
+from dataclasses import asdict, dataclass
+from collections.abc import Callable, Iterable
+
+# Define the statuses a job can have.
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+
+# Define the schema of the SQLite queue.
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    available_at REAL NOT NULL,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_available ON jobs (status, available_at);
+CREATE TABLE IF NOT EXISTS results (
+    id TEXT PRIMARY KEY,
+    result TEXT NOT NULL
+);
+"""
+
+
+@dataclass
+class Job:
+    """Represent a leased check of an account or character."""
+    id: str
+    payload: dict
+    attempts: int
+    worker: str
+
+
+class SQLiteQueue:
+    """Queue jobs in a SQLite file shared by local worker processes."""
+
+    def __init__(
+        self,
+        path: str,
+        lease: float = 60.0,
+        max_attempts: int = 3,
+        retry_delay: float = 5.0
+    ) -> None:
+        """Initialize an instance of the SQLiteQueue class."""
+        self._lease = lease
+        self._max_attempts = max_attempts
+        self._retry_delay = retry_delay
+        self._connection = sqlite3.connect(
+            path, timeout=30, isolation_level=None, check_same_thread=False
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def enqueue(self, job_id: str, payload: dict) -> bool:
+        """Add a job unless one with the same ID already exists."""
+        with self._lock:
+            cursor = self._connection.execute(
+                "INSERT OR IGNORE INTO jobs "
+                "(id, payload, status, available_at) VALUES (?, ?, ?, ?)",
+                (job_id, json.dumps(payload), PENDING, time.time())
+            )
+            return cursor.rowcount == 1
+
+    def lease(self, worker: str) -> Job | None:
+        """Lease the next available job, reclaiming expired leases."""
+        now = time.time()
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                while True:
+                    row = self._connection.execute(
+                        "SELECT id, payload, attempts FROM jobs "
+                        "WHERE status IN (?, ?) AND available_at <= ? "
+                        "ORDER BY available_at LIMIT 1",
+                        (PENDING, LEASED, now)
+                    ).fetchone()
+                    if row is None:
+                        self._connection.execute("COMMIT")
+                        return None
+                    job_id, payload, attempts = row
+                    if attempts < self._max_attempts:
+                        break
+                    # Give up on a job whose worker crashed too many times.
+                    self._connection.execute(
+                        "UPDATE jobs SET status = ?, error = ? WHERE id = ?",
+                        (FAILED, "Lease expired too many times", job_id)
+                    )
+                self._connection.execute(
+                    "UPDATE jobs SET status = ?, attempts = ?, worker = ?, "
+                    "available_at = ? WHERE id = ?",
+                    (LEASED, attempts + 1, worker, now + self._lease, job_id)
+                )
+                self._connection.execute("COMMIT")
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+        return Job(
+            id=job_id,
+            payload=json.loads(payload),
+            attempts=attempts + 1,
+            worker=worker
+        )
+
+    def renew(self, job: Job) -> bool:
+        """Extend the lease of a job held by its worker."""
+        with self._lock:
+            cursor = self._connection.execute(
+                "UPDATE jobs SET available_at = ? WHERE id = ? "
+                "AND worker = ? AND attempts = ? AND status = ?",
+                (
+                    time.time() + self._lease,
+                    job.id,
+                    job.worker,
+                    job.attempts,
+                    LEASED
+                )
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, job: Job, result: dict) -> bool:
+        """Store the result of a job unless its worker lost the lease."""
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                cursor = self._connection.execute(
+                    "UPDATE jobs SET status = ?, error = NULL WHERE id = ? "
+                    "AND worker = ? AND attempts = ? AND status = ?",
+                    (DONE, job.id, job.worker, job.attempts, LEASED)
+                )
+                held = cursor.rowcount == 1
+                if held:
+                    self._connection.execute(
+                        "INSERT OR IGNORE INTO results (id, result) "
+                        "VALUES (?, ?)",
+                        (job.id, json.dumps(result))
+                    )
+                self._connection.execute("COMMIT")
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+        return held
+
+    def fail(self, job: Job, error: str) -> None:
+        """Retry a failed job later, or mark it failed after the last try."""
+        status = FAILED if job.attempts >= self._max_attempts else PENDING
+        with self._lock:
+            self._connection.execute(
+                "UPDATE jobs SET status = ?, error = ?, available_at = ? "
+                "WHERE id = ? AND worker = ? AND attempts = ? AND status = ?",
+                (
+                    status,
+                    error,
+                    time.time() + self._retry_delay * job.attempts,
+                    job.id,
+                    job.worker,
+                    job.attempts,
+                    LEASED
+                )
+            )
+
+    def result(self, job_id: str) -> dict | None:
+        """Get the result of a job, or None if it has not completed."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT result FROM results WHERE id = ?", (job_id,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def status(self, job_id: str) -> str | None:
+        """Get the status of a job, or None if it was never enqueued."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT status FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def counts(self) -> dict[str, int]:
+        """Count the jobs by status."""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT status, COUNT(*) FROM jobs GROUP BY status"
+            ).fetchall()
+        return dict(rows)
+
+
+class RedisQueue:
+    """Queue jobs in Redis, or a compatible server, shared across machines."""
+
+    def __init__(
+        self,
+        client,
+        name: str = "gw2",
+        lease: float = 60.0,
+        max_attempts: int = 3
+    ) -> None:
+        """Initialize an instance of the RedisQueue class."""
+        self._client = client
+        self._lease = lease
+        self._max_attempts = max_attempts
+        self._pending = f"{name}:pending"
+        self._leases = f"{name}:leases"
+        self._results = f"{name}:results"
+        self._jobs = f"{name}:job:"
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs) -> "RedisQueue":
+        """Connect to a queue by URL, importing redis only when needed."""
+        import redis
+        return cls(redis.Redis.from_url(url, decode_responses=True), **kwargs)
+
+    def _transaction(self, func, *watches):
+        """Run a read-then-write transaction, retrying it on conflicts."""
+        return self._client.transaction(
+            func, *watches, value_from_callable=True
+        )
+
+    def enqueue(self, job_id: str, payload: dict) -> bool:
+        """Add a job unless one with the same ID already exists."""
+        key = self._jobs + job_id
+
+        def enqueue(pipe) -> bool:
+            """Create the job and queue it in one step."""
+            if pipe.exists(key):
+                return False
+            pipe.multi()
+            pipe.hset(key, mapping={
+                "payload": json.dumps(payload),
+                "status": PENDING,
+                "attempts": 0
+            })
+            pipe.lpush(self._pending, job_id)
+            return True
+
+        return self._transaction(enqueue, key)
+
+    def _reclaim(self) -> None:
+        """Return jobs with expired leases to the pending list."""
+        now = time.time()
+        for job_id in self._client.zrangebyscore(self._leases, 0, now):
+
+            def reclaim(pipe) -> None:
+                """Move the job back unless its lease changed meanwhile."""
+                expires = pipe.zscore(self._leases, job_id)
+                if expires is None or expires > now:
+                    return
+                pipe.multi()
+                pipe.zrem(self._leases, job_id)
+                pipe.hset(self._jobs + job_id, "status", PENDING)
+                pipe.lpush(self._pending, job_id)
+
+            self._transaction(reclaim, self._leases)
+
+    def lease(self, worker: str) -> Job | None:
+        """Lease the next available job, reclaiming expired leases."""
+        self._reclaim()
+
+        def lease(pipe) -> Job | None:
+            """Pop the next job and lease it in one step."""
+            job_id = pipe.lindex(self._pending, -1)
+            if job_id is None:
+                return None
+            key = self._jobs + job_id
+            payload, attempts = pipe.hmget(key, "payload", "attempts")
+            attempts = int(attempts or 0) + 1
+            pipe.multi()
+            pipe.rpop(self._pending)
+            if attempts > self._max_attempts:
+                # Give up on a job whose worker crashed too many times.
+                pipe.hset(key, mapping={
+                    "status": FAILED,
+                    "error": "Lease expired too many times"
+                })
+                return False
+            pipe.zadd(self._leases, {job_id: time.time() + self._lease})
+            pipe.hset(key, mapping={
+                "status": LEASED, "worker": worker, "attempts": attempts
+            })
+            return Job(
+                id=job_id,
+                payload=json.loads(payload),
+                attempts=attempts,
+                worker=worker
+            )
+
+        while True:
+            job = self._transaction(lease, self._pending)
+            if job is not False:
+                return job
+
+    def _holds(self, pipe, job: Job) -> bool:
+        """Check whether a worker still holds the lease of a job."""
+        if pipe.zscore(self._leases, job.id) is None:
+            return False
+        worker, attempts = pipe.hmget(
+            self._jobs + job.id, "worker", "attempts"
+        )
+        return worker == job.worker and int(attempts or 0) == job.attempts
+
+    def renew(self, job: Job) -> bool:
+        """Extend the lease of a job held by its worker."""
+
+        def renew(pipe) -> bool:
+            """Move the expiry of the lease unless it was lost."""
+            if not self._holds(pipe, job):
+                return False
+            pipe.multi()
+            pipe.zadd(self._leases, {job.id: time.time() + self._lease})
+            return True
+
+        return self._transaction(renew, self._leases, self._jobs + job.id)
+
+    def complete(self, job: Job, result: dict) -> bool:
+        """Store the result of a job unless its worker lost the lease."""
+        key = self._jobs + job.id
+
+        def complete(pipe) -> bool:
+            """Store the result and release the lease in one step."""
+            if not self._holds(pipe, job):
+                return False
+            pipe.multi()
+            pipe.hsetnx(self._results, job.id, json.dumps(result))
+            pipe.zrem(self._leases, job.id)
+            pipe.hset(key, "status", DONE)
+            return True
+
+        return self._transaction(complete, self._leases, key)
+
+    def fail(self, job: Job, error: str) -> None:
+        """Retry a failed job, or mark it failed after the last try."""
+        key = self._jobs + job.id
+
+        def fail(pipe) -> None:
+            """Release the lease and requeue the job unless it was lost."""
+            if not self._holds(pipe, job):
+                return
+            pipe.multi()
+            pipe.zrem(self._leases, job.id)
+            if job.attempts >= self._max_attempts:
+                pipe.hset(key, mapping={"status": FAILED, "error": error})
+            else:
+                pipe.hset(key, mapping={"status": PENDING, "error": error})
+                pipe.lpush(self._pending, job.id)
+
+        self._transaction(fail, self._leases, key)
+
+    def result(self, job_id: str) -> dict | None:
+        """Get the result of a job, or None if it has not completed."""
+        result = self._client.hget(self._results, job_id)
+        return json.loads(result) if result else None
+
+    def status(self, job_id: str) -> str | None:
+        """Get the status of a job, or None if it was never enqueued."""
+        return self._client.hget(self._jobs + job_id, "status")
+
+
+class Worker:
+    """Lease jobs from a queue and run them, renewing leases meanwhile."""
+
+    def __init__(self, queue, handler, worker: str | None = None) -> None:
+        """Initialize an instance of the Worker class."""
+        self._queue = queue
+        self._handler = handler
+        self._worker = worker or f"{socket.gethostname()}:{uuid.uuid4().hex}"
+        self._stopped = threading.Event()
+
+    def stop(self) -> None:
+        """Stop the worker after its current job."""
+        self._stopped.set()
+
+    def _heartbeat(self, job: Job, done: threading.Event, interval: float):
+        """Renew the lease of a job until it is done."""
+        while not done.wait(interval):
+            if not self._queue.renew(job):
+                return
+
+    def run_one(self, renew_interval: float = 20.0) -> bool:
+        """Run the next job, returning False if none was available."""
+        job = self._queue.lease(self._worker)
+        if job is None:
+            return False
+        done = threading.Event()
+        heartbeat = threading.Thread(
+            target=self._heartbeat,
+            args=(job, done, renew_interval),
+            daemon=True
+        )
+        heartbeat.start()
+        try:
+            result = self._handler(job.payload)
+        except Exception as error:
+            self._queue.fail(job, f"{type(error).__name__}: {error}")
+        else:
+            self._queue.complete(job, result)
+        finally:
+            done.set()
+            heartbeat.join()
+        return True
+
+    def run(self, stop_when_empty: bool = False, poll_interval: float = 1.0):
+        """Run jobs until stopped, or until the queue is empty."""
+        while not self._stopped.is_set():
+            if not self.run_one() and (
+                stop_when_empty or self._stopped.wait(poll_interval)
+            ):
+                break
+
+
+def key_reference(api_key: str) -> str:
+    """Refer to an API key by a digest, so that payloads do not hold it."""
+    return hashlib.sha256(api_key.encode()).hexdigest()[:16]
+
+
+def character_job_handler(
+    api_keys: Iterable[str]
+) -> Callable[[dict], dict]:
+    """Create a handler of character checks with the API keys of a worker."""
+    api_keys = {key_reference(api_key): api_key for api_key in api_keys}
+
+    def check_character_job(payload: dict) -> dict:
+        """Run a character check described by a job payload."""
+        from api import Api
+        from snowcrows import Snowcrows
+        from checker import check_character
+        api_key = api_keys.get(payload["key"])
+        if api_key is None:
+            raise LookupError(f"No API key for reference {payload['key']}")
+        result = check_character(
+            Api(api_key=api_key),
+            Snowcrows(),
+            payload["character"],
+            payload.get("build"),
+            payload.get("timeout")
+        )
+        return asdict(result)
+
+    return check_character_job
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run a worker, or enqueue character checks, from the command line."""
+    parser = argparse.ArgumentParser(
+        description="Run roster checks from a shared job queue."
+    )
+    parser.add_argument("--sqlite", help="Path of a SQLite queue file.")
+    parser.add_argument("--redis", help="URL of a Redis-compatible server.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    worker_parser = subparsers.add_parser("worker", help="Run a worker.")
+    worker_parser.add_argument("--once", action="store_true")
+    worker_parser.add_argument(
+        "--keys",
+        required=True,
+        help="Path of a file with the API keys of the jobs, one per line."
+    )
+    enqueue_parser = subparsers.add_parser(
+        "enqueue", help="Enqueue checks for all characters of API keys."
+    )
+    enqueue_parser.add_argument("api_keys", nargs="+")
+    args = parser.parse_args(argv)
+
+    if args.redis:
+        queue = RedisQueue.from_url(args.redis)
+    elif args.sqlite:
+        queue = SQLiteQueue(args.sqlite)
+    else:
+        parser.error("Either --sqlite or --redis is required.")
+
+    if args.command == "worker":
+        with open(args.keys, encoding="utf-8") as file:
+            api_keys = [line.strip() for line in file if line.strip()]
+        Worker(queue, character_job_handler(api_keys)).run(
+            stop_when_empty=args.once
+        )
+    else:
+        from api import Api
+        for api_key in args.api_keys:
+            api = Api(api_key=api_key)
+            for character_name in api.get_character_names():
+                queue.enqueue(
+                    f"{api.get_account_name()}/{character_name}",
+                    {
+                        "key": key_reference(api_key),
+                        "character": character_name
+                    }
+                )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
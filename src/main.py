@@ -0,0 +1,7 @@
+from ui import (
+    App
+)
+
+
+if __name__ == "__main__":
+    App().run()
@@ -0,0 +1,422 @@
+from __future__ import annotations
+import threading
+from typing import TYPE_CHECKING, NamedTuple
+from collections.abc import Iterable, Mapping, Sequence
+from constants import (
+    EMPTY_ID,
+    EMPTY_NAME,
+    EMPTY_TYPE,
+    SLOT_INDEX,
+    ARMOR_SLOTS,
+    WEAPON_SLOTS,
+    ACCESSORY_SLOTS,
+    ARMOR_KIND,
+    WEAPON_KIND,
+    ACCESSORY_KIND
+)
+from build import (
+    Build
+)
+from equipment import (
+    Equipment
+)
+from compare import (
+    SlotDiff,
+    _describe
+)
+
+if TYPE_CHECKING:
+    import numpy
+
+# Define the number of skills, specializations and traits of a build.
+_SKILLS = 5
+_SPECIALIZATIONS = 3
+_TRAITS = 3
+
+# Define the layout of a build vector.
+_SPECIALIZATION_BASE = _SKILLS
+_SPECIALIZATION_WIDTH = 1 + _TRAITS
+BUILD_WIDTH = _SPECIALIZATION_BASE + _SPECIALIZATIONS * _SPECIALIZATION_WIDTH
+
+# Define the layout of an equipment vector: stats, upgrade and infusion of
+# armors; type, stats, stats name, two upgrades and two infusions of
+# weapons; stats and three infusions of accessories; then the relic.
+_ARMOR_WIDTH = 3
+_WEAPON_WIDTH = 7
+_ACCESSORY_WIDTH = 4
+_WEAPON_BASE = len(ARMOR_SLOTS) * _ARMOR_WIDTH
+_ACCESSORY_BASE = _WEAPON_BASE + len(WEAPON_SLOTS) * _WEAPON_WIDTH
+_RELIC_OFFSET = _ACCESSORY_BASE + len(ACCESSORY_SLOTS) * _ACCESSORY_WIDTH
+EQUIPMENT_WIDTH = _RELIC_OFFSET + 1
+
+# Define the default weight of a mismatch by field.
+DEFAULT_WEIGHTS = {
+    "skill": 1.0,
+    "specialization": 3.0,
+    "trait": 1.0,
+    "type": 2.0,
+    "stats": 2.0,
+    "upgrade": 1.0,
+    "infusion": 0.5,
+    "relic": 1.0
+}
+
+# Define the number of texts a vocabulary holds at most.
+VOCABULARY_SIZE = 1024
+
+# Define the code of the texts a full vocabulary cannot add.
+_OTHER_CODE = -1
+
+
+class Vocabulary:
+    """Encode the names and types of one plan as integers."""
+
+    def __init__(self, maxsize: int = VOCABULARY_SIZE) -> None:
+        """Initialize an instance of the Vocabulary class."""
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._texts = [EMPTY_NAME]
+        self._codes = {}
+
+    def __len__(self) -> int:
+        """Count the texts of the vocabulary, including the empty text."""
+        return len(self._texts)
+
+    def code(self, text: str, required: bool = False) -> int:
+        """Encode a name or type as an integer, ignoring case and "'s"."""
+        if not text:
+            return EMPTY_ID
+        key = text.lower().removesuffix("'s")
+        code = self._codes.get(key)
+        if code is None:
+            with self._lock:
+                code = self._codes.get(key)
+                if code is None:
+                    # Encode the texts of a full vocabulary as other texts,
+                    # which fail every check, unless a check requires them.
+                    if len(self._texts) >= self.maxsize and not required:
+                        return _OTHER_CODE
+                    code = len(self._texts)
+                    self._texts.append(text)
+                    self._codes[key] = code
+        return code
+
+    def text(self, code: int) -> str:
+        """Decode the text of a code."""
+        if code == _OTHER_CODE:
+            return "?"
+        return self._texts[code]
+
+
+def _base(kind: int, slot: str) -> int | None:
+    """Get the offset of a slot in an equipment vector."""
+    slot_kind, index = SLOT_INDEX.get(slot, (None, 0))
+    if slot_kind == ARMOR_KIND:
+        return index * _ARMOR_WIDTH
+    if slot_kind == WEAPON_KIND:
+        return _WEAPON_BASE + index * _WEAPON_WIDTH
+    if slot_kind == ACCESSORY_KIND:
+        return _ACCESSORY_BASE + index * _ACCESSORY_WIDTH
+    return None
+
+
+def vectorize_build(build: Build) -> list[int]:
+    """Flatten the IDs of a build into a vector."""
+    vector = [EMPTY_ID] * BUILD_WIDTH
+    for i, skill in enumerate(build.skills[:_SKILLS]):
+        vector[i] = skill.id
+    for i, specialization in enumerate(
+        build.specializations[:_SPECIALIZATIONS]
+    ):
+        base = _SPECIALIZATION_BASE + i * _SPECIALIZATION_WIDTH
+        vector[base] = specialization.id
+        for j, trait in enumerate(specialization.traits[:_TRAITS]):
+            vector[base + 1 + j] = trait.id
+    return vector
+
+
+def vectorize_equipment(
+    equipment: Equipment, vocabulary: Vocabulary
+) -> list[int]:
+    """Flatten the IDs of an equipment into a vector in slot order."""
+    vector = [EMPTY_ID] * EQUIPMENT_WIDTH
+    for armor in equipment.armors:
+        base = _base(ARMOR_KIND, armor.slot)
+        if base is not None:
+            vector[base:base + _ARMOR_WIDTH] = (
+                armor.stats.id, armor.upgrade.id, armor.infusion.id
+            )
+    for weapon in equipment.weapons:
+        base = _base(WEAPON_KIND, weapon.slot)
+        if base is None:
+            continue
+        vector[base] = vocabulary.code(weapon.type)
+        vector[base + 1] = weapon.stats.id
+        vector[base + 2] = vocabulary.code(weapon.stats.name)
+        for j, upgrade in enumerate(weapon.upgrades[:2]):
+            vector[base + 3 + j] = upgrade.id
+        for j, infusion in enumerate(weapon.infusions[:2]):
+            vector[base + 5 + j] = infusion.id
+    for accessory in equipment.accessories:
+        base = _base(ACCESSORY_KIND, accessory.slot)
+        if base is None:
+            continue
+        vector[base] = accessory.stats.id
+        for j, infusion in enumerate(accessory.infusions[:3]):
+            vector[base + 1 + j] = infusion.id
+    vector[_RELIC_OFFSET] = equipment.relic.id
+    return vector
+
+
+class Check(NamedTuple):
+    """Represent a check of one vector offset against an expected value."""
+    offset: int
+    expected: int
+    weight: float
+    slot: str
+    field: str
+    description: str
+    coded: bool = False
+
+
+class ComparisonPlan:
+    """Check template vectors against the fields a meta build specifies."""
+
+    def __init__(
+        self,
+        checks: Sequence[Check],
+        width: int,
+        vocabulary: Vocabulary | None = None
+    ) -> None:
+        """Initialize an instance of the ComparisonPlan class."""
+        self.checks = tuple(checks)
+        self.width = width
+        self.vocabulary = vocabulary or Vocabulary()
+        self._flat = tuple(
+            (check.offset, check.expected, check.weight)
+            for check in self.checks
+        )
+        self._arrays = None
+
+    def __len__(self) -> int:
+        """Count the checks of the plan."""
+        return len(self.checks)
+
+    def score(self, vector: Sequence[int]) -> float:
+        """Get the weighted sum of the failed checks of a vector."""
+        return sum(
+            weight
+            for offset, expected, weight in self._flat
+            if vector[offset] != expected
+        )
+
+    def score_many(self, vectors: numpy.ndarray) -> numpy.ndarray:
+        """Get the weighted scores of a matrix of vectors, one per row."""
+        if self._arrays is None:
+            import numpy as np
+            self._arrays = (
+                np.array([check.offset for check in self.checks], dtype=int),
+                np.array([check.expected for check in self.checks]),
+                np.array([check.weight for check in self.checks])
+            )
+        offsets, expected, weights = self._arrays
+        return (vectors[:, offsets] != expected) @ weights
+
+    def diffs(self, vector: Sequence[int]) -> list[SlotDiff]:
+        """Describe the failed checks of a vector."""
+        return [
+            SlotDiff(
+                slot=check.slot,
+                field=check.field,
+                actual=self._actual(check, vector[check.offset]),
+                expected=check.description
+            )
+            for check in self.checks
+            if vector[check.offset] != check.expected
+        ]
+
+    def _actual(self, check: Check, value: int) -> str:
+        """Describe the value a vector holds where a check failed."""
+        if value == EMPTY_ID:
+            return "-"
+        if check.coded:
+            return self.vocabulary.text(value)
+        return str(value)
+
+
+def _weight(weights: Mapping[str, float], field: str) -> float:
+    """Get the weight of a field such as "upgrade 1" by its kind."""
+    return weights.get(field.split(" ")[0], 1.0)
+
+
+def compile_build(
+    meta: Build, weights: Mapping[str, float] = DEFAULT_WEIGHTS
+) -> ComparisonPlan:
+    """Compile the checks of the skills and traits a meta build specifies."""
+    checks = []
+    for i, skill in enumerate(meta.skills[:_SKILLS]):
+        if skill.id != EMPTY_ID:
+            checks.append(Check(
+                i, skill.id, _weight(weights, "skill"),
+                f"Skill {i + 1}", "skill", _describe(skill.id, skill.name)
+            ))
+    for i, specialization in enumerate(
+        meta.specializations[:_SPECIALIZATIONS]
+    ):
+        if specialization.id == EMPTY_ID:
+            continue
+        base = _SPECIALIZATION_BASE + i * _SPECIALIZATION_WIDTH
+        checks.append(Check(
+            base, specialization.id, _weight(weights, "specialization"),
+            f"Specialization {i + 1}", "specialization",
+            _describe(specialization.id, specialization.name)
+        ))
+        for j, trait in enumerate(specialization.traits[:_TRAITS]):
+            if trait.id != EMPTY_ID:
+                checks.append(Check(
+                    base + 1 + j, trait.id, _weight(weights, "trait"),
+                    f"Specialization {i + 1}", f"trait {j + 1}",
+                    _describe(trait.id, trait.name)
+                ))
+    return ComparisonPlan(checks, BUILD_WIDTH)
+
+
+def compile_equipment(
+    meta: Equipment, weights: Mapping[str, float] = DEFAULT_WEIGHTS
+) -> ComparisonPlan:
+    """Compile the checks of the slots a meta equipment specifies."""
+    checks = []
+    vocabulary = Vocabulary()
+
+    def check(offset, expected, slot, field, description, coded=False):
+        """Add a check if the meta specifies the expected value."""
+        if expected != EMPTY_ID:
+            checks.append(Check(
+                offset, expected, _weight(weights, field),
+                slot, field, description, coded
+            ))
+
+    # Check the armors.
+    for armor in meta.armors:
+        base = _base(ARMOR_KIND, armor.slot)
+        if base is None:
+            continue
+        check(base, armor.stats.id, armor.slot, "stats",
+              _describe(armor.stats.id, armor.stats.name))
+        check(base + 1, armor.upgrade.id, armor.slot, "upgrade",
+              _describe(armor.upgrade.id, armor.upgrade.name))
+        check(base + 2, armor.infusion.id, armor.slot, "infusion",
+              _describe(armor.infusion.id, armor.infusion.name))
+
+    # Check the weapons, whose meta stats may only be known by name.
+    for weapon in meta.weapons:
+        base = _base(WEAPON_KIND, weapon.slot)
+        if base is None:
+            continue
+        if weapon.type != EMPTY_TYPE:
+            check(base, vocabulary.code(weapon.type, required=True),
+                  weapon.slot, "type", weapon.type, coded=True)
+        if weapon.stats.id != EMPTY_ID:
+            check(base + 1, weapon.stats.id, weapon.slot, "stats",
+                  _describe(weapon.stats.id, weapon.stats.name))
+        elif weapon.stats.name != EMPTY_NAME:
+            check(base + 2, vocabulary.code(weapon.stats.name, required=True),
+                  weapon.slot, "stats", weapon.stats.name, coded=True)
+        for j, upgrade in enumerate(weapon.upgrades[:2]):
+            check(base + 3 + j, upgrade.id, weapon.slot, f"upgrade {j + 1}",
+                  _describe(upgrade.id, upgrade.name))
+        for j, infusion in enumerate(weapon.infusions[:2]):
+            check(base + 5 + j, infusion.id, weapon.slot,
+                  f"infusion {j + 1}",
+                  _describe(infusion.id, infusion.name))
+
+    # Check the accessories and the relic.
+    for accessory in meta.accessories:
+        base = _base(ACCESSORY_KIND, accessory.slot)
+        if base is None:
+            continue
+        check(base, accessory.stats.id, accessory.slot, "stats",
+              _describe(accessory.stats.id, accessory.stats.name))
+        for j, infusion in enumerate(accessory.infusions[:3]):
+            check(base + 1 + j, infusion.id, accessory.slot,
+                  f"infusion {j + 1}",
+                  _describe(infusion.id, infusion.name))
+    check(_RELIC_OFFSET, meta.relic.id, "Relic", "relic",
+          _describe(meta.relic.id, meta.relic.name))
+
+    return ComparisonPlan(checks, EQUIPMENT_WIDTH, vocabulary)
+
+
+class MetaPlan(NamedTuple):
+    """Represent the compiled plans of a meta build and equipment."""
+    build: ComparisonPlan
+    equipment: ComparisonPlan
+
+
+def compile_meta(
+    meta: tuple[Build, Equipment],
+    weights: Mapping[str, float] = DEFAULT_WEIGHTS
+) -> MetaPlan:
+    """Compile the plans of a meta build and equipment."""
+    meta_build, meta_equipment = meta
+    return MetaPlan(
+        build=compile_build(meta_build, weights),
+        equipment=compile_equipment(meta_equipment, weights)
+    )
+
+
+def compile_profession(
+    metas: Iterable[tuple[str, tuple[Build, Equipment]]],
+    weights: Mapping[str, float] = DEFAULT_WEIGHTS
+) -> dict[str, MetaPlan]:
+    """Compile the plans of every meta build of a profession once."""
+    return {
+        build_name: compile_meta(meta, weights) for build_name, meta in metas
+    }
+
+
+def score_equipments(
+    equipments: Sequence[Equipment], plan: ComparisonPlan
+) -> numpy.ndarray:
+    """Score many equipments against a plan with one vector operation."""
+    import numpy as np
+    vectors = np.array(
+        [
+            vectorize_equipment(equipment, plan.vocabulary)
+            for equipment in equipments
+        ],
+        dtype=np.int64
+    ).reshape(len(equipments), EQUIPMENT_WIDTH)
+    return plan.score_many(vectors)
+
+
+def score_builds(
+    builds: Sequence[Build], plan: ComparisonPlan
+) -> numpy.ndarray:
+    """Score many builds against a plan with one vector operation."""
+    import numpy as np
+    vectors = np.array(
+        [vectorize_build(build) for build in builds], dtype=np.int64
+    ).reshape(len(builds), BUILD_WIDTH)
+    return plan.score_many(vectors)
+
+
+if __name__ == "__main__":
+    from api import Api
+    from snowcrows import Snowcrows
+    api = Api()
+    api.set_api_key("<API_KEY>")
+    snowcrows = Snowcrows()
+    plans = {}
+    for character in api.get_character_bundle().values():
+        if character.profession not in plans:
+            builds = snowcrows.get_builds(character.profession)
+            plans[character.profession] = compile_profession(
+                (build_name, snowcrows.get_build(build_name, builds))
+                for build_name in builds
+            )
+        for meta_name, meta_plan in plans[character.profession].items():
+            scores = score_equipments(
+                character.equipments, meta_plan.equipment
+            )
+            print(f"{character.name} - {meta_name}: {scores.min()}")
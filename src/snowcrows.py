@@ -1,7 +1,25 @@
-import requests
-import functools
-from bs4 import (
-    BeautifulSoup
+from __future__ import annotations
+import copy
+from typing import TYPE_CHECKING
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from urllib.parse import urlsplit, urlunsplit
+from transport import (
+    Transport
+)
+from deadline import (
+    check_deadline,
+    propagate
+)
+from extraction import (
+    extract_page
+)
+from cache import (
+    SHARED_SCOPE,
+    Cache,
+    CacheStats,
+    cached,
+    persist_types
 )
 from constants import (
     EMPTY_ID,
@@ -28,12 +46,53 @@ from equipment import (
     Equipment
 )
 
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+
+# Define the build sections of the website.
+CATEGORIES = (
+    "raids",
+    "fractals",
+    "strikes"
+)
+
+# Allow the cached build pages to be saved to cache files.
+persist_types(
+    Skill,
+    Trait,
+    Specialization,
+    Build,
+    Stats,
+    Upgrade,
+    Infusion,
+    Relic,
+    Armor,
+    Weapon,
+    Accessory,
+    Equipment
+)
+
+
+def _make_soup(content: bytes) -> BeautifulSoup:
+    """Parse HTML content, importing BeautifulSoup only when needed."""
+    from bs4 import BeautifulSoup
+    return BeautifulSoup(content, "html.parser")
+
+
+def _normalize_url(url: str) -> str:
+    """Normalize a URL so that links to the same page compare equal."""
+    parts = urlsplit(url)
+    return urlunsplit(
+        (parts.scheme, parts.netloc, parts.path.rstrip("/"), "", "")
+    )
+
 
 class Snowcrows:
     """Interact with snowcrows.com to get Guild Wars 2 build information."""
 
-    def __init__(self) -> None:
+    def __init__(self, transport: Transport | None = None) -> None:
         """Initialize an instance of the Snowcrows class."""
+        self._transport = transport or Transport()
         self._BASE_URL = "https://snowcrows.com"
         self._HEADERS = {
             "User-Agent": (
@@ -41,22 +100,38 @@ class Snowcrows:
                 "Gecko/20100101 Firefox/144.0"
             )
         }
-        self._clear_cache()
+        self._cache = Cache()
+        self._cache.configure(
+            "builds", maxsize=64, ttl=24 * 3600, scope=SHARED_SCOPE
+        )
+        self._cache.configure(
+            "pages", maxsize=256, ttl=24 * 3600, scope=SHARED_SCOPE
+        )
 
     def _clear_cache(self) -> None:
-        """Clear the cache for all decorated methods."""
-        self.get_builds.cache_clear()
-        self.get_build.cache_clear()
+        """Clear the namespaces of this instance, keeping shared pages."""
+        self._cache.clear()
+
+    def _clear_shared_cache(self) -> None:
+        """Clear the meta builds and pages shared by all instances."""
+        self._cache.clear_shared()
+
+    def _get_page(self, url: str) -> bytes:
+        """Request a website and return its raw content."""
+        check_deadline()
+        website = self._transport.get(url, self._HEADERS)
+        return website.content
 
     def _get_html_content(self, url: str) -> BeautifulSoup:
         """Request a website and parse it into a BeautifulSoup object."""
-        website = requests.get(url, headers=self._HEADERS)
-        return BeautifulSoup(website.content, "html.parser")
+        content = self._get_page(url)
+        check_deadline()
+        return _make_soup(content)
 
     def _parse_build(
         self, build_name: str, html_content: BeautifulSoup
     ) -> Build:
-        """Parse a build from HTML content."""
+        """Parse a build from HTML content as a reference for extraction."""
 
         # Initialize empty lists to store skills and specializations.
         skills = []
@@ -134,7 +209,7 @@ class Snowcrows:
     def _parse_equipment(
         self, equipment_name: str, html_content: BeautifulSoup
     ) -> Equipment:
-        """Parse an equipment from HTML content."""
+        """Parse an equipment from HTML content as an extraction reference."""
 
         # Initialize empty lists to store armors, weapons and accessories.
         armors = []
@@ -395,47 +470,151 @@ class Snowcrows:
         # Return the equipment.
         return equipment
 
-    @functools.lru_cache(maxsize=None)
-    def get_builds(self, profession_name: str) -> dict[str, str]:
+    def cache_stats(self) -> dict[str, CacheStats]:
+        """Get the statistics of all cache namespaces."""
+        return self._cache.stats()
+
+    def save_cache(self, path: str) -> None:
+        """Save the cache to a file for later runs."""
+        self._cache.save(path)
+
+    def load_cache(self, path: str) -> None:
+        """Load the cache from a file saved by an earlier run."""
+        self._cache.load(path)
+
+    @cached("builds")
+    def get_builds(
+        self, profession_name: str, category: str = "raids"
+    ) -> dict[str, str]:
         """Get a dict mapping build names to their URLs for a profession."""
 
         # Initialize an empty dict to store build names and their URLs.
         builds = {}
 
         # Assemble the URL and request the HTML content.
-        url = f"{self._BASE_URL}/builds/raids/{profession_name.lower()}"
+        url = (
+            f"{self._BASE_URL}/builds/{category}/{profession_name.lower()}"
+        )
         html_content = self._get_html_content(url)
 
-        # Extract build names and their URLs from the HTML content.
-        for anchor in html_content.select("a[href^='/builds/raids/']"):
+        # Extract build names and their URLs from the HTML content, which
+        # may link to a build page of another category.
+        for anchor in html_content.select("a[href^='/builds/']"):
             title_tag = anchor.find("h2", class_="block font-medium w-96")
             if not title_tag:
                 continue
             build_name = title_tag.get_text(strip=True)
-            build_url = f"{self._BASE_URL}{anchor['href']}"
+            build_url = _normalize_url(f"{self._BASE_URL}{anchor['href']}")
             builds[build_name] = build_url
 
         # Return the dict of builds.
         return builds
 
-    @functools.lru_cache(maxsize=None)
+    def get_category_builds(
+        self,
+        profession_name: str,
+        categories: tuple[str, ...] = CATEGORIES,
+        max_workers: int = 4
+    ) -> dict[str, dict[str, str]]:
+        """Get the builds of a profession for each category concurrently."""
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            indexes = executor.map(
+                propagate(
+                    lambda category: self.get_builds(profession_name, category)
+                ),
+                categories
+            )
+            return dict(zip(categories, indexes))
+
+    @cached("pages")
+    def _get_build_page(self, build_url: str) -> tuple[Build, Equipment]:
+        """Get the shared build and equipment of a build page by its URL."""
+
+        # Request the raw page content.
+        content = self._get_page(build_url)
+        check_deadline()
+
+        # Extract the build and equipment from the page in a single pass.
+        build, equipment_record = extract_page(build_url, content)
+        equipment = Equipment.from_record(equipment_record)
+
+        # Return the tuple containing a build and an equipment.
+        return build, equipment
+
+    @staticmethod
+    def _copy_page(
+        page: tuple[Build, Equipment], build_name: str
+    ) -> tuple[Build, Equipment]:
+        """Copy a shared page under a build name, keeping the cache intact."""
+        build, equipment = copy.deepcopy(page)
+        return (
+            replace(build, name=build_name),
+            replace(equipment, name=build_name)
+        )
+
     def get_build(
         self, build_name: str, builds: dict[str, str]
     ) -> tuple[Build, Equipment]:
         """Get detailed information for a specific build name."""
 
-        # Look up the URL for the provided build name.
-        build_url = builds[build_name]
+        # Look up the page of the build, which is shared by all its names.
+        page = self._get_build_page(builds[build_name])
+
+        # Return the tuple containing a build and an equipment.
+        return self._copy_page(page, build_name)
+
+    def crawl(
+        self,
+        profession_name: str,
+        categories: tuple[str, ...] = CATEGORIES,
+        max_workers: int = 8
+    ) -> dict[str, dict[str, tuple[Build, Equipment]]]:
+        """Get the meta builds of a profession across categories."""
+
+        # Request the index pages of all categories concurrently.
+        indexes = self.get_category_builds(
+            profession_name, categories, max_workers
+        )
+
+        # Request each distinct build page once, however often it is listed.
+        build_urls = list(dict.fromkeys(
+            build_url
+            for builds in indexes.values()
+            for build_url in builds.values()
+        ))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pages = dict(zip(
+                build_urls,
+                executor.map(propagate(self._get_build_page), build_urls)
+            ))
+
+        # Copy the shared pages into the builds of every category.
+        return {
+            category: {
+                build_name: self._copy_page(pages[build_url], build_name)
+                for build_name, build_url in builds.items()
+            }
+            for category, builds in indexes.items()
+        }
+
+    def validate_extraction(
+        self, build_url: str, content: bytes | None = None
+    ) -> bool:
+        """Check that extraction matches the BeautifulSoup parsers."""
 
-        # Request the HTML content.
-        html_content = self._get_html_content(build_url)
+        # Request the raw page content unless a recorded page is given.
+        if content is None:
+            content = self._get_page(build_url)
 
-        # Parse the build and equipment from the HTML content.
-        build = self._parse_build(build_name, html_content)
-        equipment = self._parse_equipment(build_name, html_content)
+        # Parse the page with both the extraction and the reference parsers.
+        build, equipment_record = extract_page(build_url, content)
+        equipment = Equipment.from_record(equipment_record)
+        html_content = _make_soup(content)
+        reference_build = self._parse_build(build_url, html_content)
+        reference_equipment = self._parse_equipment(build_url, html_content)
 
-        # Return the tuple containing a build and an equipment.
-        return build, equipment
+        # Return whether both parsers agree.
+        return build == reference_build and equipment == reference_equipment
 
 
 if __name__ == "__main__":
@@ -0,0 +1,64 @@
+import json
+import time
+import threading
+from errors import (
+    TransientError
+)
+from deadline import (
+    check_deadline,
+    request_timeout
+)
+from dataclasses import dataclass
+
+
+@dataclass
+class Response:
+    """Represent an HTTP response with its timing."""
+    url: str
+    status_code: int
+    headers: dict[str, str]
+    content: bytes
+    elapsed: float
+
+    def json(self):
+        """Decode the content as JSON."""
+        return json.loads(self.content)
+
+
+class Transport:
+    """Perform HTTP GET requests over the network."""
+
+    def __init__(self) -> None:
+        """Initialize an instance of the Transport class."""
+        self._local = threading.local()
+
+    def _session(self):
+        """Get the session of the current thread, creating it if missing."""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            # Import requests only once a request is actually made.
+            import requests
+            session = requests.Session()
+            self._local.session = session
+        return session
+
+    def get(self, url: str, headers: dict[str, str]) -> Response:
+        """Perform a GET request and return the response."""
+        check_deadline()
+        start = time.perf_counter()
+        try:
+            response = self._session().get(
+                url, headers=headers, timeout=request_timeout()
+            )
+        except OSError as error:
+            # Report a timeout caused by the deadline as such.
+            check_deadline()
+            # Treat connection failures and timeouts as transient.
+            raise TransientError(str(error)) from error
+        return Response(
+            url=url,
+            status_code=response.status_code,
+            headers=dict(response.headers),
+            content=response.content,
+            elapsed=time.perf_counter() - start
+        )
@@ -0,0 +1,343 @@
+import queue
+import tkinter as tk
+from tkinter import ttk
+from concurrent.futures import ThreadPoolExecutor
+from deadline import (
+    Deadline,
+    deadline
+)
+from api import (
+    Api
+)
+from snowcrows import (
+    Snowcrows
+)
+from character import (
+    Character
+)
+from compare import (
+    SlotDiff,
+    compare_build,
+    compare_equipment
+)
+
+# Define the interval in milliseconds to poll for finished tasks.
+_POLL_INTERVAL = 50
+
+# Define the channels that tasks are grouped into for cancellation.
+ACCOUNT_CHANNEL = "account"
+CHARACTER_CHANNEL = "character"
+META_CHANNEL = "meta"
+DIFF_CHANNEL = "diff"
+
+
+class BackgroundWorker:
+    """Run tasks on worker threads and deliver results on the UI thread."""
+
+    def __init__(self, root: tk.Misc, max_workers: int = 8) -> None:
+        """Initialize an instance of the BackgroundWorker class."""
+        self._root = root
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._results = queue.SimpleQueue()
+        self._generations = {}
+        self._futures = {}
+        self._deadlines = {}
+        self._root.after(_POLL_INTERVAL, self._poll)
+
+    @staticmethod
+    def _run(bound: Deadline, task, *args):
+        """Run a task under the deadline of its channel."""
+        with deadline(bound=bound):
+            return task(*args)
+
+    def submit(self, channel: str, task, *args, on_done, on_error=None):
+        """Run a task in the background and pass its result to a callback."""
+        generation = self._generations.get(channel, 0)
+        bound = self._deadlines.setdefault(channel, Deadline())
+        future = self._executor.submit(self._run, bound, task, *args)
+        self._futures.setdefault(channel, set()).add(future)
+        future.add_done_callback(
+            lambda future: self._results.put(
+                (channel, generation, future, on_done, on_error)
+            )
+        )
+        return future
+
+    def cancel(self, *channels: str) -> None:
+        """Cancel pending tasks and drop the results of running ones."""
+        for channel in channels:
+            self._generations[channel] = self._generations.get(channel, 0) + 1
+            # Stop running tasks at their next deadline check.
+            bound = self._deadlines.pop(channel, None)
+            if bound is not None:
+                bound.cancel()
+            for future in self._futures.pop(channel, set()):
+                future.cancel()
+
+    def shutdown(self) -> None:
+        """Cancel all tasks and stop the worker threads."""
+        self.cancel(*list(self._futures))
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _poll(self) -> None:
+        """Deliver the results of finished tasks on the UI thread."""
+        while True:
+            try:
+                channel, generation, future, on_done, on_error = (
+                    self._results.get_nowait()
+                )
+            except queue.Empty:
+                break
+            self._futures.get(channel, set()).discard(future)
+            if future.cancelled():
+                continue
+            if generation != self._generations.get(channel, 0):
+                # Drop results that were superseded by a newer request.
+                continue
+            error = future.exception()
+            if error is None:
+                on_done(future.result())
+            elif on_error is not None:
+                on_error(error)
+        self._root.after(_POLL_INTERVAL, self._poll)
+
+
+class App:
+    """Show characters, templates and their differences to meta builds."""
+
+    def __init__(
+        self,
+        api: Api | None = None,
+        snowcrows: Snowcrows | None = None
+    ) -> None:
+        """Initialize an instance of the App class."""
+        self._api = api or Api()
+        self._snowcrows = snowcrows or Snowcrows()
+        self._account_api = None
+        self._characters = {}
+        self._character = None
+        self._meta_builds = {}
+        self._meta = None
+
+        # Create the window and the background worker.
+        self._root = tk.Tk()
+        self._root.title("GW2 Meta Build Checker")
+        self._root.protocol("WM_DELETE_WINDOW", self._close)
+        self._worker = BackgroundWorker(self._root)
+
+        # Create the API key entry and the status line.
+        top = ttk.Frame(self._root, padding=4)
+        top.pack(fill=tk.X)
+        ttk.Label(top, text="API key:").pack(side=tk.LEFT)
+        self._key_entry = ttk.Entry(top, width=80, show="*")
+        self._key_entry.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        ttk.Button(top, text="Load", command=self._load).pack(side=tk.LEFT)
+        self._status = ttk.Label(self._root, padding=4)
+        self._status.pack(fill=tk.X)
+
+        # Create the lists of characters, templates and meta builds.
+        lists = ttk.Frame(self._root, padding=4)
+        lists.pack(fill=tk.BOTH, expand=True)
+        self._character_list = self._create_list(lists, "Characters")
+        self._template_list = self._create_list(lists, "Templates")
+        self._meta_list = self._create_list(lists, "Meta builds")
+        self._character_list.bind("<<ListboxSelect>>", self._select_character)
+        self._template_list.bind("<<ListboxSelect>>", self._render_diffs)
+        self._meta_list.bind("<<ListboxSelect>>", self._select_meta)
+
+        # Create the table of differences.
+        columns = ("slot", "field", "actual", "expected")
+        self._diff_table = ttk.Treeview(
+            self._root, columns=columns, show="headings", height=12
+        )
+        for column in columns:
+            self._diff_table.heading(column, text=column.capitalize())
+        self._diff_table.pack(fill=tk.BOTH, expand=True, padx=4, pady=4)
+
+    @staticmethod
+    def _create_list(parent: tk.Misc, title: str) -> tk.Listbox:
+        """Create a titled listbox next to the previous ones."""
+        frame = ttk.LabelFrame(parent, text=title, padding=2)
+        frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        listbox = tk.Listbox(frame, exportselection=False)
+        listbox.pack(fill=tk.BOTH, expand=True)
+        return listbox
+
+    @staticmethod
+    def _selection(listbox: tk.Listbox) -> int | None:
+        """Get the index of the selected entry of a listbox."""
+        selection = listbox.curselection()
+        return selection[0] if selection else None
+
+    def _set_status(self, text: str) -> None:
+        """Show a message in the status line."""
+        self._status.configure(text=text)
+
+    def _show_error(self, error: BaseException) -> None:
+        """Show an error from a background task."""
+        self._set_status(f"Error: {error}")
+
+    def _load(self) -> None:
+        """Load the characters of the entered API key."""
+        self._worker.cancel(
+            ACCOUNT_CHANNEL, CHARACTER_CHANNEL, META_CHANNEL, DIFF_CHANNEL
+        )
+        self._account_api = self._api.for_key(self._key_entry.get().strip())
+        self._characters = {}
+        self._character = None
+        self._character_list.delete(0, tk.END)
+        self._template_list.delete(0, tk.END)
+        self._meta_list.delete(0, tk.END)
+        self._diff_table.delete(*self._diff_table.get_children())
+        self._set_status("Loading characters...")
+        self._worker.submit(
+            ACCOUNT_CHANNEL,
+            self._account_api.get_character_names,
+            on_done=self._show_character_names,
+            on_error=self._show_error
+        )
+
+    def _show_character_names(self, character_names: list[str]) -> None:
+        """Show placeholders and load the whole roster in the background."""
+        for character_name in character_names:
+            self._characters[character_name] = None
+            self._character_list.insert(tk.END, f"{character_name} (...)")
+        self._worker.submit(
+            ACCOUNT_CHANNEL,
+            self._account_api.get_character_bundle,
+            character_names,
+            on_done=self._show_character,
+            on_error=self._show_error
+        )
+        self._set_status(f"Loading {len(character_names)} characters...")
+
+    def _show_character(self, bundle: dict[str, Character]) -> None:
+        """Replace the placeholders of the characters that arrived."""
+        for character_name, character in bundle.items():
+            self._characters[character_name] = character
+            index = list(self._characters).index(character_name)
+            self._character_list.delete(index)
+            self._character_list.insert(
+                index, f"{character_name} ({character.profession})"
+            )
+            if self._character == character_name:
+                self._show_templates(character)
+        pending = sum(
+            character is None for character in self._characters.values()
+        )
+        self._set_status(
+            f"Loading {pending} characters..." if pending else "Ready."
+        )
+
+    def _select_character(self, event=None) -> None:
+        """Show the templates and meta builds of the selected character."""
+        index = self._selection(self._character_list)
+        if index is None:
+            return
+        self._worker.cancel(CHARACTER_CHANNEL, META_CHANNEL, DIFF_CHANNEL)
+        self._character = list(self._characters)[index]
+        self._meta = None
+        self._template_list.delete(0, tk.END)
+        self._meta_list.delete(0, tk.END)
+        self._diff_table.delete(*self._diff_table.get_children())
+        character = self._characters[self._character]
+        if character is not None:
+            self._show_templates(character)
+
+    def _show_templates(self, character: Character) -> None:
+        """Show the templates of a character and load its meta builds."""
+        self._template_list.delete(0, tk.END)
+        for build in character.builds:
+            self._template_list.insert(tk.END, f"Build: {build.name}")
+        for equipment in character.equipments:
+            self._template_list.insert(tk.END, f"Equipment: {equipment.name}")
+        self._set_status(f"Loading {character.profession} meta builds...")
+        self._worker.submit(
+            CHARACTER_CHANNEL,
+            self._snowcrows.get_builds,
+            character.profession,
+            on_done=self._show_meta_builds,
+            on_error=self._show_error
+        )
+
+    def _show_meta_builds(self, meta_builds: dict[str, str]) -> None:
+        """Show the meta builds of the selected character's profession."""
+        self._meta_builds = meta_builds
+        self._meta_list.delete(0, tk.END)
+        for build_name in meta_builds:
+            self._meta_list.insert(tk.END, build_name)
+        self._set_status("Ready.")
+
+    def _select_meta(self, event=None) -> None:
+        """Load the selected meta build in the background."""
+        index = self._selection(self._meta_list)
+        if index is None:
+            return
+        self._worker.cancel(META_CHANNEL, DIFF_CHANNEL)
+        self._meta = None
+        self._diff_table.delete(*self._diff_table.get_children())
+        build_name = list(self._meta_builds)[index]
+        self._set_status(f"Loading {build_name}...")
+        self._worker.submit(
+            META_CHANNEL,
+            self._snowcrows.get_build,
+            build_name,
+            self._meta_builds,
+            on_done=self._show_meta,
+            on_error=self._show_error
+        )
+
+    def _show_meta(self, meta) -> None:
+        """Keep the loaded meta build and compare the selected template."""
+        self._meta = meta
+        self._set_status("Ready.")
+        self._render_diffs()
+
+    def _render_diffs(self, event=None) -> None:
+        """Compare the selected template to the meta build in a worker."""
+        index = self._selection(self._template_list)
+        character = self._characters.get(self._character)
+        if index is None or character is None or self._meta is None:
+            return
+        meta_build, meta_equipment = self._meta
+        if index < len(character.builds):
+            task = compare_build
+            args = (character.builds[index], meta_build)
+        else:
+            task = compare_equipment
+            args = (
+                character.equipments[index - len(character.builds)],
+                meta_equipment
+            )
+        self._worker.cancel(DIFF_CHANNEL)
+        self._worker.submit(
+            DIFF_CHANNEL,
+            task,
+            *args,
+            on_done=self._show_diffs,
+            on_error=self._show_error
+        )
+
+    def _show_diffs(self, diffs: list[SlotDiff]) -> None:
+        """Show the differences between a template and the meta build."""
+        self._diff_table.delete(*self._diff_table.get_children())
+        for diff in diffs:
+            self._diff_table.insert(
+                "", tk.END,
+                values=(diff.slot, diff.field, diff.actual, diff.expected)
+            )
+        if not diffs:
+            self._set_status("The template matches the meta build.")
+
+    def _close(self) -> None:
+        """Stop the background worker and close the window."""
+        self._worker.shutdown()
+        self._root.destroy()
+
+    def run(self) -> None:
+        """Run the main loop of the window."""
+        self._root.mainloop()
+
+
+if __name__ == "__main__":
+    App().run()
@@ -0,0 +1,20 @@
+from dataclasses import dataclass
+
+# Define the statuses an API key can be triaged into.
+KEY_OK = "ok"
+KEY_INVALID = "invalid"
+KEY_MISSING_PERMISSIONS = "missing_permissions"
+KEY_ERROR = "error"
+
+
+@dataclass
+class KeyVerdict:
+    """Represent the result of validating an API key."""
+    status: str
+    permissions: list[str]
+    missing: list[str]
+
+    @property
+    def usable(self) -> bool:
+        """Check whether the key can be used to check an account."""
+        return self.status == KEY_OK
@@ -0,0 +1,229 @@
+import time
+import heapq
+import hashlib
+import threading
+from dataclasses import dataclass, field
+from collections.abc import Callable
+from urllib.parse import quote
+from api import (
+    Api
+)
+from character import (
+    Character
+)
+
+# Define the bounds in seconds of the polling interval of a character.
+MIN_INTERVAL = 60.0
+MAX_INTERVAL = 3600.0
+
+# Define the factor the interval grows by after a poll without changes.
+BACKOFF_FACTOR = 1.5
+
+# Define the response headers that validate a conditional request.
+_VALIDATORS = ("etag", "last-modified")
+
+
+@dataclass
+class WatchStats:
+    """Represent the requests and changes of a watcher."""
+    polls: int = 0
+    requests: int = 0
+    not_modified: int = 0
+    probes: int = 0
+    changes: int = 0
+    errors: int = 0
+    bytes: int = 0
+
+
+@dataclass
+class _WatchState:
+    """Represent what a watcher knows about a character."""
+    name: str
+    interval: float
+    profession: str = ""
+    probe: str | None = None
+    validators: dict[str, dict[str, str]] = field(default_factory=dict)
+    digests: dict[str, bytes] = field(default_factory=dict)
+    data: dict[str, object] = field(default_factory=dict)
+
+
+class Watcher:
+    """Poll characters for template changes with as little traffic as can."""
+
+    def __init__(
+        self,
+        api: Api,
+        on_change: Callable[[Character], None],
+        min_interval: float = MIN_INTERVAL,
+        max_interval: float = MAX_INTERVAL,
+        clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        """Initialize an instance of the Watcher class."""
+        self._api = api
+        self._on_change = on_change
+        self._min_interval = min_interval
+        self._max_interval = max_interval
+        self._clock = clock
+        self._states = {}
+        self._schedule = []
+        self._stopped = threading.Event()
+        self.stats = WatchStats()
+
+    def watch(self, *names: str) -> None:
+        """Start watching characters, polling them as soon as possible."""
+        now = self._clock()
+        for name in names:
+            if name not in self._states:
+                self._states[name] = _WatchState(
+                    name=name, interval=self._min_interval
+                )
+                heapq.heappush(self._schedule, (now, name))
+
+    def interval(self, name: str) -> float:
+        """Get the current polling interval of a character."""
+        return self._states[name].interval
+
+    def _get(self, state: _WatchState, endpoint: str) -> bool:
+        """Fetch an endpoint unless unchanged, returning whether it changed."""
+        validators = state.validators.get(endpoint, {})
+        response = self._api.get_if_modified(endpoint, validators)
+        self.stats.requests += 1
+        if response is None:
+            self.stats.not_modified += 1
+            return False
+        self.stats.bytes += len(response.content)
+        headers = {
+            key.lower(): value for key, value in response.headers.items()
+        }
+        state.validators[endpoint] = {
+            key: headers[key] for key in _VALIDATORS if key in headers
+        }
+
+        # Compare the payload, since a new validator may carry old data.
+        digest = hashlib.blake2b(response.content, digest_size=16).digest()
+        if state.digests.get(endpoint) == digest:
+            return False
+        state.digests[endpoint] = digest
+        state.data[endpoint] = response.json()
+        return True
+
+    def _probe(self, state: _WatchState, character: str) -> bool:
+        """Probe the core data of a character, returning whether it changed."""
+        response = self._api.get_if_modified(
+            f"characters/{character}/core", {}
+        )
+        self.stats.requests += 1
+        self.stats.probes += 1
+        self.stats.bytes += len(response.content)
+        core = response.json()
+        state.profession = core.get("profession", state.profession)
+        probe = core.get("last_modified") or hashlib.blake2b(
+            response.content, digest_size=16
+        ).hexdigest()
+        if probe == state.probe:
+            return False
+        state.probe = probe
+        return True
+
+    def poll(self, name: str) -> bool:
+        """Poll a character once, reporting its templates if they changed."""
+        state = self._states[name]
+        character = quote(name, safe="")
+        endpoints = (
+            f"characters/{character}/buildtabs?tabs=all",
+            f"characters/{character}/equipmenttabs?tabs=all"
+        )
+        self.stats.polls += 1
+
+        # Probe first unless the API validates conditional requests.
+        conditional = all(
+            state.validators.get(endpoint) for endpoint in endpoints
+        )
+        if not state.profession:
+            self._probe(state, character)
+        elif not conditional and not self._probe(state, character):
+            self._backoff(state, changed=False)
+            return False
+
+        # Fetch the templates, each only if it changed.
+        changed = [self._get(state, endpoint) for endpoint in endpoints]
+        self._backoff(state, changed=any(changed))
+        if not any(changed):
+            return False
+
+        # Parse and report the templates only after a real change.
+        self.stats.changes += 1
+        self._on_change(Character(
+            name=name,
+            profession=state.profession,
+            builds=self._api.parse_build_templates(
+                state.data[endpoints[0]]
+            ),
+            equipments=self._api.parse_equipment_templates(
+                state.data[endpoints[1]]
+            )
+        ))
+        return True
+
+    def _backoff(self, state: _WatchState, changed: bool) -> None:
+        """Poll a character sooner after a change and later otherwise."""
+        if changed:
+            state.interval = self._min_interval
+        else:
+            state.interval = min(
+                self._max_interval, state.interval * BACKOFF_FACTOR
+            )
+
+    def run_once(self) -> list[str]:
+        """Poll every character that is due and reschedule it."""
+        changed = []
+        now = self._clock()
+        while self._schedule and self._schedule[0][0] <= now:
+            _, name = heapq.heappop(self._schedule)
+            try:
+                if self.poll(name):
+                    changed.append(name)
+            except Exception:
+                # Retry a failed poll later, like one without changes, so
+                # that one character cannot stop the others being watched.
+                self.stats.errors += 1
+                self._backoff(self._states[name], changed=False)
+            finally:
+                heapq.heappush(
+                    self._schedule, (now + self._states[name].interval, name)
+                )
+        return changed
+
+    def stop(self) -> None:
+        """Stop a running watcher."""
+        self._stopped.set()
+
+    def run(self) -> None:
+        """Poll characters as they become due until stopped."""
+        while not self._stopped.is_set():
+            self.run_once()
+            if self._schedule:
+                delay = max(0.0, self._schedule[0][0] - self._clock())
+            else:
+                delay = self._min_interval
+            self._stopped.wait(delay)
+
+
+if __name__ == "__main__":
+    from compare import compare_equipment
+    from snowcrows import Snowcrows
+    api = Api()
+    api.set_api_key("<API_KEY>")
+    snowcrows = Snowcrows()
+
+    def report(character: Character) -> None:
+        """Compare a changed character to the first meta build."""
+        builds = snowcrows.get_builds(character.profession)
+        _, meta = snowcrows.get_build(next(iter(builds)), builds)
+        for equipment in character.equipments:
+            diffs = compare_equipment(equipment, meta)
+            print(f"{character.name} - {equipment.name}: {len(diffs)} diffs")
+
+    watcher = Watcher(api, report)
+    watcher.watch(*api.get_character_names())
+    watcher.run()
@@ -0,0 +1,20 @@
+import os
+import sys
+
+# Import the modules of the flat source directory by their bare names.
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+# Define the default peak memory budget of a full-account load in MiB.
+DEFAULT_MEMORY_BUDGET = 32.0
+
+
+def pytest_addoption(parser):
+    """Add the options of the benchmark tests."""
+    parser.addoption(
+        "--memory-budget",
+        type=float,
+        default=float(
+            os.environ.get("MEMORY_BUDGET_MIB", DEFAULT_MEMORY_BUDGET)
+        ),
+        help="Peak memory budget of a full-account load in MiB."
+    )
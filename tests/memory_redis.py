@@ -0,0 +1,191 @@
+import threading
+
+
+class _MemoryWatchError(Exception):
+    """Raise when a watched key changed before a transaction executed."""
+
+
+class _MemoryPipeline:
+    """Queue the commands of a MemoryRedis transaction like redis-py."""
+
+    def __init__(self, client: "MemoryRedis") -> None:
+        """Initialize an instance of the _MemoryPipeline class."""
+        self._client = client
+        self._watched = {}
+        self._commands = None
+
+    def watch(self, *keys: str) -> None:
+        """Watch keys, running the following commands immediately."""
+        with self._client._lock:
+            for key in keys:
+                self._watched[key] = self._client._versions.get(key, 0)
+
+    def multi(self) -> None:
+        """Start queueing commands until the pipeline executes."""
+        self._commands = []
+
+    def execute(self) -> list:
+        """Run the queued commands atomically unless a watched key changed."""
+        client = self._client
+        with client._lock:
+            if any(
+                client._versions.get(key, 0) != version
+                for key, version in self._watched.items()
+            ):
+                raise _MemoryWatchError("Watched key changed")
+            results = [
+                getattr(client, name)(*args, **kwargs)
+                for name, args, kwargs in self._commands or []
+            ]
+        self._watched = {}
+        self._commands = None
+        return results
+
+    def __getattr__(self, name: str):
+        """Run a command now, or queue it inside a transaction."""
+        command = getattr(self._client, name)
+        if self._commands is None:
+            return command
+
+        def queue(*args, **kwargs) -> "_MemoryPipeline":
+            """Queue the command for execution."""
+            self._commands.append((name, args, kwargs))
+            return self
+
+        return queue
+
+
+class MemoryRedis:
+    """Serve the Redis commands of the job queue from process memory."""
+
+    def __init__(self) -> None:
+        """Initialize an instance of the MemoryRedis class."""
+        self._lock = threading.RLock()
+        self._data = {}
+        self._versions = {}
+
+    def _write(self, key: str, kind: type):
+        """Get the value of a key for writing, creating it if missing."""
+        self._versions[key] = self._versions.get(key, 0) + 1
+        return self._data.setdefault(key, kind())
+
+    def _read(self, key: str, kind: type):
+        """Get the value of a key for reading."""
+        return self._data.get(key) or kind()
+
+    def pipeline(self, transaction: bool = True) -> _MemoryPipeline:
+        """Create a pipeline whose commands run as one transaction."""
+        pipeline = _MemoryPipeline(self)
+        pipeline.multi()
+        return pipeline
+
+    def transaction(
+        self, func, *watches: str, value_from_callable: bool = False
+    ):
+        """Run a function in a watched transaction until it succeeds."""
+        while True:
+            pipeline = _MemoryPipeline(self)
+            pipeline.watch(*watches)
+            try:
+                value = func(pipeline)
+                results = pipeline.execute()
+            except _MemoryWatchError:
+                continue
+            return value if value_from_callable else results
+
+    def exists(self, *keys: str) -> int:
+        """Count the keys that exist."""
+        with self._lock:
+            return sum(bool(self._data.get(key)) for key in keys)
+
+    def hset(self, key: str, field=None, value=None, mapping=None) -> int:
+        """Set fields of a hash, returning the number of new fields."""
+        with self._lock:
+            values = dict(mapping or {})
+            if field is not None:
+                values[field] = value
+            hash_ = self._write(key, dict)
+            added = sum(name not in hash_ for name in values)
+            hash_.update({name: str(item) for name, item in values.items()})
+            return added
+
+    def hsetnx(self, key: str, field: str, value) -> int:
+        """Set a field of a hash unless it exists."""
+        with self._lock:
+            if field in self._read(key, dict):
+                return 0
+            self._write(key, dict)[field] = str(value)
+            return 1
+
+    def hget(self, key: str, field: str) -> str | None:
+        """Get a field of a hash."""
+        with self._lock:
+            return self._read(key, dict).get(field)
+
+    def hmget(self, key: str, *fields: str) -> list[str | None]:
+        """Get fields of a hash."""
+        with self._lock:
+            hash_ = self._read(key, dict)
+            return [hash_.get(field) for field in fields]
+
+    def lpush(self, key: str, *values) -> int:
+        """Push values to the head of a list."""
+        with self._lock:
+            list_ = self._write(key, list)
+            for value in values:
+                list_.insert(0, str(value))
+            return len(list_)
+
+    def rpop(self, key: str) -> str | None:
+        """Pop the value at the tail of a list."""
+        with self._lock:
+            if not self._read(key, list):
+                return None
+            return self._write(key, list).pop()
+
+    def lindex(self, key: str, index: int) -> str | None:
+        """Get the value at an index of a list."""
+        with self._lock:
+            list_ = self._read(key, list)
+            return list_[index] if -len(list_) <= index < len(list_) else None
+
+    def zadd(self, key: str, mapping: dict, xx: bool = False) -> int:
+        """Set the scores of members of a sorted set."""
+        with self._lock:
+            zset = self._read(key, dict)
+            values = {
+                member: float(score) for member, score in mapping.items()
+                if not xx or member in zset
+            }
+            if not values:
+                return 0
+            zset = self._write(key, dict)
+            added = sum(member not in zset for member in values)
+            zset.update(values)
+            return added
+
+    def zrem(self, key: str, *members: str) -> int:
+        """Remove members of a sorted set."""
+        with self._lock:
+            if not any(member in self._read(key, dict) for member in members):
+                return 0
+            zset = self._write(key, dict)
+            return sum(
+                zset.pop(member, None) is not None for member in members
+            )
+
+    def zscore(self, key: str, member: str) -> float | None:
+        """Get the score of a member of a sorted set."""
+        with self._lock:
+            return self._read(key, dict).get(member)
+
+    def zrangebyscore(self, key: str, low: float, high: float) -> list[str]:
+        """Get the members of a sorted set within a range of scores."""
+        with self._lock:
+            return [
+                member
+                for member, score in sorted(
+                    self._read(key, dict).items(), key=lambda item: item[1]
+                )
+                if low <= score <= high
+            ]
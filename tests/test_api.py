@@ -0,0 +1,153 @@
+import json
+import pytest
+from urllib.parse import urlsplit
+from api import (
+    Api
+)
+from equipment import (
+    Stats
+)
+from errors import (
+    InvalidIdError
+)
+from verdict import (
+    KEY_OK,
+    KEY_INVALID,
+    KEY_MISSING_PERMISSIONS
+)
+from transport import (
+    Response,
+    Transport
+)
+from fixtures import (
+    SyntheticAccount,
+    SyntheticTransport
+)
+
+
+class _ItemTransport(Transport):
+    """Serve the items endpoint, leaving out some item IDs."""
+
+    def __init__(self, absent: set[int]) -> None:
+        """Initialize an instance of the _ItemTransport class."""
+        super().__init__()
+        self._absent = absent
+        self.request_count = 0
+
+    def get(self, url: str, headers: dict[str, str]) -> Response:
+        """Serve the items that exist among the requested IDs."""
+        self.request_count += 1
+        parts = urlsplit(url)
+        if parts.query:
+            ids = parts.query.removeprefix("ids=").split(",")
+        else:
+            ids = [parts.path.rsplit("/", 1)[1]]
+        data = [
+            {"id": int(item_id), "name": f"Item {item_id}", "type": "Trophy"}
+            for item_id in ids
+            if int(item_id) not in self._absent
+        ]
+        status_code = 200
+        if not data:
+            status_code, data = 404, {"text": "all ids provided are invalid"}
+        elif not parts.query:
+            data = data[0]
+        return Response(
+            url=url,
+            status_code=status_code,
+            headers={},
+            content=json.dumps(data).encode(),
+            elapsed=0.0
+        )
+
+
+@pytest.fixture
+def item_api():
+    """Create an Api of an items endpoint without item 2, with no items."""
+    api = Api(_ItemTransport(absent={2}), api_key="key")
+    api._clear_shared_cache()
+    yield api
+    api._clear_shared_cache()
+
+
+def _api(account: SyntheticAccount) -> Api:
+    """Create an Api that serves a synthetic account."""
+    return Api(SyntheticTransport({"key": account}), api_key="key")
+
+
+def test_duplicate_templates_do_not_share_components():
+    """Keep deduplicated equipment templates independent of each other."""
+    account = SyntheticAccount(characters=1, equipment_tabs=1)
+    equipmenttab = next(iter(account.characters.values()))["equipment_tabs"][0]
+    copy = {**equipmenttab, "tab": 2, "name": "Copy"}
+    first, second = _api(account).parse_equipment_templates(
+        [equipmenttab, copy]
+    )
+    assert first.armors == second.armors
+    assert first.name != second.name
+    second.armors[0].stats = Stats(id=1, name="Changed")
+    second.weapons.pop()
+    assert first.armors[0].stats != second.armors[0].stats
+    assert len(first.weapons) == len(second.weapons) + 1
+
+
+def test_bulk_templates_match_single_requests():
+    """Parse the templates of many characters like one at a time."""
+    account = SyntheticAccount(characters=3, equipment_tabs=2)
+    api = _api(account)
+    names = list(account.characters)
+    bulk = api.get_equipment_templates_bulk(names)
+    assert bulk == {name: api.get_equipment_templates(name) for name in names}
+
+
+def test_get_items_remembers_missing_ids(item_api):
+    """Skip item IDs the API left out until the negative cache expires."""
+    item_api.get_items([1, 2, 3])
+    assert item_api._transport.request_count == 1
+    item_api.get_items([1, 2, 3])
+    assert item_api._transport.request_count == 1
+    assert item_api.get_item_name(3) == "Item 3"
+    with pytest.raises(InvalidIdError):
+        item_api.get_item_name(2)
+    assert item_api._transport.request_count == 1
+
+
+def test_evicted_items_are_not_missing(item_api):
+    """Fetch an evicted item again instead of treating it as missing."""
+    maxsize = item_api._items.maxsize
+    item_api._items.maxsize = 2
+    try:
+        item_api.get_items([1, 3, 4, 5])
+    finally:
+        item_api._items.maxsize = maxsize
+    assert 1 not in item_api._items
+    assert item_api.get_item_name(1) == "Item 1"
+    assert item_api._transport.request_count == 2
+
+
+def test_validate_keys():
+    """Tell valid, underprivileged and invalid keys apart, sharing verdicts."""
+    transport = SyntheticTransport({
+        "valid": SyntheticAccount(characters=1),
+        "limited": SyntheticAccount(
+            characters=1, permissions=("account", "characters")
+        )
+    })
+    api = Api(transport)
+    api._clear_shared_cache()
+    verdicts = api.validate_keys(["valid", "limited", "unknown"])
+    assert verdicts["valid"].status == KEY_OK
+    assert verdicts["valid"].usable
+    assert verdicts["limited"].status == KEY_MISSING_PERMISSIONS
+    assert verdicts["limited"].missing == ["builds", "inventories"]
+    assert verdicts["unknown"].status == KEY_INVALID
+    assert not verdicts["unknown"].usable
+    assert transport.request_count == 3
+
+    # Answer other instances from the shared verdicts without requests.
+    assert Api(transport).validate_keys(["valid", "unknown"]) == {
+        "valid": verdicts["valid"],
+        "unknown": verdicts["unknown"]
+    }
+    assert transport.request_count == 3
+    api._clear_shared_cache()
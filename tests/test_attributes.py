@@ -0,0 +1,49 @@
+from api import (
+    Api
+)
+from errors import (
+    InvalidIdError
+)
+from attributes import (
+    AttributeCalculator,
+    StatsTable
+)
+from fixtures import (
+    SyntheticAccount,
+    SyntheticTransport
+)
+
+# Define a stats ID that the synthetic API does not know.
+_UNKNOWN_STATS_ID = 10**6
+
+
+def test_unknown_stats_are_unresolved():
+    """Build a table without the stats the API does not know."""
+    account = SyntheticAccount(characters=2, equipment_tabs=2)
+    api = Api(SyntheticTransport({"key": account}), api_key="key")
+    equipments = [
+        equipment
+        for character in api.get_character_bundle().values()
+        for equipment in character.equipments
+    ]
+    stats_ids = [
+        armor.stats.id
+        for equipment in equipments
+        for armor in equipment.armors
+    ]
+
+    def get_stats_data(stats_id: int) -> dict:
+        """Get stats data, failing like the API for an unknown ID."""
+        if stats_id == _UNKNOWN_STATS_ID:
+            raise InvalidIdError("no such id", 404)
+        return api.get_stats_data(stats_id)
+
+    table = StatsTable.from_api(
+        get_stats_data, [*stats_ids, _UNKNOWN_STATS_ID]
+    )
+    assert table.unresolved == [_UNKNOWN_STATS_ID]
+    known = StatsTable.from_api(api.get_stats_data, stats_ids)
+    assert (
+        AttributeCalculator(table).totals(equipments)
+        == AttributeCalculator(known).totals(equipments)
+    ).all()
@@ -0,0 +1,129 @@
+import time
+import pytest
+from cache import (
+    SHARED_SCOPE,
+    Cache,
+    CacheNamespace
+)
+from api import (
+    Api
+)
+from snowcrows import (
+    Snowcrows
+)
+from fixtures import (
+    SyntheticAccount,
+    SyntheticSnowcrows,
+    SyntheticTransport
+)
+
+
+def test_evicts_least_recently_used():
+    """Evict the least recently used entry beyond the maximum size."""
+    namespace = CacheNamespace(maxsize=2)
+    namespace.set("a", 1)
+    namespace.set("b", 2)
+    assert namespace.get("a") == 1
+    namespace.set("c", 3)
+    assert namespace.get("b") is None
+    assert namespace.get("a") == 1
+    assert namespace.get("c") == 3
+    assert namespace.stats().evictions == 1
+
+
+def test_expires_entries_after_ttl():
+    """Drop an entry once its time to live has passed."""
+    namespace = CacheNamespace(ttl=0.01)
+    namespace.set("a", 1)
+    assert namespace.get("a") == 1
+    time.sleep(0.02)
+    assert namespace.get("a") is None
+    assert namespace.stats().size == 0
+
+
+def test_evicts_beyond_maximum_bytes():
+    """Evict the oldest entries once the memory bound is exceeded."""
+    namespace = CacheNamespace(maxbytes=10_000)
+    for i in range(10):
+        namespace.set(i, "x" * 2_000)
+    stats = namespace.stats()
+    assert stats.memory <= 10_000
+    assert 0 < stats.size < 10
+    assert namespace.get(9) is not None
+    assert namespace.get(0) is None
+
+
+def test_clear_keeps_shared_namespaces():
+    """Clear only the namespaces of one cache, not the shared ones."""
+    first, second = Cache(), Cache()
+    for cache in (first, second):
+        cache.configure("own", maxsize=8)
+        cache.configure("test-shared", maxsize=8, scope=SHARED_SCOPE)
+    first.namespace("own").set("a", 1)
+    second.namespace("own").set("a", 2)
+    first.namespace("test-shared").set("a", 3)
+    first.clear()
+    assert first.namespace("own").get("a") is None
+    assert second.namespace("own").get("a") == 2
+    assert second.namespace("test-shared").get("a") == 3
+    first.clear_shared()
+    assert second.namespace("test-shared").get("a") is None
+
+
+def test_save_and_load(tmp_path):
+    """Restore the unexpired entries of a saved cache."""
+    cache = Cache()
+    cache.configure("values", maxsize=8, ttl=60)
+    cache.namespace("values").set("a", [1, 2])
+    cache.save(tmp_path / "cache.bin")
+    loaded = Cache()
+    loaded.configure("values", maxsize=8, ttl=60)
+    loaded.load(tmp_path / "cache.bin")
+    assert loaded.namespace("values").get("a") == [1, 2]
+
+
+def test_saves_json_without_credentials(tmp_path):
+    """Write cache files as JSON without the verdicts keyed by API key."""
+    account = SyntheticAccount(characters=2, equipment_tabs=1)
+    api = Api(SyntheticTransport({"secret-key": account}), "secret-key")
+    api.get_character_names()
+    assert api.validate_key().usable
+    path = tmp_path / "cache.json"
+    api.save_cache(path)
+    assert "secret-key" not in path.read_text()
+    loaded = Api(SyntheticTransport({}), "secret-key")
+    loaded.load_cache(path)
+    assert loaded.get_character_names() == list(account.characters)
+
+
+def test_saves_build_pages(tmp_path):
+    """Restore the dataclasses of cached build pages from JSON."""
+    snowcrows = Snowcrows(SyntheticSnowcrows())
+    snowcrows._clear_shared_cache()
+    builds = snowcrows.get_builds("guardian")
+    name = next(iter(builds))
+    meta = snowcrows.get_build(name, builds)
+    snowcrows.save_cache(tmp_path / "cache.json")
+    snowcrows._clear_shared_cache()
+    loaded = Snowcrows(SyntheticSnowcrows())
+    loaded.load_cache(tmp_path / "cache.json")
+    assert loaded.get_build(name, loaded.get_builds("guardian")) == meta
+    assert loaded._transport.request_count == 0
+
+
+def test_refuses_unknown_types(tmp_path):
+    """Refuse to save or load values of types that were not allowed."""
+
+    class Opaque:
+        """Stand in for a value that cache files may not hold."""
+
+    cache = Cache()
+    cache.configure("values")
+    cache.namespace("values").set("a", Opaque())
+    with pytest.raises(TypeError):
+        cache.save(tmp_path / "cache.json")
+    (tmp_path / "forged.json").write_text(
+        '{"values": [[{"__type__": "Popen", "fields": {}}, 1, null]]}'
+    )
+    with pytest.raises(ValueError):
+        cache.load(tmp_path / "forged.json")
@@ -0,0 +1,41 @@
+from urllib.parse import quote
+from api import (
+    Api
+)
+from cassette import (
+    RECORD_MODE,
+    REPLAY_MODE,
+    Cassette
+)
+from fixtures import (
+    SyntheticAccount,
+    SyntheticTransport
+)
+
+
+def test_replays_conditional_requests(tmp_path):
+    """Replay a 304 response to a conditional request from a cassette."""
+    path = tmp_path / "cassette.json.gz"
+    transport = SyntheticTransport({"key": SyntheticAccount(characters=1)})
+    with Cassette(path, RECORD_MODE, transport=transport) as cassette:
+        api = Api(cassette, api_key="key")
+        character = quote(api.get_character_names()[0], safe="")
+        endpoint = f"characters/{character}/buildtabs?tabs=all"
+        response = api.get_if_modified(endpoint, {})
+        validators = {"etag": response.headers["ETag"]}
+        assert api.get_if_modified(endpoint, validators) is None
+
+    # Replay the conditional request before the plain one.
+    api = Api(Cassette(path), api_key="key")
+    assert api.get_if_modified(endpoint, validators) is None
+    assert api.get_if_modified(endpoint, {}).json() == response.json()
+
+
+def test_replays_without_the_recording_transport(tmp_path):
+    """Replay the same responses when the key is unchanged."""
+    path = tmp_path / "cassette.json.gz"
+    transport = SyntheticTransport({"key": SyntheticAccount(characters=2)})
+    with Cassette(path, RECORD_MODE, transport=transport) as cassette:
+        names = Api(cassette, api_key="key").get_character_names()
+    replay = Cassette(path, REPLAY_MODE)
+    assert Api(replay, api_key="key").get_character_names() == names
@@ -0,0 +1,59 @@
+import pytest
+from api import (
+    Api
+)
+from snowcrows import (
+    Snowcrows
+)
+from errors import (
+    UnknownBuildError
+)
+from checker import (
+    UNRESOLVED_META_BUILDS,
+    check_character
+)
+from fixtures import (
+    SyntheticAccount,
+    SyntheticSnowcrows,
+    SyntheticTransport
+)
+
+
+@pytest.fixture
+def account():
+    """Create a synthetic account with one character."""
+    return SyntheticAccount(characters=1, equipment_tabs=1)
+
+
+def _check(account: SyntheticAccount, builds: int, **options):
+    """Check the character of an account against a synthetic website."""
+    api = Api(SyntheticTransport({"key": account}), api_key="key")
+    snowcrows = Snowcrows(SyntheticSnowcrows(builds=builds))
+    snowcrows._clear_shared_cache()
+    try:
+        return check_character(
+            api, snowcrows, next(iter(account.characters)), **options
+        )
+    finally:
+        snowcrows._clear_shared_cache()
+
+
+def test_checks_the_closest_meta_build(account):
+    """Pick a meta build and compare every template to it."""
+    result = _check(account, builds=3)
+    assert result.complete
+    assert result.meta
+    assert len(result.equipments) == 1
+
+
+def test_unknown_build_is_an_error(account):
+    """Name the unknown meta build instead of raising a bare KeyError."""
+    with pytest.raises(UnknownBuildError, match="'Missing Build'"):
+        _check(account, builds=3, build_name="Missing Build")
+
+
+def test_no_meta_builds_is_unresolved(account):
+    """Report a profession without meta builds as not checked."""
+    result = _check(account, builds=0)
+    assert not result.complete
+    assert result.unresolved == [UNRESOLVED_META_BUILDS]
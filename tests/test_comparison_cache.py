@@ -0,0 +1,78 @@
+import pickle
+import pytest
+from api import (
+    Api
+)
+from snowcrows import (
+    Snowcrows
+)
+from compare import (
+    compare_characters
+)
+from comparison_cache import (
+    ComparisonCache
+)
+from fingerprint import (
+    fingerprint_meta
+)
+from fixtures import (
+    SyntheticAccount,
+    SyntheticSnowcrows,
+    SyntheticTransport
+)
+
+
+@pytest.fixture(scope="module")
+def roster():
+    """Load the characters of a synthetic account and two meta builds."""
+    account = SyntheticAccount(characters=4, equipment_tabs=3)
+    api = Api(SyntheticTransport({"key": account}), api_key="key")
+    characters = list(api.get_character_bundle().values())
+    snowcrows = Snowcrows(SyntheticSnowcrows())
+    builds = snowcrows.get_builds(characters[0].profession)
+    metas = [snowcrows.get_build(name, builds) for name in list(builds)[:2]]
+    return characters, metas
+
+
+def _cached_count(cache: ComparisonCache, meta) -> int:
+    """Count the equipment results cached for a meta build."""
+    version = f"{fingerprint_meta(*meta):032x}"
+    rows = cache._connection.execute(
+        "SELECT COUNT(*) FROM results WHERE kind = 'equipment' "
+        "AND version = ?",
+        (version,)
+    ).fetchone()
+    return rows[0]
+
+
+def test_alternating_metas_keep_their_results(roster, tmp_path):
+    """Keep the results of two meta builds compared in turn without IDs."""
+    characters, metas = roster
+    cache = ComparisonCache(tmp_path / "comparisons.db")
+    expected = [compare_characters(characters, meta) for meta in metas]
+    for _ in range(2):
+        for meta, diffs in zip(metas, expected):
+            assert compare_characters(characters, meta, cache) == diffs
+    assert all(_cached_count(cache, meta) > 0 for meta in metas)
+
+
+def test_named_meta_drops_outdated_results(roster, tmp_path):
+    """Drop the results of older versions of a meta build with an ID."""
+    characters, metas = roster
+    cache = ComparisonCache(tmp_path / "comparisons.db")
+    for meta in metas:
+        compare_characters(characters, meta, cache, meta_id="meta")
+    assert _cached_count(cache, metas[0]) == 0
+    assert _cached_count(cache, metas[1]) > 0
+
+
+def test_ignores_results_that_are_not_json(roster, tmp_path):
+    """Recompute results stored in another format instead of loading them."""
+    characters, metas = roster
+    cache = ComparisonCache(tmp_path / "comparisons.db")
+    expected = compare_characters(characters, metas[0], cache)
+    with cache._connection:
+        cache._connection.execute(
+            "UPDATE results SET diffs = ?", (pickle.dumps(["payload"]),)
+        )
+    assert compare_characters(characters, metas[0], cache) == expected
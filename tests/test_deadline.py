@@ -0,0 +1,98 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from errors import (
+    DeadlineError
+)
+from deadline import (
+    check_deadline,
+    current,
+    deadline,
+    propagate,
+    request_timeout
+)
+from api import (
+    Api
+)
+from snowcrows import (
+    Snowcrows
+)
+from checker import (
+    UNRESOLVED_CHARACTER,
+    check_character
+)
+from fixtures import (
+    SyntheticAccount,
+    SyntheticSnowcrows,
+    SyntheticTransport
+)
+
+
+def test_nested_deadline_is_bounded_by_parent():
+    """Never let nested work outlive the deadline it runs under."""
+    with deadline(0.05):
+        with deadline(60) as nested:
+            assert nested.remaining() <= 0.05
+            assert request_timeout() <= 0.05
+        time.sleep(0.06)
+        with pytest.raises(DeadlineError):
+            check_deadline()
+    check_deadline()
+    assert request_timeout() == 30.0
+
+
+def test_deadline_propagates_to_worker_threads():
+    """Apply the deadline of the submitting context in a worker thread."""
+    with deadline(0.02) as bound:
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            future = executor.submit(propagate(time.sleep), 0.03)
+            future.result()
+            assert bound.expired
+            future = executor.submit(propagate(check_deadline))
+            with pytest.raises(DeadlineError):
+                future.result()
+            assert executor.submit(check_deadline).result() is None
+
+
+def test_cancel_reaches_nested_work():
+    """Stop nested work when the outer deadline is cancelled."""
+    with deadline() as bound:
+        with deadline(60):
+            bound.cancel()
+            with pytest.raises(DeadlineError):
+                check_deadline()
+
+
+def test_cancelling_the_default_affects_nobody():
+    """Keep working after cancelling the deadline outside any block."""
+    current().cancel()
+    check_deadline()
+    with deadline(60):
+        check_deadline()
+
+
+def test_expired_deadline_is_not_a_key_error():
+    """Raise a deadline error instead of reporting the key as failing."""
+    account = SyntheticAccount(characters=1)
+    api = Api(SyntheticTransport({"key": account}), api_key="key")
+    with deadline(0):
+        with pytest.raises(DeadlineError):
+            api.validate_key()
+
+
+def test_check_returns_partial_result_on_timeout():
+    """Mark the parts of a check that did not finish in time."""
+    account = SyntheticAccount(characters=1)
+    transport = SyntheticTransport({"key": account}, latency=0.05)
+    api = Api(transport, api_key="key")
+    name = next(iter(account.characters))
+    result = check_character(
+        api, Snowcrows(SyntheticSnowcrows()), name, timeout=0.01
+    )
+    assert not result.complete
+    assert result.unresolved == [UNRESOLVED_CHARACTER]
+    api = Api(SyntheticTransport({"key": account}), api_key="key")
+    result = check_character(
+        api, Snowcrows(SyntheticSnowcrows()), name, timeout=60
+    )
+    assert result.complete
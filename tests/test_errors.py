@@ -0,0 +1,39 @@
+import pytest
+from errors import (
+    ApiError,
+    AuthError,
+    InvalidIdError,
+    RateLimitError,
+    TransientError,
+    classify
+)
+
+
+@pytest.mark.parametrize("status_code, data, error_type", [
+    (401, {"text": "Invalid access token"}, AuthError),
+    (403, None, AuthError),
+    (404, {"text": "no such id"}, InvalidIdError),
+    (400, {"text": "all ids provided are invalid"}, InvalidIdError),
+    (429, {"text": "too many requests"}, RateLimitError),
+    (502, None, TransientError),
+    (400, {"text": "invalid page"}, ApiError)
+])
+def test_classifies_errors(status_code, data, error_type):
+    """Map error responses to the most specific error type."""
+    error = classify(status_code, data)
+    assert type(error) is error_type
+    assert error.status_code == status_code
+
+
+def test_success_is_not_an_error():
+    """Classify successful responses as no error, whatever their data."""
+    assert classify(200, [1, 2]) is None
+    assert classify(204, None) is None
+
+
+def test_keeps_error_text():
+    """Use the text of an error response as the message of its error."""
+    assert str(classify(401, {"text": "Invalid access token"})) == (
+        "Invalid access token"
+    )
+    assert str(classify(418, [])) == "HTTP 418"
@@ -0,0 +1,85 @@
+import pytest
+from api import (
+    Api
+)
+from snowcrows import (
+    Snowcrows
+)
+from compare import (
+    compare_equipment
+)
+from export import (
+    RosterExporter
+)
+from fixtures import (
+    SyntheticAccount,
+    SyntheticSnowcrows,
+    SyntheticTransport
+)
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+
+def test_exports_roster_to_parquet(tmp_path):
+    """Write one row per slot and read the same values back."""
+    account = SyntheticAccount(characters=2, build_tabs=2, equipment_tabs=2)
+    api = Api(SyntheticTransport({"key": account}), api_key="key")
+    characters = list(api.get_character_bundle().values())
+    snowcrows = Snowcrows(SyntheticSnowcrows())
+    builds = snowcrows.get_builds(characters[0].profession)
+    meta_name = next(iter(builds))
+    _, meta = snowcrows.get_build(meta_name, builds)
+    equipment = characters[0].equipments[0]
+    diffs = {
+        (characters[0].name, "equipment", 0): compare_equipment(
+            equipment, meta
+        )
+    }
+
+    # Write in small batches so that the file holds several row groups.
+    path = str(tmp_path / "roster.parquet")
+    with RosterExporter(path, batch_size=16) as exporter:
+        exporter.add_characters(
+            characters, diffs, account="Account.1234", meta=meta_name
+        )
+
+    table = pq.read_table(path)
+    assert table.schema.equals(exporter._schema)
+    assert table.num_rows == exporter.row_count
+    assert table.num_rows == sum(
+        len(build.skills) + len(build.specializations)
+        for character in characters
+        for build in character.builds
+    ) + sum(
+        len(equipment.armors) + len(equipment.weapons)
+        + len(equipment.accessories) + 1
+        for character in characters
+        for equipment in character.equipments
+    )
+
+    rows = table.to_pylist()
+    assert {row["account"] for row in rows} == {"Account.1234"}
+    assert {row["meta"] for row in rows} == {meta_name}
+    first_armor = next(
+        row for row in rows
+        if row["character"] == characters[0].name
+        and row["kind"] == "equipment" and row["template_index"] == 0
+        and row["slot"] == equipment.armors[0].slot
+    )
+    assert first_armor["stats"] == equipment.armors[0].stats.id
+    assert first_armor["upgrade_1"] == equipment.armors[0].upgrade.id
+    assert first_armor["diff_fields"] == [
+        diff.field for diff in diffs[(characters[0].name, "equipment", 0)]
+        if diff.slot == equipment.armors[0].slot
+    ]
+    assert first_armor["diff_count"] == len(first_armor["diff_fields"])
+    weapon = next(
+        row for row in rows
+        if row["character"] == characters[0].name
+        and row["kind"] == "equipment" and row["template_index"] == 0
+        and row["slot"] == equipment.weapons[0].slot
+    )
+    assert weapon["weapon_type"] == equipment.weapons[0].type
+    assert sum(row["diff_count"] for row in rows) == len(
+        diffs[(characters[0].name, "equipment", 0)]
+    )
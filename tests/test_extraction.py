@@ -0,0 +1,39 @@
+import pathlib
+import pytest
+from extraction import (
+    extract_page
+)
+from equipment import (
+    Equipment
+)
+from snowcrows import (
+    Snowcrows,
+    _make_soup
+)
+
+# Define the recorded build pages.
+PAGES = sorted((pathlib.Path(__file__).parent / "pages").glob("*.html"))
+
+
+@pytest.mark.parametrize("path", PAGES, ids=lambda path: path.stem)
+def test_extraction_matches_beautifulsoup(path):
+    """Extract the same build and equipment as the reference parsers."""
+    content = path.read_bytes()
+    snowcrows = Snowcrows()
+    build, equipment_record = extract_page(path.stem, content)
+    html_content = _make_soup(content)
+    assert build == snowcrows._parse_build(path.stem, html_content)
+    assert Equipment.from_record(equipment_record) == (
+        snowcrows._parse_equipment(path.stem, html_content)
+    )
+    assert snowcrows.validate_extraction(path.stem, content)
+
+
+def test_recorded_pages_are_not_empty():
+    """Extract armor stats and weapons from every recorded page."""
+    for path in PAGES:
+        _, equipment_record = extract_page(path.stem, path.read_bytes())
+        equipment = Equipment.from_record(equipment_record)
+        assert any(weapon.type for weapon in equipment.weapons)
+        assert any(weapon.stats.name for weapon in equipment.weapons)
+        assert all(armor.stats.id for armor in equipment.armors)
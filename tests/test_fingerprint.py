@@ -0,0 +1,98 @@
+from dataclasses import replace
+from api import (
+    Api
+)
+from equipment import (
+    Stats
+)
+from fingerprint import (
+    Deduplicator,
+    fingerprint_build,
+    fingerprint_equipment
+)
+from fixtures import (
+    SyntheticAccount,
+    SyntheticTransport
+)
+
+
+def _templates():
+    """Load the build and equipment templates of a synthetic character."""
+    account = SyntheticAccount(characters=1, build_tabs=2, equipment_tabs=2)
+    api = Api(SyntheticTransport({"key": account}), api_key="key")
+    character = next(iter(api.get_character_bundle().values()))
+    return character.builds, character.equipments
+
+
+def test_fingerprints_ignore_names_and_order():
+    """Fingerprint templates by their content only."""
+    builds, equipments = _templates()
+    equipment = equipments[0]
+    same = replace(
+        equipment,
+        name="Renamed",
+        armors=list(reversed(equipment.armors))
+    )
+    assert fingerprint_equipment(same) == fingerprint_equipment(equipment)
+    assert fingerprint_build(
+        replace(builds[0], name="Renamed")
+    ) == fingerprint_build(builds[0])
+
+
+def test_fingerprints_tell_content_apart():
+    """Give templates that differ in one slot different fingerprints."""
+    builds, equipments = _templates()
+    equipment = equipments[0]
+    armor = equipment.armors[0]
+    changed = replace(equipment, armors=[
+        replace(armor, stats=Stats(id=armor.stats.id + 1, name="")),
+        *equipment.armors[1:]
+    ])
+    assert fingerprint_equipment(changed) != fingerprint_equipment(equipment)
+    build = builds[0]
+    assert fingerprint_build(
+        replace(build, skills=build.skills[::-1])
+    ) != fingerprint_build(build)
+
+
+def test_deduplicator_processes_each_template_once():
+    """Collapse identical templates and fan results out to their owners."""
+    _, equipments = _templates()
+    first, second = equipments
+    deduplicator = Deduplicator(fingerprint_equipment)
+    deduplicator.extend([
+        ("a", first),
+        ("b", replace(first, name="Copy")),
+        ("c", second)
+    ])
+    assert len(deduplicator.unique()) == 2
+    calls = []
+
+    def process(equipment):
+        """Record each call and name the processed equipment."""
+        calls.append(equipment)
+        return equipment.name
+
+    results = deduplicator.map(process)
+    assert len(calls) == 2
+    assert results == {"a": first.name, "b": first.name, "c": second.name}
+    assert deduplicator.owners(fingerprint_equipment(first)) == ["a", "b"]
+
+
+def test_resolved_duplicates_are_independent():
+    """Resolve identical templates of many characters into separate objects."""
+    account = SyntheticAccount(characters=3, equipment_tabs=1)
+    template = next(iter(account.characters.values()))["equipment_tabs"][0]
+    for character in account.characters.values():
+        character["equipment_tabs"] = [dict(template)]
+    api = Api(SyntheticTransport({"key": account}), api_key="key")
+    equipments = [
+        character.equipments[0]
+        for character in api.get_character_bundle().values()
+    ]
+    assert equipments[0] == equipments[1] == equipments[2]
+    equipments[0].armors[0].stats.id = 999
+    equipments[0].weapons.pop()
+    assert equipments[1].armors[0].stats.id != 999
+    assert len(equipments[1].weapons) == len(equipments[2].weapons)
+    assert len(equipments[1].weapons) == len(equipments[0].weapons) + 1
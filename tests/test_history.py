@@ -0,0 +1,88 @@
+import os
+import pytest
+from api import (
+    Api
+)
+from character import (
+    Character
+)
+from history import (
+    KEYFRAME,
+    HistoryStore,
+    template_state,
+    character_from_state
+)
+from fixtures import (
+    SyntheticAccount,
+    SyntheticTransport
+)
+
+
+@pytest.fixture(scope="module")
+def character():
+    """Load a character of a synthetic account."""
+    account = SyntheticAccount(characters=1, equipment_tabs=2)
+    api = Api(SyntheticTransport({"key": account}), api_key="key")
+    return next(iter(api.get_character_bundle().values()))
+
+
+def _variant(character: Character, i: int) -> Character:
+    """Create a copy of a character with a renamed first equipment tab."""
+    state = template_state(character)
+    state["equipment/0/name"] = (f"Tab {i}",)
+    return character_from_state(character.name, state)
+
+
+def test_replays_states_across_keyframes(tmp_path, character):
+    """Reconstruct every recorded state from keyframes and deltas."""
+    path = tmp_path / "history.bin"
+    variants = [_variant(character, i) for i in range(10)]
+    with HistoryStore(path, keyframe_interval=3) as history:
+        for timestamp, variant in enumerate(variants, start=1):
+            assert history.record(variant, timestamp=timestamp)
+        assert not history.record(variants[-1], timestamp=11)
+        assert history._index[character.name][2].count(KEYFRAME) == 3
+    with HistoryStore(path, keyframe_interval=3) as history:
+        assert history.state_at(character.name, 0.5) is None
+        for timestamp, variant in enumerate(variants, start=1):
+            assert history.state_at(
+                character.name, timestamp + 0.5
+            ) == template_state(variant)
+        assert history.state_at(character.name) == template_state(
+            variants[-1]
+        )
+        changes = list(history.changes(character.name, start=4, end=5))
+    assert changes == [
+        (4, {"equipment/0/name": ("Tab 3",)}, []),
+        (5, {"equipment/0/name": ("Tab 4",)}, [])
+    ]
+
+
+@pytest.mark.parametrize("torn", [3, -5], ids=["header", "payload"])
+def test_drops_torn_last_record(tmp_path, character, torn):
+    """Truncate a partly written last record and keep appending after it."""
+    path = tmp_path / "history.bin"
+    with HistoryStore(path) as history:
+        for timestamp in range(1, 4):
+            history.record(_variant(character, timestamp), timestamp=timestamp)
+    size = os.path.getsize(path)
+    with HistoryStore(path) as history:
+        history.record(_variant(character, 4), timestamp=4)
+
+    # Cut the last record within its header or within its payload.
+    written = os.path.getsize(path) - size
+    with open(path, "r+b") as file:
+        file.truncate(size + (torn if torn > 0 else written + torn))
+    with HistoryStore(path) as history:
+        assert os.path.getsize(path) == size
+        assert history.state_at(character.name) == template_state(
+            _variant(character, 3)
+        )
+        assert history.record(_variant(character, 5), timestamp=5)
+    with HistoryStore(path) as history:
+        assert history.state_at(character.name, 3) == template_state(
+            _variant(character, 3)
+        )
+        assert history.state_at(character.name) == template_state(
+            _variant(character, 5)
+        )
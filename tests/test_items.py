@@ -0,0 +1,108 @@
+import sys
+import threading
+from cache import (
+    SHARED_SCOPE,
+    Cache
+)
+from items import (
+    ItemRecord,
+    ItemTable
+)
+
+
+def _record(item_id: int) -> ItemRecord:
+    """Create the record of a weapon with a name of its ID."""
+    return ItemRecord(
+        id=item_id,
+        name=f"Item {item_id}",
+        type="Weapon",
+        weapon_type="Sword",
+        upgrade_type=""
+    )
+
+
+def test_evicts_least_recently_used_records():
+    """Keep the table within its maximum size, dropping unused records."""
+    table = ItemTable(maxsize=8)
+    for item_id in range(8):
+        table.add(_record(item_id))
+    assert table.get(0) == _record(0)
+    table.add(_record(8))
+    assert len(table) <= 8
+    assert table.get(0) == _record(0)
+    assert table.get(8) == _record(8)
+    assert 1 not in table
+    assert table.stats().evictions == 9 - len(table)
+
+
+def test_evicts_records_beyond_maximum_bytes():
+    """Keep the memory of the arrays within the maximum bytes."""
+    table = ItemTable(maxbytes=1024)
+    for item_id in range(1000):
+        table.add(_record(item_id))
+    assert table.nbytes() <= 1024
+    assert table.get(999) == _record(999)
+
+
+def test_get_during_clear():
+    """Read records consistently while another thread clears the table."""
+    table = ItemTable()
+    errors = []
+    done = threading.Event()
+
+    def read():
+        try:
+            while not done.is_set():
+                for item_id in range(64):
+                    record = table.get(item_id)
+                    assert record in (None, _record(item_id))
+        except Exception as error:
+            errors.append(error)
+
+    # Switch threads often to interleave the reads with the clears.
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    readers = [threading.Thread(target=read) for _ in range(4)]
+    try:
+        for reader in readers:
+            reader.start()
+        for _ in range(2000):
+            for item_id in range(64):
+                table.add(_record(item_id))
+            table.clear()
+            if errors:
+                break
+    finally:
+        done.set()
+        for reader in readers:
+            reader.join()
+        sys.setswitchinterval(interval)
+    assert not errors
+
+
+def test_saves_records_with_cache(tmp_path):
+    """Save and load the item records as a namespace of a cache."""
+    cache = Cache()
+    table = cache.configure("test-items", maxsize=16, factory=ItemTable)
+    table.add(_record(1))
+    cache.save(tmp_path / "cache.bin")
+    other = Cache()
+    other.configure("test-items", maxsize=16, factory=ItemTable)
+    other.load(tmp_path / "cache.bin")
+    assert other.namespace("test-items").get(1) == _record(1)
+    assert other.stats()["test-items"].size == 1
+
+
+def test_shared_table_outlives_instance_clear():
+    """Keep shared item records when one cache clears its namespaces."""
+    cache = Cache()
+    table = cache.configure(
+        "test-shared-items", scope=SHARED_SCOPE, factory=ItemTable
+    )
+    table.add(_record(1))
+    cache.clear()
+    assert Cache().configure(
+        "test-shared-items", scope=SHARED_SCOPE, factory=ItemTable
+    ).get(1) == _record(1)
+    cache.clear_shared()
+    assert 1 not in table
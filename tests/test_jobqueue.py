@@ -0,0 +1,165 @@
+import time
+import threading
+import pytest
+from jobqueue import (
+    DONE,
+    FAILED,
+    LEASED,
+    PENDING,
+    RedisQueue,
+    SQLiteQueue,
+    Worker,
+    key_reference,
+    character_job_handler
+)
+from memory_redis import (
+    MemoryRedis
+)
+
+
+@pytest.fixture(params=["sqlite", "redis"])
+def make_queue(request, tmp_path):
+    """Create queues of each backend with a lease and attempt limit."""
+    def make_queue(lease: float = 60.0, max_attempts: int = 3):
+        """Create a queue with the given lease and attempt limit."""
+        if request.param == "sqlite":
+            return SQLiteQueue(
+                tmp_path / "queue.db",
+                lease=lease,
+                max_attempts=max_attempts,
+                retry_delay=0.0
+            )
+        return RedisQueue(
+            MemoryRedis(), lease=lease, max_attempts=max_attempts
+        )
+    return make_queue
+
+
+def test_enqueue_is_idempotent(make_queue):
+    """Ignore a job whose ID was already enqueued."""
+    queue = make_queue()
+    assert queue.enqueue("a", {"n": 1})
+    assert not queue.enqueue("a", {"n": 2})
+    job = queue.lease("worker")
+    assert job.payload == {"n": 1}
+    assert queue.lease("worker") is None
+
+
+def test_complete_keeps_first_result(make_queue):
+    """Keep the result written first when a job completes twice."""
+    queue = make_queue()
+    queue.enqueue("a", {})
+    job = queue.lease("worker")
+    assert queue.status("a") == LEASED
+    assert queue.complete(job, {"result": 1})
+    assert not queue.complete(job, {"result": 2})
+    assert queue.result("a") == {"result": 1}
+    assert queue.status("a") == DONE
+
+
+def test_expired_lease_is_reclaimed(make_queue):
+    """Lease a job again once the lease of a crashed worker expires."""
+    queue = make_queue(lease=0.05)
+    queue.enqueue("a", {})
+    first = queue.lease("crashed")
+    assert queue.lease("other") is None
+    time.sleep(0.1)
+    second = queue.lease("other")
+    assert second.id == first.id
+    assert second.attempts == 2
+    assert not queue.renew(first)
+    assert queue.renew(second)
+
+
+def test_expired_lease_fails_after_max_attempts(make_queue):
+    """Fail a job whose leases expired too often, without blocking."""
+    queue = make_queue(lease=0.01, max_attempts=1)
+    queue.enqueue("a", {})
+    queue.enqueue("b", {})
+    assert queue.lease("crashed").id == "a"
+    time.sleep(0.05)
+    assert queue.lease("other").id == "b"
+    assert queue.lease("other") is None
+    assert queue.status("a") == FAILED
+
+
+def test_failed_job_is_retried_then_failed(make_queue):
+    """Retry a failing job until it runs out of attempts."""
+    queue = make_queue(max_attempts=2)
+    queue.enqueue("a", {})
+    queue.fail(queue.lease("worker"), "first")
+    assert queue.status("a") == PENDING
+    queue.fail(queue.lease("worker"), "second")
+    assert queue.status("a") == FAILED
+    assert queue.lease("worker") is None
+
+
+def test_concurrent_workers_lease_each_job_once(make_queue):
+    """Lease every job to exactly one of many concurrent workers."""
+    queue = make_queue()
+    for i in range(50):
+        queue.enqueue(str(i), {"n": i})
+    leased = []
+
+    def lease_all(worker: str) -> None:
+        """Lease jobs until the queue is empty."""
+        while (job := queue.lease(worker)) is not None:
+            leased.append(job.id)
+
+    threads = [
+        threading.Thread(target=lease_all, args=(f"worker-{i}",))
+        for i in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(leased, key=int) == [str(i) for i in range(50)]
+
+
+def test_worker_runs_jobs_and_records_failures(make_queue):
+    """Run jobs to completion and retry the ones that raise."""
+    queue = make_queue(max_attempts=1)
+    queue.enqueue("ok", {"value": 2})
+    queue.enqueue("bad", {"value": 0})
+
+    def handler(payload: dict) -> dict:
+        """Invert the value of a payload."""
+        return {"inverse": 1 / payload["value"]}
+
+    Worker(queue, handler).run(stop_when_empty=True)
+    assert queue.result("ok") == {"inverse": 0.5}
+    assert queue.status("bad") == FAILED
+
+
+def test_complete_requires_the_lease(make_queue):
+    """Ignore the result of a worker whose lease was claimed by another."""
+    queue = make_queue(lease=0.05)
+    queue.enqueue("a", {})
+    first = queue.lease("worker")
+    time.sleep(0.1)
+    second = queue.lease("worker")
+    assert not queue.complete(first, {"result": 1})
+    assert queue.result("a") is None
+    assert queue.complete(second, {"result": 2})
+    assert queue.result("a") == {"result": 2}
+
+
+def test_failed_complete_keeps_the_lease(make_queue):
+    """Leave a job leased and the queue usable when completing it fails."""
+    queue = make_queue()
+    queue.enqueue("a", {})
+    job = queue.lease("worker")
+    with pytest.raises(TypeError):
+        queue.complete(job, {"result": object()})
+    assert queue.status("a") == LEASED
+    assert queue.enqueue("b", {})
+    assert queue.complete(job, {"result": 1})
+
+
+def test_payloads_refer_to_keys():
+    """Resolve the API key of a job from its reference, not its payload."""
+    handler = character_job_handler(["key"])
+    assert key_reference("key") != "key"
+    with pytest.raises(LookupError):
+        handler({"key": key_reference("other"), "character": "Name"})
@@ -0,0 +1,15 @@
+from benchmark import (
+    measure_memory
+)
+
+# Define the number of bytes in a mebibyte.
+_MIB = 2**20
+
+
+def test_full_account_load_within_budget(pytestconfig):
+    """Load a full synthetic account within the peak memory budget."""
+    budget = pytestconfig.getoption("--memory-budget")
+    report = measure_memory(accounts=1, characters=60, equipment_tabs=8)
+    assert report.within_budget(int(budget * _MIB)), (
+        f"Peak of {report.peak / _MIB:.1f} MiB exceeds {budget} MiB"
+    )
@@ -0,0 +1,104 @@
+import pytest
+from api import (
+    Api
+)
+from snowcrows import (
+    Snowcrows
+)
+from compare import (
+    compare_build,
+    compare_equipment
+)
+from plan import (
+    DEFAULT_WEIGHTS,
+    compile_profession,
+    score_builds,
+    score_equipments,
+    vectorize_equipment,
+    compile_equipment
+)
+from fixtures import (
+    SyntheticAccount,
+    SyntheticSnowcrows,
+    SyntheticTransport
+)
+
+# Define weights that count every failed check once.
+_UNIT_WEIGHTS = {field: 1.0 for field in DEFAULT_WEIGHTS}
+
+
+@pytest.fixture(scope="module")
+def roster():
+    """Load synthetic characters and the meta builds of their professions."""
+    account = SyntheticAccount(characters=8, equipment_tabs=4)
+    api = Api(SyntheticTransport({"key": account}), api_key="key")
+    snowcrows = Snowcrows(SyntheticSnowcrows())
+    characters = list(api.get_character_bundle().values())
+    metas = {}
+    for character in characters:
+        if character.profession not in metas:
+            builds = snowcrows.get_builds(character.profession)
+            metas[character.profession] = {
+                build_name: snowcrows.get_build(build_name, builds)
+                for build_name in builds
+            }
+    return characters, metas
+
+
+def test_plan_matches_compare(roster):
+    """Fail as many checks as the slot comparison finds differences."""
+    characters, metas = roster
+    for character in characters:
+        profession_metas = metas[character.profession]
+        plans = compile_profession(profession_metas.items(), _UNIT_WEIGHTS)
+        for build_name, meta_plan in plans.items():
+            meta_build, meta_equipment = profession_metas[build_name]
+            scores = score_equipments(
+                character.equipments, meta_plan.equipment
+            )
+            for equipment, score in zip(character.equipments, scores):
+                diffs = compare_equipment(equipment, meta_equipment)
+                assert score == len(diffs)
+                plan_diffs = meta_plan.equipment.diffs(vectorize_equipment(
+                    equipment, meta_plan.equipment.vocabulary
+                ))
+                assert sorted(
+                    (diff.slot, diff.field) for diff in plan_diffs
+                ) == sorted((diff.slot, diff.field) for diff in diffs)
+            scores = score_builds(character.builds, meta_plan.build)
+            for build, score in zip(character.builds, scores):
+                assert score >= len(compare_build(build, meta_build))
+
+
+def test_diffs_describe_weapon_types_by_name(roster):
+    """Show the weapon type a template holds instead of its code."""
+    characters, metas = roster
+    for character in characters:
+        plans = compile_profession(metas[character.profession].items())
+        for meta_plan in plans.values():
+            for equipment in character.equipments:
+                types = {
+                    weapon.slot: weapon.type or "-"
+                    for weapon in equipment.weapons
+                }
+                for diff in meta_plan.equipment.diffs(vectorize_equipment(
+                    equipment, meta_plan.equipment.vocabulary
+                )):
+                    if diff.field == "type":
+                        assert diff.actual == types.get(diff.slot, "-")
+
+
+def test_vocabulary_is_bounded_by_plan(roster):
+    """Keep the texts of templates out of a full vocabulary of a plan."""
+    characters, metas = roster
+    _, meta_equipment = next(iter(metas[characters[0].profession].values()))
+    plan = compile_equipment(meta_equipment, _UNIT_WEIGHTS)
+    other = compile_equipment(meta_equipment, _UNIT_WEIGHTS)
+    size = len(plan.vocabulary)
+    plan.vocabulary.maxsize = size
+    for character in characters:
+        for equipment in character.equipments:
+            vector = vectorize_equipment(equipment, plan.vocabulary)
+            assert len(plan.diffs(vector)) == plan.score(vector)
+    assert len(plan.vocabulary) == size
+    assert len(other.vocabulary) == size
@@ -0,0 +1,128 @@
+import pathlib
+import pytest
+from urllib.parse import urlsplit
+from snowcrows import (
+    Snowcrows
+)
+from transport import (
+    Response,
+    Transport
+)
+from cassette import (
+    RECORD_MODE,
+    Cassette
+)
+from fixtures import (
+    SyntheticSnowcrows
+)
+
+# Define the directory of the recorded build pages.
+PAGES = pathlib.Path(__file__).parent / "pages"
+
+# Define the builds listed on the index page of each category, some of
+# which link to the page of another category.
+INDEXES = {
+    "raids": {"Power Virtuoso": "/builds/raids/mesmer/power-virtuoso"},
+    "fractals": {
+        "Power Virtuoso": "/builds/raids/mesmer/power-virtuoso/",
+        "Condition Mechanist": "/builds/fractals/mesmer/condition-mechanist"
+    },
+    "strikes": {"Power Berserker": "/builds/strikes/mesmer/power-berserker"}
+}
+
+
+class _SiteTransport(Transport):
+    """Serve index pages and the recorded build pages of Snow Crows."""
+
+    def __init__(self) -> None:
+        """Initialize an instance of the _SiteTransport class."""
+        super().__init__()
+        self.paths = []
+
+    def get(self, url: str, headers: dict[str, str]) -> Response:
+        """Serve an index page or a recorded build page."""
+        parts = urlsplit(url).path.strip("/").split("/")
+        self.paths.append("/".join(parts))
+        if len(parts) == 3:
+            content = "".join(
+                f'<a href="{href}"><h2 class="block font-medium w-96">'
+                f"{name}</h2></a>"
+                for name, href in INDEXES[parts[1]].items()
+            ).encode()
+        else:
+            content = (PAGES / f"{parts[3]}.html").read_bytes()
+        return Response(
+            url=url,
+            status_code=200,
+            headers={"Content-Type": "text/html"},
+            content=content,
+            elapsed=0.0
+        )
+
+
+@pytest.fixture
+def snowcrows():
+    """Create a Snowcrows client of a synthetic website with a cold cache."""
+    snowcrows = Snowcrows(SyntheticSnowcrows())
+    snowcrows._clear_shared_cache()
+    yield snowcrows
+    snowcrows._clear_shared_cache()
+
+
+def test_get_builds_by_keyword(snowcrows):
+    """Accept the category by keyword and share defaulted cache entries."""
+    fractals = snowcrows.get_builds("guardian", category="fractals")
+    assert all("/builds/fractals/" in url for url in fractals.values())
+    raids = snowcrows.get_builds("guardian")
+    assert snowcrows.get_builds("guardian", "raids") is raids
+    assert snowcrows.get_builds("guardian", category="raids") is raids
+    assert snowcrows._transport.request_count == 2
+
+
+def test_builds_do_not_share_cached_pages(snowcrows):
+    """Keep the cached page intact when a caller changes a build."""
+    builds = snowcrows.get_builds("guardian")
+    name = next(iter(builds))
+    build, equipment = snowcrows.get_build(name, builds)
+    skills = list(build.skills)
+    stats_id = equipment.armors[0].stats.id
+    build.skills[0] = None
+    equipment.armors[0].stats.id = 999
+    other = Snowcrows(SyntheticSnowcrows())
+    for fresh_build, fresh_equipment in (
+        snowcrows.get_build(name, builds),
+        other.get_build(name, builds),
+        other.crawl("guardian", categories=("raids",))["raids"][name]
+    ):
+        assert fresh_build.skills == skills
+        assert fresh_equipment.armors[0].stats.id == stats_id
+
+
+def test_crawl_from_cassette(snowcrows, tmp_path):
+    """Crawl every category once, recording it and replaying it offline."""
+    path = tmp_path / "crawl.json.gz"
+    site = _SiteTransport()
+    with Cassette(path, RECORD_MODE, transport=site) as cassette:
+        recorded = Snowcrows(cassette).crawl("mesmer")
+
+    # Request each index and each distinct build page exactly once.
+    assert sorted(site.paths) == sorted([
+        "builds/raids/mesmer",
+        "builds/fractals/mesmer",
+        "builds/strikes/mesmer",
+        "builds/raids/mesmer/power-virtuoso",
+        "builds/fractals/mesmer/condition-mechanist",
+        "builds/strikes/mesmer/power-berserker"
+    ])
+    assert {
+        category: list(builds) for category, builds in recorded.items()
+    } == {category: list(builds) for category, builds in INDEXES.items()}
+    raids = recorded["raids"]["Power Virtuoso"]
+    fractals = recorded["fractals"]["Power Virtuoso"]
+    assert raids == fractals
+    assert raids[1] is not fractals[1]
+    assert raids[1].armors
+
+    # Replay the crawl without the site, failing on any other request.
+    snowcrows._clear_shared_cache()
+    assert Snowcrows(Cassette(path)).crawl("mesmer") == recorded
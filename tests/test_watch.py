@@ -0,0 +1,72 @@
+from api import (
+    Api
+)
+from errors import (
+    DeadlineError
+)
+from watch import (
+    Watcher
+)
+from fixtures import (
+    SyntheticAccount,
+    SyntheticTransport
+)
+
+
+class _Clock:
+    """Tell a time that only moves when told to."""
+
+    def __init__(self) -> None:
+        """Initialize an instance of the _Clock class."""
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """Get the current time."""
+        return self.now
+
+
+def test_reports_changes_with_conditional_requests():
+    """Report a character when its templates change and only then."""
+    account = SyntheticAccount(characters=1, equipment_tabs=2)
+    name = next(iter(account.characters))
+    api = Api(SyntheticTransport({"key": account}), api_key="key")
+    clock = _Clock()
+    reported = []
+    watcher = Watcher(api, reported.append, min_interval=10, clock=clock)
+    watcher.watch(name)
+    assert watcher.run_once() == [name]
+    assert len(reported[0].equipments) == 2
+
+    # Poll again without changes, answered by the API without a body.
+    clock.now = 10
+    assert watcher.run_once() == []
+    assert watcher.stats.not_modified == 2
+    assert watcher.interval(name) == 15
+
+    # Poll after a change, reporting it and polling sooner again.
+    account.characters[name]["equipment_tabs"][0]["name"] = "Renamed"
+    clock.now = 25
+    assert watcher.run_once() == [name]
+    assert reported[-1].equipments[0].name == "Renamed"
+    assert watcher.interval(name) == 10
+
+
+def test_reschedules_after_unexpected_error():
+    """Keep watching a character after a poll fails with any error."""
+    account = SyntheticAccount(characters=1, equipment_tabs=1)
+    name = next(iter(account.characters))
+    api = Api(SyntheticTransport({"key": account}), api_key="key")
+    clock = _Clock()
+
+    def report(character):
+        """Fail like a poll that ran out of time."""
+        raise DeadlineError("Deadline exceeded")
+
+    watcher = Watcher(api, report, min_interval=10, clock=clock)
+    watcher.watch(name)
+    assert watcher.run_once() == []
+    assert watcher.stats.errors == 1
+    assert watcher.interval(name) == 15
+    clock.now = 15
+    watcher.run_once()
+    assert watcher.stats.polls == 2